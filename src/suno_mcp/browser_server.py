@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""Shared browser server: one Chromium that many Suno MCP processes connect to.
+
+``suno-mcp-browser start`` launches Chromium with a local CDP endpoint and
+records it in a state file. Servers started with ``--browser-endpoint``
+connect to it and only create their own browser context, so the browser
+process is paid for once per host instead of once per agent.
+"""
+
+import argparse
+import json
+import logging
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .tools.shared.exceptions import BrowserError
+from .tools.shared.utils import CHROMIUM_ARGS, config
+
+logger = logging.getLogger(__name__)
+
+
+def read_state(state_file: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Return the running server's state, or None if there is none."""
+    path = Path(state_file or config.get("browser.server.state_file"))
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Ignoring unreadable browser server state %s: %s", path, e)
+        return None
+
+
+def is_alive(endpoint: str, timeout: float = 1.0) -> bool:
+    """Whether a CDP endpoint answers."""
+    try:
+        with urllib.request.urlopen(f"{endpoint}/json/version", timeout=timeout) as response:
+            return response.status == 200
+    except Exception:
+        return False
+
+
+def resolve_endpoint(state_file: Optional[str] = None) -> str:
+    """Endpoint of the server started by ``suno-mcp-browser start``."""
+    state = read_state(state_file)
+    if not state or not is_alive(state["endpoint"]):
+        raise BrowserError(
+            "No shared browser is running. Start one with: suno-mcp-browser start",
+            "BROWSER_SERVER_UNAVAILABLE",
+        )
+    return state["endpoint"]
+
+
+def _chromium_executable() -> str:
+    """Path of the Chromium build Playwright installed."""
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as playwright:
+        return playwright.chromium.executable_path
+
+
+def _process_command(pid: int) -> Optional[str]:
+    """Command line of a running process (image name on Windows), or None if it is gone."""
+    if Path("/proc/self/cmdline").exists():
+        try:
+            command = Path(f"/proc/{pid}/cmdline").read_bytes()
+        except OSError:
+            return None
+        # Zombies have an empty command line
+        return command.replace(b"\0", b" ").decode("utf-8", "replace").strip() or None
+
+    if os.name == "nt":
+        probe = ["tasklist", "/FI", f"PID eq {pid}", "/FO", "CSV", "/NH"]
+    else:
+        probe = ["ps", "-o", "command=", "-p", str(pid)]
+    try:
+        output = subprocess.run(probe, capture_output=True, text=True, timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if os.name == "nt" and not output.startswith('"'):
+        return None  # "INFO: No tasks are running which match the specified criteria."
+    return output or None
+
+
+def _is_shared_browser(state: Dict[str, Any]) -> bool:
+    """Whether the state's pid is still the Chromium that ``start`` launched.
+
+    Pids are reused, so a stale state file may name an unrelated process.
+    """
+    command = _process_command(state["pid"])
+    if not command:
+        return False
+    executable = state.get("executable")
+    if "chrom" not in command.lower() and not (executable and executable in command):
+        return False
+    # tasklist only reports the image name
+    return os.name == "nt" or f"--remote-debugging-port={state['port']}" in command
+
+
+def start(
+    port: int,
+    headless: bool = True,
+    user_data_dir: Optional[str] = None,
+    state_file: Optional[str] = None,
+    foreground: bool = False,
+    startup_timeout: float = 15.0,
+) -> Dict[str, Any]:
+    """Launch Chromium with a CDP endpoint and record it in the state file."""
+    state_path = Path(state_file or config.get("browser.server.state_file"))
+    state = read_state(str(state_path))
+    if state and is_alive(state["endpoint"]):
+        logger.info("Shared browser already running at %s (pid %s)", state["endpoint"], state["pid"])
+        return state
+    if state:
+        logger.info("Clearing stale browser server state %s", state_path)
+        state_path.unlink(missing_ok=True)
+
+    endpoint = f"http://127.0.0.1:{port}"
+    executable = _chromium_executable()
+    command = [
+        executable,
+        *CHROMIUM_ARGS,
+        f"--remote-debugging-port={port}",
+        "--remote-debugging-address=127.0.0.1",
+        f"--user-data-dir={user_data_dir or tempfile.mkdtemp(prefix='suno-browser-')}",
+    ]
+    if headless:
+        command.append("--headless=new")
+    command.append("about:blank")
+
+    try:
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            # Detach so the browser outlives this command
+            start_new_session=not foreground,
+        )
+    except FileNotFoundError:
+        raise BrowserError(
+            f"Chromium not found at {executable}. Install it with: playwright install chromium",
+            "BROWSER_SERVER_START_ERROR",
+        ) from None
+
+    deadline = time.monotonic() + startup_timeout
+    while not is_alive(endpoint):
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.kill()
+            raise BrowserError(f"Shared browser did not start on port {port}", "BROWSER_SERVER_START_ERROR")
+        time.sleep(0.2)
+
+    state = {
+        "endpoint": endpoint,
+        "pid": process.pid,
+        "port": port,
+        "executable": executable,
+        "started_at": time.time(),
+    }
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    state_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+    logger.info("Shared browser running at %s (pid %s)", endpoint, process.pid)
+
+    if foreground:
+        try:
+            process.wait()
+        except KeyboardInterrupt:
+            process.terminate()
+            process.wait()
+        finally:
+            state_path.unlink(missing_ok=True)
+    return state
+
+
+def stop(state_file: Optional[str] = None) -> bool:
+    """Stop the shared browser. Returns False if none was running."""
+    state_path = Path(state_file or config.get("browser.server.state_file"))
+    state = read_state(str(state_path))
+    if not state:
+        return False
+
+    if not _is_shared_browser(state):
+        # Never signal a pid that has exited or been reused by another program
+        logger.info("Shared browser (pid %s) is no longer running; clearing stale state", state["pid"])
+        state_path.unlink(missing_ok=True)
+        return False
+
+    try:
+        os.kill(state["pid"], signal.SIGTERM)
+        logger.info("Stopped shared browser (pid %s)", state["pid"])
+    except ProcessLookupError:
+        logger.info("Shared browser (pid %s) had already exited", state["pid"])
+    state_path.unlink(missing_ok=True)
+    return True
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the lifecycle command line."""
+    parser = argparse.ArgumentParser(prog="suno-mcp-browser", description="Shared browser for Suno MCP servers")
+    parser.add_argument("--state-file", help="Where the running server's endpoint is recorded")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    start_parser = commands.add_parser("start", help="Launch the shared browser")
+    start_parser.add_argument("--port", type=int, default=config.get("browser.server.port", 9222))
+    start_parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    start_parser.add_argument("--user-data-dir", help="Browser profile directory (default: a fresh temp dir)")
+    start_parser.add_argument("--foreground", action="store_true", help="Stay attached until the browser exits")
+
+    commands.add_parser("stop", help="Stop the shared browser")
+    commands.add_parser("status", help="Show the shared browser endpoint")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for ``suno-mcp-browser``."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    args = parse_args(argv)
+
+    try:
+        if args.command == "start":
+            state = start(
+                args.port,
+                headless=not args.headed,
+                user_data_dir=args.user_data_dir,
+                state_file=args.state_file,
+                foreground=args.foreground,
+            )
+            print(state["endpoint"])
+        elif args.command == "stop":
+            if not stop(args.state_file):
+                print("No shared browser is running")
+                return 1
+        else:
+            state = read_state(args.state_file)
+            if not state or not is_alive(state["endpoint"]):
+                print("No shared browser is running")
+                return 1
+            print(json.dumps(state, indent=2))
+    except BrowserError as e:
+        logger.error(str(e))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
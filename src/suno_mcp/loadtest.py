@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""HTTP load test for the FastAPI layer with a stubbed Suno backend.
+
+``suno-mcp-loadtest`` swaps the server's ``BasicSunoTools`` for
+``FakeSunoTools``, which sleeps for a configurable latency instead of
+driving a browser. It then ramps the number of concurrent
+``POST /api/v1/tools/{name}`` clients against the real app. Because the
+backend cost is known, the measured latency above it is the cost of HTTP,
+validation, scheduling and serialization. Each stage's p50/p95/p99
+latency, throughput and error rate go into a JSON report that can be
+compared between builds.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import math
+import platform
+import random
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from . import __version__, server
+from .tools.basic.tools import BasicSunoTools
+from .tools.shared.exceptions import SunoError
+from .tools.shared.logs import configure_logging
+from .tools.shared.models import (
+    CompletionResult,
+    DownloadResult,
+    FileInfo,
+    GenerationResult,
+    SessionStatus,
+    TrackInfo,
+)
+from .tools.shared.utils import config
+
+logger = logging.getLogger(__name__)
+
+# Arguments sent for each tool the fake backend implements
+TOOL_ARGUMENTS: Dict[str, Dict[str, Any]] = {
+    "suno_generate_track": {"prompt": "load test synthwave track", "style": "synthwave"},
+    "suno_download_track": {"track_id": "loadtest-track", "include_stems": True},
+    "suno_wait_for_completion": {"track_id": "loadtest-track", "timeout": 30},
+    "suno_get_status": {},
+}
+
+
+class FakeSunoTools(BasicSunoTools):
+    """``BasicSunoTools`` that sleeps instead of driving Suno.
+
+    Each operation takes ``latency_ms`` (normally distributed with
+    ``jitter_ms`` standard deviation) and fails with probability
+    ``error_rate``. It returns the same result models as the real tools,
+    so serialization costs the same.
+    """
+
+    def __init__(self, latency_ms: float = 50.0, jitter_ms: float = 0.0, error_rate: float = 0.0) -> None:
+        super().__init__()
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+
+    async def _work(self) -> float:
+        """Simulate one backend operation; returns the simulated latency."""
+        delay = max(0.0, random.gauss(self.latency_ms, self.jitter_ms)) if self.jitter_ms else self.latency_ms
+        await asyncio.sleep(delay / 1000)
+        if self.error_rate and random.random() < self.error_rate:
+            raise SunoError("Simulated backend failure", "LOADTEST_FAILURE")
+        return round(delay, 1)
+
+    async def generate_track(
+        self,
+        prompt: str,
+        style: str = "synthwave",
+        lyrics: Optional[str] = None,
+        duration: str = "auto",
+    ) -> GenerationResult:
+        elapsed = await self._work()
+        self.last_generated_ids = [uuid.uuid4().hex, uuid.uuid4().hex]
+        return GenerationResult(
+            status="started",
+            prompt=prompt,
+            style=style,
+            lyrics=lyrics,
+            started=True,
+            track_ids=self.last_generated_ids,
+            elapsed_ms=elapsed,
+        )
+
+    async def download_track(
+        self, track_id: str, download_path: str = "downloads/", include_stems: bool = True
+    ) -> DownloadResult:
+        elapsed = await self._work()
+        files = [FileInfo(path=f"{download_path}{track_id}.mp3", filename=f"{track_id}.mp3", bytes=4_800_000)]
+        if include_stems:
+            files.append(
+                FileInfo(path=f"{download_path}{track_id}_stems.zip", filename=f"{track_id}_stems.zip",
+                         bytes=38_000_000, kind="stems")
+            )
+        return DownloadResult(track_id=track_id, files=files, elapsed_ms=elapsed)
+
+    async def wait_for_completion(
+        self,
+        track_id: Optional[str] = None,
+        timeout: float = 300,
+        track_ids: Optional[List[str]] = None,
+    ) -> CompletionResult:
+        elapsed = await self._work()
+        ids = track_ids or ([track_id] if track_id else self.last_generated_ids)
+        tracks = [
+            TrackInfo(track_id=tid, title="Load Test", status="complete", audio_url=f"https://cdn.example/{tid}.mp3")
+            for tid in ids
+        ]
+        return CompletionResult(tracks=tracks, waited_s=elapsed / 1000, elapsed_ms=elapsed)
+
+    async def get_status(self) -> SessionStatus:
+        elapsed = await self._work()
+        return SessionStatus(browser_open=True, page_ready=True, current_url="https://app.suno.ai/create/",
+                             elapsed_ms=elapsed)
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of sorted values."""
+    if not values:
+        return None
+    return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+
+class UvicornThread:
+    """The app served by uvicorn on a loopback port, in its own thread and event loop."""
+
+    def __init__(self, app: Any) -> None:
+        import uvicorn
+
+        self.server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=0, log_config=None, access_log=False, lifespan="on")
+        )
+        self.thread = threading.Thread(target=self.server.run, name="loadtest-server", daemon=True)
+
+    def __enter__(self) -> str:
+        self.thread.start()
+        deadline = time.monotonic() + 10
+        while not self.server.started:
+            if not self.thread.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError("Load test server failed to start")
+            time.sleep(0.01)
+        port = self.server.servers[0].sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    def __exit__(self, *exc: Any) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+
+async def run_stage(
+    client: httpx.AsyncClient,
+    concurrency: int,
+    duration: float,
+    tools: List[str],
+) -> Dict[str, Any]:
+    """Run ``concurrency`` closed-loop clients for ``duration`` seconds."""
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    errors = 0
+    next_tool = itertools.cycle(tools)
+
+    async def worker(index: int) -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            tool = next(next_tool)
+            body = {"name": tool, "arguments": TOOL_ARGUMENTS[tool], "client_id": f"loadtest-{index}"}
+            started = time.perf_counter()
+            try:
+                response = await client.post(f"/api/v1/tools/{tool}", json=body)
+                status = str(response.status_code)
+                ok = response.status_code == 200
+            except httpx.HTTPError as e:
+                status, ok = type(e).__name__, False
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    requests = len(latencies)
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "error_rate": round(errors / requests, 4) if requests else 0.0,
+        "throughput_rps": round(requests / wall, 1) if wall else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / requests, 2) if requests else None,
+            **{f"p{p}": round(percentile(latencies, p), 2) if requests else None for p in (50, 95, 99)},
+            "max": round(latencies[-1], 2) if requests else None,
+        },
+        "status_codes": statuses,
+    }
+
+
+def summarize(stages: List[Dict[str, Any]], backend_ms: float) -> Dict[str, Any]:
+    """Peak throughput, where it levels off, and the overhead above the backend."""
+    if not stages:
+        return {}
+    peak = max(stages, key=lambda s: s["throughput_rps"])
+    # Lowest concurrency that already reaches 90% of peak throughput
+    knee = next(s for s in stages if s["throughput_rps"] >= 0.9 * peak["throughput_rps"])
+    first = stages[0]["latency_ms"]["p50"]
+    return {
+        "peak_throughput_rps": peak["throughput_rps"],
+        "peak_at_concurrency": peak["concurrency"],
+        "knee_concurrency": knee["concurrency"],
+        "overhead_p50_ms": round(first - backend_ms, 2) if first is not None else None,
+        "max_error_rate": max(s["error_rate"] for s in stages),
+    }
+
+
+async def run_load_test(base_url: Optional[str], args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """Ramp through every concurrency level against one client."""
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    if base_url:
+        client = httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout)
+    else:
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=server.fastapi_app), base_url="http://loadtest", timeout=args.timeout
+        )
+
+    stages = []
+    async with client:
+        if args.warmup:
+            await run_stage(client, min(args.concurrency), args.warmup, args.tool)
+        for concurrency in args.concurrency:
+            stage = await run_stage(client, concurrency, args.duration, args.tool)
+            stages.append(stage)
+            latency = stage["latency_ms"]
+            print(
+                f"  c={concurrency:<4} {stage['throughput_rps']:>8.1f} req/s  "
+                f"p50 {latency['p50']} ms  p95 {latency['p95']} ms  p99 {latency['p99']} ms  "
+                f"errors {stage['error_rate']:.2%}"
+            )
+    return stages
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse load test options."""
+    parser = argparse.ArgumentParser(
+        prog="suno-mcp-loadtest",
+        description="Load test the HTTP tool API against a fake Suno backend",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=lambda value: [int(c) for c in value.split(",")],
+        default=[1, 2, 4, 8, 16, 32, 64],
+        help="Comma-separated concurrency levels to ramp through (default: 1,2,4,8,16,32,64)",
+    )
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per concurrency level (default: 10)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Warm-up seconds before the first level (default: 2)")
+    parser.add_argument(
+        "--tool",
+        action="append",
+        choices=sorted(TOOL_ARGUMENTS),
+        help="Tool to call; repeat for a round-robin mix (default: all of them)",
+    )
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Fake backend latency (default: 50)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Standard deviation of the fake latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of backend calls that fail")
+    parser.add_argument(
+        "--scheduler-concurrency",
+        type=int,
+        help="Jobs the scheduler runs at once (default: the configured value)",
+    )
+    parser.add_argument(
+        "--transport",
+        choices=["http", "asgi"],
+        default="http",
+        help="http: real uvicorn on a loopback port; asgi: in-process, without the HTTP server",
+    )
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--label", help="Build label recorded in the report (e.g. a commit or branch)")
+    parser.add_argument("--report", default="loadtest-report.json", help="Where to write the JSON report")
+    args = parser.parse_args(argv)
+    args.tool = args.tool or sorted(TOOL_ARGUMENTS)
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for ``suno-mcp-loadtest``."""
+    args = parse_args(argv)
+    config.set("logging.level", "WARNING")
+    configure_logging(config)
+
+    server.basic_tools = FakeSunoTools(args.latency_ms, args.jitter_ms, args.error_rate)
+    if args.scheduler_concurrency:
+        server.scheduler.concurrency = args.scheduler_concurrency
+
+    print(
+        f"🎵 Load testing {', '.join(args.tool)} over {args.transport} "
+        f"(backend {args.latency_ms} ms, scheduler concurrency {server.scheduler.concurrency})"
+    )
+    started_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    if args.transport == "http":
+        with UvicornThread(server.fastapi_app) as base_url:
+            stages = asyncio.run(run_load_test(base_url, args))
+    else:
+        stages = asyncio.run(run_load_test(None, args))
+
+    report = {
+        "label": args.label,
+        "started_at": started_at,
+        "version": __version__,
+        "python": platform.python_version(),
+        "transport": args.transport,
+        "tools": args.tool,
+        "backend": {"latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "error_rate": args.error_rate},
+        "scheduler_concurrency": server.scheduler.concurrency,
+        "stage_duration_s": args.duration,
+        "stages": stages,
+        "summary": summarize(stages, args.latency_ms),
+    }
+    Path(args.report).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    summary = report["summary"]
+    print(
+        f"✅ Peak {summary['peak_throughput_rps']} req/s at c={summary['peak_at_concurrency']} "
+        f"(levels off at c={summary['knee_concurrency']}); report written to {args.report}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""Declarative tool registry shared by the MCP and FastAPI interfaces."""
+
+import contextvars
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import typing
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Type, Union
+
+from mcp.server import FastMCP
+from mcp.server.fastmcp import Context
+from pydantic import BaseModel, create_model
+
+from .tools.shared import logs
+from .tools.shared.models import ToolResult
+from .tools.shared.scheduler import JobScheduler
+
+ToolHandler = Callable[..., Awaitable[Any]]
+
+# Client and priority of the tool call being run, for ``ToolRegistry.schedule``
+_current_call: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar("suno_tool_call", default=None)
+
+
+class ToolSpec:
+    """Everything the server needs to know about one tool."""
+
+    def __init__(
+        self,
+        fn: ToolHandler,
+        category: str,
+        scheduled: bool = False,
+        priority: str = "interactive",
+        cost: Union[float, Callable[..., float]] = 0.0,
+    ) -> None:
+        self.fn = fn
+        self.name = fn.__name__
+        self.category = category
+        self.scheduled = scheduled
+        self.priority = priority
+        self._cost = cost
+        self.description = inspect.cleandoc(fn.__doc__ or f"{self.name} tool")
+        self.summary = self.description.split("\n\n", 1)[0].strip()
+        self.signature = inspect.signature(fn)
+
+        hints = typing.get_type_hints(fn)
+        self.context_param: Optional[str] = None
+        fields: Dict[str, Any] = {}
+        for name, param in self.signature.parameters.items():
+            annotation = hints.get(name, Any)
+            if _is_context(annotation):
+                self.context_param = name
+                continue
+            default = ... if param.default is inspect.Parameter.empty else param.default
+            fields[name] = (annotation, default)
+        self.args_model: Type[BaseModel] = create_model(f"{self.name}Arguments", **fields)
+
+    def cost(self, arguments: Dict[str, Any]) -> float:
+        """Credits a call with these arguments is expected to consume.
+
+        A callable cost may take the tool's arguments as keywords.
+        """
+        if not callable(self._cost):
+            return self._cost
+        if inspect.signature(self._cost).parameters:
+            return self._cost(**arguments)
+        return self._cost()
+
+    def listing(self) -> Dict[str, Any]:
+        """Public description used by the HTTP tool listing."""
+        return {
+            "name": self.name,
+            "description": self.summary,
+            "category": self.category,
+            "parameters": self.args_model.model_json_schema(),
+        }
+
+
+def _is_context(annotation: Any) -> bool:
+    """Whether an annotation is (optionally) the MCP request Context."""
+    candidates = typing.get_args(annotation) or (annotation,)
+    return any(inspect.isclass(c) and issubclass(c, Context) for c in candidates)
+
+
+def _mcp_client_id(ctx: Optional[Context]) -> str:
+    """Best-effort client ID for an MCP request."""
+    try:
+        return (ctx and ctx.client_id) or "mcp"
+    except Exception:
+        return "mcp"
+
+
+class ToolRegistry:
+    """Single source of truth for tool registration, dispatch and listing.
+
+    Tools are declared once with ``@registry.tool(...)``. At startup the
+    registry registers them with FastMCP and precomputes the HTTP listing
+    and its ETag, so neither is rebuilt per request.
+    """
+
+    def __init__(self, scheduler: JobScheduler) -> None:
+        self.scheduler = scheduler
+        self._specs: Dict[str, ToolSpec] = {}
+        self.listing_body: bytes = b""
+        self.etag: str = ""
+        self.logger = logging.getLogger(__name__)
+
+    def tool(
+        self,
+        category: str = "basic",
+        scheduled: bool = False,
+        priority: str = "interactive",
+        cost: Union[float, Callable[..., float]] = 0.0,
+    ) -> Callable[[ToolHandler], ToolHandler]:
+        """Declare a tool. Scheduled tools are queued by the job scheduler."""
+
+        def decorator(fn: ToolHandler) -> ToolHandler:
+            spec = ToolSpec(fn, category, scheduled, priority, cost)
+            if spec.name in self._specs:
+                raise ValueError(f"Tool already registered: {spec.name}")
+            self._specs[spec.name] = spec
+            return fn
+
+        return decorator
+
+    def get(self, name: str) -> Optional[ToolSpec]:
+        """Look up a tool by name."""
+        return self._specs.get(name)
+
+    def specs(self, category: Optional[str] = None) -> List[ToolSpec]:
+        """Registered tools, optionally filtered by category."""
+        return [s for s in self._specs.values() if category is None or s.category == category]
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def validate(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate raw arguments; raises pydantic.ValidationError."""
+        spec = self._specs[name]
+        validated = spec.args_model.model_validate(arguments)
+        return {field: getattr(validated, field) for field in spec.args_model.model_fields}
+
+    async def call(
+        self,
+        name: str,
+        arguments: Dict[str, Any],
+        client_id: str = "anonymous",
+        priority: Optional[str] = None,
+    ) -> Any:
+        """Run a tool with already-validated arguments."""
+        spec = self._specs[name]
+        token = _current_call.set({"name": name, "client_id": client_id, "priority": priority or spec.priority})
+        try:
+            with logs.bind(tool=name, session=client_id):
+                if not spec.scheduled:
+                    return await spec.fn(**arguments)
+                return await self.scheduler.submit(
+                    lambda: spec.fn(**arguments),
+                    client_id=client_id,
+                    priority=priority or spec.priority,
+                    cost=spec.cost(arguments),
+                    name=name,
+                )
+        finally:
+            _current_call.reset(token)
+
+    async def schedule(self, fn: Callable[[], Awaitable[Any]], cost: float = 0.0) -> Any:
+        """Queue part of an unscheduled tool's work as the calling client.
+
+        For tools where only one phase needs the browser (and a scheduler
+        slot) and the rest is waiting, e.g. submitting stems but not
+        waiting for them.
+        """
+        call = _current_call.get() or {}
+        return await self.scheduler.submit(
+            fn,
+            client_id=call.get("client_id", "anonymous"),
+            priority=call.get("priority", "interactive"),
+            cost=cost,
+            name=call.get("name", "job"),
+        )
+
+    def _mcp_handler(self, spec: ToolSpec) -> ToolHandler:
+        """Wrap a tool so MCP clients receive rendered text."""
+
+        @functools.wraps(spec.fn)
+        async def handler(**kwargs: Any) -> str:
+            ctx = kwargs.get(spec.context_param) if spec.context_param else None
+            result = await self.call(spec.name, kwargs, client_id=_mcp_client_id(ctx))
+            return result.render() if isinstance(result, ToolResult) else result
+
+        # FastMCP derives the input schema from the signature; the output is text
+        handler.__signature__ = spec.signature.replace(return_annotation=str)  # type: ignore[attr-defined]
+        handler.__annotations__ = {**spec.fn.__annotations__, "return": str}
+        return handler
+
+    def freeze(self, mcp_app: FastMCP) -> None:
+        """Register every tool with MCP and precompute the HTTP listing."""
+        for spec in self._specs.values():
+            mcp_app.add_tool(self._mcp_handler(spec), name=spec.name, description=spec.description)
+
+        self.listing_body = json.dumps(
+            {"tools": [spec.listing() for spec in self._specs.values()]},
+            separators=(",", ":"),
+        ).encode("utf-8")
+        self.etag = f'"{hashlib.sha256(self.listing_body).hexdigest()[:32]}"'
+        self.logger.info("Registered %s tools", len(self._specs))
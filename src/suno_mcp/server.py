@@ -1,21 +1,63 @@
 #!/usr/bin/env python3
 """Suno MCP Server - Dual Interface (MCP + FastAPI) Implementation."""
 
+import argparse
 import asyncio
+import json
 import logging
+import mimetypes
 import os
-import sys
 from contextlib import asynccontextmanager
+from pathlib import Path
 from typing import Any, Dict, List, Optional
+from urllib.parse import quote, urlencode
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from mcp import Tool
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from mcp.server import FastMCP
-from pydantic import BaseModel
+from mcp.server.fastmcp import Context
+from pydantic import BaseModel, ValidationError
+from pydantic_core import to_json
 
+from .browser_server import resolve_endpoint
+from .registry import ToolRegistry
+from .tools.basic.accounts import AccountPool
 from .tools.basic.tools import BasicSunoTools
+from .tools.shared.downloads import DownloadStore
+from .tools.shared.exceptions import SunoError
+from .tools.shared.logs import configure_logging
+from .tools.shared.metrics import metrics
+from .tools.shared.models import (
+    BatchDownloadResult,
+    BrowserResult,
+    CompletionResult,
+    DownloadResult,
+    GenerationResult,
+    LibrarySearchResult,
+    LibrarySyncResult,
+    LoginResult,
+    MessageResult,
+    SessionStatus,
+    StemRequest,
+    StemSetResult,
+    StemSubmission,
+)
+from .tools.shared.scheduler import PRIORITIES, CreditBudget, JobScheduler
+from .tools.shared.utils import config, resilience, timeouts
+from .tools.shared.webhooks import WebhookDispatcher, validate_callback_url
+from .tools.studio.tools import StudioTools
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response serialized by pydantic-core, models included.
+
+    Returning it directly from a route also skips FastAPI's
+    jsonable_encoder pass over the result.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
 
 
 # FastAPI Models
@@ -23,6 +65,14 @@ class ToolRequest(BaseModel):
     """Request model for tool execution via FastAPI."""
     name: str
     arguments: Optional[Dict[str, Any]] = None
+    client_id: Optional[str] = None
+    priority: Optional[str] = None  # Defaults to the tool's declared priority
+
+
+class CreditsRequest(BaseModel):
+    """Request model for setting an account's remaining credits."""
+    account: str = "default"
+    credits: Optional[float] = None
 
 
 class HealthResponse(BaseModel):
@@ -41,13 +91,53 @@ class StatusResponse(BaseModel):
     page_title: Optional[str]
     in_studio: bool
     server_mode: str
+    context_ready: bool = False
+    shared_browser: bool = False
+    pages_open: int = 0
+    last_error: Optional[str] = None
+    updated_at: Optional[float] = None
+    breakers: Dict[str, Dict[str, Any]] = {}
+
+
+class DeepStatusResponse(StatusResponse):
+    """Status after a real browser round trip."""
+    responsive: bool
+    latency_ms: Optional[float]
 
 
 # Global instances
 basic_tools = BasicSunoTools()
+studio_tools = StudioTools(basic_tools.browser_manager)
+scheduler = JobScheduler(
+    concurrency=config.get("scheduler.concurrency", 1),
+    budget=CreditBudget(config.get("scheduler.credit_budgets", {})),
+    client_weights=config.get("scheduler.client_weights", {}),
+    max_deferral=config.get("scheduler.max_deferral", 300),
+)
+
+# Completion callbacks; pending deliveries persist across restarts
+webhooks = WebhookDispatcher(config)
+_callback_tasks: set = set()
+
+# Set up by setup_account_pool() when a credentials file is configured
+account_pool: Optional[AccountPool] = None
+
+# Every tool is declared once here and drives MCP, HTTP dispatch and listing
+registry = ToolRegistry(scheduler)
+
+
+@asynccontextmanager
+async def mcp_lifespan(app: FastMCP):
+    """Resume webhook deliveries for the lifetime of the MCP session."""
+    webhooks.start()
+    try:
+        yield {}
+    finally:
+        await webhooks.close()
+
 
 # FastMCP App
-mcp_app = FastMCP("suno-mcp")
+mcp_app = FastMCP("suno-mcp", lifespan=mcp_lifespan)
 
 # Lifespan context manager for FastAPI
 @asynccontextmanager
@@ -55,9 +145,11 @@ async def lifespan(app: FastAPI):
     """Handle FastAPI startup and shutdown events."""
     # Startup
     logging.info("Starting Suno MCP Server (Dual Interface)")
+    webhooks.start()
     yield
     # Shutdown
     logging.info("Shutting down Suno MCP Server")
+    await webhooks.close()
 
 
 # FastAPI App
@@ -93,47 +185,67 @@ async def health_check():
         status="ok",
         version="1.0.0",
         uptime=current_time - start_time,
-        tools_loaded=23  # Total number of tools
+        tools_loaded=len(registry)
     )
 
 
 @fastapi_app.get("/api/v1/status", response_model=StatusResponse)
 async def get_status():
-    """Get current server and browser status."""
+    """Get current server and browser status.
+
+    Served from the in-memory snapshot the browser manager keeps up to date
+    from page events; this never touches the browser.
+    """
+    browser_status = await basic_tools.get_browser_status()
+    return StatusResponse(**browser_status, server_mode="dual")
+
+
+@fastapi_app.get("/api/v1/status/deep", response_model=DeepStatusResponse)
+async def get_deep_status():
+    """Get browser status after a real round trip to the page."""
     try:
-        # Get browser status from basic tools
-        browser_status = await basic_tools.get_browser_status()
-        return StatusResponse(
-            browser_open=browser_status.get("browser_open", False),
-            page_ready=browser_status.get("page_ready", False),
-            current_url=browser_status.get("current_url"),
-            page_title=browser_status.get("page_title"),
-            in_studio=browser_status.get("current_url", "").includes("/studio") if browser_status.get("current_url") else False,
-            server_mode="dual"
-        )
+        browser_status = await basic_tools.browser_manager.deep_check()
+        return DeepStatusResponse(**browser_status, breakers=resilience.snapshot(), server_mode="dual")
     except Exception as e:
-        logging.error(f"Status check failed: {e}")
-        raise HTTPException(status_code=500, detail="Status check failed")
+        logging.error("Deep status check failed: %s", e)
+        raise HTTPException(status_code=500, detail="Deep status check failed") from e
 
 
-@fastapi_app.get("/api/v1/tools")
-async def list_tools():
-    """List all available tools via FastAPI."""
-    tools = []
+@fastapi_app.get("/api/v1/metrics")
+async def get_metrics():
+    """Get in-process counters and latency/size summaries."""
+    return metrics.snapshot()
+
+
+@fastapi_app.get("/api/v1/timeouts")
+async def get_timeouts():
+    """Get the current adaptive timeout of each browser step and the latencies behind it."""
+    return timeouts.snapshot()
+
+
+@fastapi_app.get("/api/v1/webhooks")
+async def get_webhooks():
+    """Get webhook queue depth per endpoint, dead letters and delivery latency."""
+    return webhooks.status()
 
-    # Basic tools
-    basic_tool_names = [
-        "suno_open_browser", "suno_login", "suno_generate_track",
-        "suno_download_track", "suno_get_status", "suno_close_browser"
-    ]
-    for name in basic_tool_names:
-        tools.append({
-            "name": name,
-            "description": getattr(basic_tools, f"get_{name}_description", lambda: f"{name} tool")(),
-            "category": "basic"
-        })
 
-    return {"tools": tools}
+@fastapi_app.get("/api/v1/resilience")
+async def get_resilience():
+    """Get the circuit breaker state of each Suno operation."""
+    return resilience.snapshot()
+
+
+@fastapi_app.get("/api/v1/tools")
+async def list_tools(request: Request):
+    """List all available tools via FastAPI.
+
+    The listing is precomputed at startup; clients that send the ETag back
+    in If-None-Match get an empty 304.
+    """
+    headers = {"ETag": registry.etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == registry.etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=registry.listing_body, media_type="application/json", headers=headers)
 
 
 @fastapi_app.post("/api/v1/tools/{tool_name}")
@@ -142,42 +254,158 @@ async def execute_tool(tool_name: str, request: ToolRequest):
     try:
         args = request.arguments or {}
 
-        # Route to appropriate tool handler
-        if tool_name.startswith("suno_"):
-            result = await _handle_basic_tool(tool_name, args)
-        else:
+        if request.priority is not None and request.priority not in PRIORITIES:
+            raise HTTPException(status_code=422, detail=f"Unknown priority: {request.priority}")
+
+        if registry.get(tool_name) is None:
             raise HTTPException(status_code=404, detail=f"Unknown tool: {tool_name}")
 
-        return {"result": result, "tool": tool_name, "success": True}
+        try:
+            validated = registry.validate(tool_name, args)
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_input=False)) from e
+
+        result = await registry.call(
+            tool_name, validated, client_id=request.client_id or "http", priority=request.priority
+        )
+
+        return FastJSONResponse({"result": result, "tool": tool_name, "success": True})
 
+    except HTTPException:
+        raise
     except Exception as e:
-        logging.error(f"Tool execution failed: {tool_name}", exc_info=True)
+        logging.error("Tool execution failed: %s", tool_name, exc_info=True)
         raise HTTPException(status_code=400, detail=str(e))
 
 
-# Tool execution helpers
-async def _handle_basic_tool(tool_name: str, args: Dict[str, Any]) -> str:
-    """Handle basic Suno AI tools."""
-    tool_map = {
-        "suno_open_browser": basic_tools.open_browser,
-        "suno_login": basic_tools.login,
-        "suno_generate_track": basic_tools.generate_track,
-        "suno_download_track": basic_tools.download_track,
-        "suno_get_status": basic_tools.get_status,
-        "suno_close_browser": basic_tools.close_browser,
-    }
+@fastapi_app.get("/api/v1/tracks/events")
+async def track_events():
+    """Stream track status changes as Server-Sent Events."""
+    tracker = basic_tools.browser_manager.tracker
+
+    async def event_stream():
+        queue = tracker.subscribe()
+        try:
+            while True:
+                try:
+                    track = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {track['status']}\ndata: {json.dumps(track)}\n\n"
+        finally:
+            tracker.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
 
-    if tool_name not in tool_map:
-        raise HTTPException(status_code=404, detail=f"Unknown basic tool: {tool_name}")
+@fastapi_app.get("/api/v1/tracks/{track_id}/wait")
+async def wait_for_track(track_id: str, timeout: float = 30.0):
+    """Long-poll until a track completes or fails, or the timeout elapses."""
+    tracker = basic_tools.browser_manager.tracker
+    try:
+        track = await tracker.wait_for(track_id, timeout=min(timeout, 300.0))
+    except asyncio.TimeoutError:
+        track = tracker.get(track_id) or {"track_id": track_id, "status": "unknown"}
+        return {"track": track, "done": False}
+    return {"track": track, "done": True}
 
-    return await tool_map[tool_name](**args)
 
+def _download_dir(directory: str = "") -> Path:
+    """Resolve a directory under the download root, refusing anything outside it."""
+    root = Path(config.get("paths.downloads", "downloads/")).resolve()
+    target = (root / directory).resolve()
+    if target != root and root not in target.parents:
+        raise HTTPException(status_code=400, detail="Directory must be inside the download root")
+    return target
 
 
+@fastapi_app.get("/api/v1/downloads")
+async def list_downloads(directory: str = ""):
+    """List downloaded tracks and stems recorded in a download directory's manifest.
 
-# MCP Tool Registration (FastMCP 2.12 decorators with multiline documentation)
-@mcp_app.tool()
-async def suno_open_browser(headless: bool = True) -> str:
+    Each file carries a URL that streams it with Range support.
+    """
+    target = _download_dir(directory)
+    tracks = []
+    for entry in DownloadStore(str(target)).entries():
+        files = [
+            dict(
+                f,
+                exists=Path(f["path"]).exists(),
+                url=f"/api/v1/downloads/{quote(entry['track_id'])}/{quote(f['filename'])}"
+                + (f"?{urlencode({'directory': directory})}" if directory else ""),
+            )
+            for f in entry["files"]
+        ]
+        tracks.append({"track_id": entry["track_id"], "downloaded_at": entry.get("downloaded_at"), "files": files})
+    return {"directory": str(target), "count": len(tracks), "tracks": tracks}
+
+
+@fastapi_app.api_route("/api/v1/downloads/{track_id}/{filename}", methods=["GET", "HEAD"])
+async def stream_download(track_id: str, filename: str, request: Request, directory: str = ""):
+    """Stream a downloaded file with Range (206), If-Range and ETag/304 support.
+
+    The file is sent in chunks (or handed to the server via the ASGI
+    pathsend extension where supported), never read into memory.
+    """
+    target = _download_dir(directory)
+    entry = DownloadStore(str(target)).get(track_id)
+    recorded = next((f for f in (entry or {}).get("files", []) if f["filename"] == filename), None)
+    if recorded is None:
+        raise HTTPException(status_code=404, detail=f"No downloaded file {filename} for track {track_id}")
+
+    path = Path(recorded["path"]).resolve()
+    if target not in path.parents:
+        raise HTTPException(status_code=404, detail="Recorded file is outside the download directory")
+    try:
+        stat_result = await asyncio.to_thread(os.stat, path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"File no longer on disk: {filename}") from None
+
+    response = FileResponse(
+        path,
+        stat_result=stat_result,
+        media_type=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+        headers={"Cache-Control": "private, max-age=3600"},
+        content_disposition_type="inline",
+    )
+    etag = response.headers["etag"]
+    if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, max-age=3600"})
+    return response
+
+
+@fastapi_app.get("/api/v1/scheduler")
+async def get_scheduler_status():
+    """Get queue depths, deferred jobs, credit budgets and wait times by priority."""
+    return scheduler.status()
+
+
+@fastapi_app.post("/api/v1/scheduler/credits")
+async def set_scheduler_credits(request: CreditsRequest):
+    """Set an account's remaining credits (null for unlimited) and start jobs it now affords."""
+    try:
+        return await set_credits(request.account, request.credits)
+    except SunoError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
+
+@fastapi_app.get("/api/v1/accounts")
+async def get_accounts_status():
+    """Get per-account load, remaining credits and cooldowns of the account pool."""
+    if account_pool is None:
+        return {"enabled": False, "accounts": []}
+    return {"enabled": True, "accounts": account_pool.status()}
+
+
+# Tool Registration (multiline documentation becomes the MCP tool description)
+@registry.tool()
+async def suno_open_browser(headless: bool = True) -> BrowserResult:
     """
     Open browser and navigate to Suno AI create page.
 
@@ -193,8 +421,8 @@ async def suno_open_browser(headless: bool = True) -> str:
     return await basic_tools.open_browser(headless)
 
 
-@mcp_app.tool()
-async def suno_login(email: str, password: str) -> str:
+@registry.tool()
+async def suno_login(email: str, password: str) -> LoginResult:
     """
     Login to Suno AI account.
 
@@ -212,13 +440,15 @@ async def suno_login(email: str, password: str) -> str:
     return await basic_tools.login(email, password)
 
 
-@mcp_app.tool()
+@registry.tool()
 async def suno_generate_track(
     prompt: str,
     style: str = "synthwave",
     lyrics: str | None = None,
     duration: str = "auto",
-) -> str:
+    callback_url: str | None = None,
+    ctx: Context | None = None,
+) -> GenerationResult:
     """
     Generate a new music track using Suno AI.
 
@@ -231,19 +461,97 @@ async def suno_generate_track(
         style: Musical style (e.g., "synthwave", "pop", "rock", default: "synthwave")
         lyrics: Optional lyrics to incorporate into the track
         duration: Track length ("auto", "short", "medium", "long", default: "auto")
+        callback_url: URL to POST a signed generation.completed / generation.failed
+            event to when the tracks finish (optional)
 
     Returns:
         Generation status and track information when complete
     """
-    return await basic_tools.generate_track(prompt, style, lyrics, duration)
+    if callback_url:
+        validate_callback_url(callback_url)
+
+    cost = config.get("scheduler.generation_cost", 10)
+    try:
+        if account_pool is None:
+            result = await registry.schedule(
+                lambda: basic_tools.generate_track(prompt, style, lyrics, duration), cost=cost
+            )
+        else:
+            # The pool reserves credits per account and bounds each account's
+            # concurrency, so pool generations skip the default-page scheduler
+            result = await account_pool.run(
+                lambda tools: tools.generate_track(prompt, style, lyrics, duration), cost=cost
+            )
+    except Exception as e:
+        if callback_url:
+            webhooks.enqueue(callback_url, "generation.failed", _failure_event(e, prompt=prompt, style=style))
+        raise
+    if account_pool is not None:
+        # Account trackers forward to the default one, so waiting works as usual
+        basic_tools.last_generated_ids = result.track_ids
 
+    if callback_url:
+        task = asyncio.create_task(_notify_generation(callback_url, result))
+        _callback_tasks.add(task)
+        task.add_done_callback(_callback_tasks.discard)
+    return result
 
-@mcp_app.tool()
+
+def _failure_event(error: BaseException, **fields: Any) -> Dict[str, Any]:
+    """Payload of a *.failed callback event."""
+    return {**fields, "error": str(error), "code": getattr(error, "code", None)}
+
+
+async def _notify_generation(callback_url: str, result: GenerationResult) -> None:
+    """Wait for a generation's tracks in the background and queue its callback."""
+    try:
+        if not result.track_ids:
+            raise SunoError("Suno did not report track IDs for this generation", "WAIT_ERROR")
+        completion = await basic_tools.wait_for_completion(
+            timeout=config.get("webhooks.generation_timeout", 900), track_ids=result.track_ids
+        )
+    except Exception as e:
+        webhooks.enqueue(
+            callback_url, "generation.failed",
+            _failure_event(e, prompt=result.prompt, style=result.style, track_ids=result.track_ids),
+        )
+    else:
+        webhooks.enqueue(
+            callback_url, "generation.completed",
+            {"prompt": result.prompt, "style": result.style, **completion.model_dump(mode="json")},
+        )
+
+
+@registry.tool()
+async def suno_wait_for_completion(
+    track_id: str | None = None,
+    timeout: float = 300,
+) -> CompletionResult:
+    """
+    Wait until a generated track is complete.
+
+    Resolves as soon as Suno reports the track as complete or failed; status
+    changes are pushed from the page, so there is no polling interval.
+    Without a track ID, waits for every track from the last generation.
+
+    Args:
+        track_id: Track to wait for (default: tracks from the last generation)
+        timeout: Maximum time to wait in seconds (default: 300)
+
+    Returns:
+        Track titles and audio URLs once generation has finished
+    """
+    return await basic_tools.wait_for_completion(track_id, timeout)
+
+
+@registry.tool(scheduled=True)
 async def suno_download_track(
     track_id: str,
     download_path: str = "downloads/",
     include_stems: bool = True,
-) -> str:
+    callback_url: str | None = None,
+    ctx: Context | None = None,
+) -> DownloadResult:
     """
     Download a generated track from Suno AI library.
 
@@ -254,15 +562,147 @@ async def suno_download_track(
         track_id: Unique identifier of the track to download
         download_path: Directory to save files (default: "downloads/")
         include_stems: Download individual track stems if available (default: True)
+        callback_url: URL to POST a signed download.completed / download.failed
+            event to when the download finishes (optional)
 
     Returns:
         Download confirmation with file paths and sizes
     """
-    return await basic_tools.download_track(track_id, download_path, include_stems)
+    if callback_url:
+        validate_callback_url(callback_url)
+    try:
+        result = await basic_tools.download_track(track_id, download_path, include_stems)
+    except Exception as e:
+        if callback_url:
+            webhooks.enqueue(callback_url, "download.failed", _failure_event(e, track_id=track_id))
+        raise
+    if callback_url:
+        webhooks.enqueue(callback_url, "download.completed", result.model_dump(mode="json"))
+    return result
 
 
-@mcp_app.tool()
-async def suno_get_status() -> str:
+@registry.tool(scheduled=True, priority="batch")
+async def suno_download_batch(
+    track_ids: list[str],
+    download_path: str = "downloads/",
+    include_stems: bool = False,
+    concurrency: int = 3,
+    skip_existing: bool = True,
+    callback_url: str | None = None,
+    ctx: Context | None = None,
+) -> BatchDownloadResult:
+    """
+    Download many tracks from the Suno AI library in one call.
+
+    Resolves every track ID with a single library scan, then downloads them in
+    parallel tabs. Tracks already recorded in the download directory are
+    skipped. Progress is reported per item as downloads finish.
+
+    Args:
+        track_ids: Track identifiers to download
+        download_path: Directory to save files (default: "downloads/")
+        include_stems: Download individual track stems if available (default: False)
+        concurrency: Maximum parallel downloads (default: 3)
+        skip_existing: Skip tracks already downloaded to download_path (default: True)
+        callback_url: URL to POST a signed batch.completed / batch.failed event to
+            when the whole batch finishes (optional)
+
+    Returns:
+        Per-track results with file names and sizes, and a summary
+    """
+    async def on_progress(done: int, total: int, result: Dict[str, Any]) -> None:
+        if ctx:
+            await ctx.report_progress(done, total)
+
+    if callback_url:
+        validate_callback_url(callback_url)
+    try:
+        result = await basic_tools.download_batch(
+            track_ids, download_path, include_stems, concurrency, skip_existing, on_progress
+        )
+    except Exception as e:
+        if callback_url:
+            webhooks.enqueue(callback_url, "batch.failed", _failure_event(e, track_ids=track_ids))
+        raise
+    if callback_url:
+        webhooks.enqueue(callback_url, "batch.completed", result.model_dump(mode="json"))
+    return result
+
+
+@registry.tool()
+async def suno_sync_library(full: bool = False, max_scrolls: int = 50) -> LibrarySyncResult:
+    """
+    Sync the Suno AI library into the local track index.
+
+    Crawls the library newest-first and stops once it reaches tracks indexed by
+    the previous sync, so repeated syncs only fetch new items. Indexes track ID,
+    title, prompt, style, duration, status and URLs in a local SQLite database.
+
+    Args:
+        full: Ignore the sync cursor and crawl the whole library (default: False)
+        max_scrolls: Maximum number of library pages to load (default: 50)
+
+    Returns:
+        Number of tracks synced and indexed, and the new sync cursor
+    """
+    return await basic_tools.sync_library(full, max_scrolls)
+
+
+@registry.tool()
+async def suno_search_library(
+    query: str = "",
+    status: str | None = None,
+    limit: int = 20,
+) -> LibrarySearchResult:
+    """
+    Search the local library index.
+
+    Matches every query term against title, prompt, style and track ID. Runs
+    entirely offline against the index built by suno_sync_library.
+
+    Args:
+        query: Search terms (default: "" lists the newest tracks)
+        status: Only return tracks with this status, e.g. "complete"
+        limit: Maximum number of results (default: 20)
+
+    Returns:
+        Matching tracks with IDs, styles and URLs
+    """
+    return await basic_tools.search_library(query, status, limit)
+
+
+async def set_credits(account: str, credits: Optional[float]) -> Dict[str, Any]:
+    """Update an account's credit budget and release jobs that were waiting for it."""
+    if credits is not None and credits < 0:
+        raise SunoError(f"Credits must not be negative (got {credits})", "INVALID_CREDITS")
+    scheduler.set_credits(account, credits)
+    if account_pool is not None:
+        await account_pool.credits_updated(account)
+    return {"account": account, **scheduler.budget.snapshot().get(account, {})}
+
+
+@registry.tool()
+async def suno_set_credits(credits: float | None = None, account: str = "default") -> MessageResult:
+    """
+    Set the credits an account has left, e.g. after topping up on Suno.
+
+    Jobs deferred for lack of credits start as soon as the account can
+    afford them. Not scheduled, so it never queues behind those jobs.
+
+    Args:
+        credits: Remaining credits; omit for unlimited
+        account: Account name (default: "default"; pool accounts use their name)
+
+    Returns:
+        The account's new remaining and reserved credits
+    """
+    budget = await set_credits(account, credits)
+    remaining = "unlimited" if budget.get("remaining") is None else budget["remaining"]
+    return MessageResult(message=f"💳 Credits for {account}: {remaining} remaining, {budget.get('reserved', 0.0)} reserved")
+
+
+@registry.tool()
+async def suno_get_status() -> SessionStatus:
     """
     Get current Suno AI session status.
 
@@ -275,8 +715,8 @@ async def suno_get_status() -> str:
     return await basic_tools.get_status()
 
 
-@mcp_app.tool()
-async def suno_close_browser() -> str:
+@registry.tool()
+async def suno_close_browser() -> MessageResult:
     """
     Close the browser session.
 
@@ -286,12 +726,116 @@ async def suno_close_browser() -> str:
     Returns:
         Confirmation of browser closure
     """
+    if account_pool is not None:
+        await account_pool.close()
     return await basic_tools.close_browser()
 
 
 
-# FastMCP 2.12 Standard: Multilevel Help Tool
-@mcp_app.tool()
+@registry.tool(category="studio", scheduled=True, cost=lambda: config.get("scheduler.generation_cost", 10))
+async def studio_generate_stem(
+    prompt: str,
+    stem_type: str = "instrumental",
+    position: float = 0.0,
+    duration: float | None = None,
+    style: str | None = None,
+    ctx: Context | None = None,
+) -> StemSubmission:
+    """
+    Generate a single stem in Suno Studio.
+
+    Submits the stem and returns as soon as Suno accepts it, with the
+    generation IDs to pass to studio_wait_generation.
+
+    Args:
+        prompt: Description of the stem (required)
+        stem_type: Stem type, e.g. "drums", "bass", "vocals", "synth" (default: "instrumental")
+        position: Timeline position in seconds (default: 0)
+        duration: Stem length in seconds (default: Studio's default)
+        style: Optional style tags for the stem
+
+    Returns:
+        Submission confirmation with generation IDs
+    """
+    return await studio_tools.generate_stem(prompt, stem_type, position, duration, style)
+
+
+@registry.tool(category="studio")
+async def studio_generate_multiple_stems(
+    stems: list[StemRequest],
+    download_path: str = "downloads/stems/",
+    timeout: float = 600,
+    ctx: Context | None = None,
+) -> StemSetResult:
+    """
+    Generate and download a full set of stems in Suno Studio.
+
+    Every stem is submitted up front; each one is downloaded the moment it
+    completes while the others keep generating, so the whole set takes about
+    as long as the slowest stem. Only the submissions take a scheduler slot.
+
+    Args:
+        stems: Stems to generate, each with prompt, stem_type, position, duration and style
+        download_path: Directory to save stems (default: "downloads/stems/")
+        timeout: Maximum time to wait for each stem in seconds (default: 600)
+
+    Returns:
+        Per-stem status, generation IDs and downloaded files
+    """
+    cost = config.get("scheduler.generation_cost", 10) * len(stems)
+    return await studio_tools.generate_multiple_stems(
+        stems, download_path, timeout, schedule=lambda submit: registry.schedule(submit, cost=cost)
+    )
+
+
+@registry.tool(category="studio")
+async def studio_wait_generation(generation_id: str, timeout: float = 300) -> CompletionResult:
+    """
+    Wait until a Studio stem generation is complete.
+
+    Resolves as soon as the page reports the generation as complete or
+    failed; there is no polling interval.
+
+    Args:
+        generation_id: Generation ID returned by studio_generate_stem
+        timeout: Maximum time to wait in seconds (default: 300)
+
+    Returns:
+        Title and audio URL of the finished stem
+    """
+    return await studio_tools.wait_generation(generation_id, timeout)
+
+
+# Help headings per tool category, in display order
+HELP_CATEGORIES = {
+    "basic": ("Basic Tools", "Core Suno AI functionality"),
+    "studio": ("Studio Tools", "Stem generation in Suno Studio (requires Premier)"),
+    "meta": ("Server Tools", "Help and server status"),
+}
+
+
+def _help_categories() -> str:
+    """One line per tool category with its registered tool count."""
+    return "\n".join(
+        f"• **{title} ({len(registry.specs(category))})**: {description}"
+        for category, (title, description) in HELP_CATEGORIES.items()
+    )
+
+
+def _help_tools() -> str:
+    """Every registered tool with its parameters and summary, by category."""
+    sections = []
+    for category, (title, description) in HELP_CATEGORIES.items():
+        lines = [
+            f"- `{spec.name}({', '.join(spec.args_model.model_fields)})` - {' '.join(spec.summary.split())}"
+            for spec in registry.specs(category)
+        ]
+        sections.append(f"**{title}:** {description}\n" + "\n".join(lines))
+    return "\n\n".join(sections)
+
+
+# Multilevel Help Tool
+@registry.tool(category="meta")
 async def help(level: str = "basic") -> str:
     """
     Multilevel help system for Suno MCP Server.
@@ -306,49 +850,45 @@ async def help(level: str = "basic") -> str:
         Formatted help text with usage instructions and examples
     """
     if level == "basic":
-        return """
+        return f"""
 🎵 **Suno MCP Server Help**
 
 **Available Tool Categories:**
-• **Basic Tools (6)**: Core Suno AI functionality
-• **Studio Tools (17)**: Advanced DAW features
+{_help_categories()}
 
 **Getting Started:**
 1. Use `suno_open_browser()` to start a session
 2. Use `suno_login()` to authenticate
 3. Use `suno_generate_track()` to create music
-4. Use `studio_open()` for advanced production
+4. Use `suno_wait_for_completion()` to wait for the finished track
+5. Use `studio_generate_multiple_stems()` to build a stem set
 
 **For detailed help:** Use `help("detailed")`
 """
     elif level == "detailed":
-        return """
+        return f"""
 🎵 **Suno MCP Server - Detailed Help**
 
-**Basic Tools:**
-- `suno_open_browser(headless=true)` - Start browser session
-- `suno_login(email, password)` - Authenticate with Suno
-- `suno_generate_track(prompt, style, lyrics, duration)` - Generate music
-- `suno_download_track(track_id, path, include_stems)` - Download tracks
-- `suno_get_status()` - Check session status
-- `suno_close_browser()` - End session
-
-**Studio Tools (Requires Premier):**
-- `studio_open()` - Launch Suno Studio DAW
-- `studio_create_project(name, template, bpm, key)` - New project
-- `studio_generate_stem(prompt, type, position, duration)` - Add stems
-- `studio_arrange_track(track_id, position)` - Edit timeline
-- `studio_set_bpm(bpm)` - Change tempo
-- `studio_adjust_volume(track_id, volume)` - Mix levels
-- `studio_add_effect(track_id, effect_type)` - Apply effects
-- `studio_export_project()` - Export final mix
+{_help_tools()}
 
 **FastAPI Endpoints:**
 - GET `/health` - Health check
 - GET `/api/docs` - OpenAPI documentation
 - GET `/api/v1/tools` - List tools
-- POST `/api/v1/tools/{name}` - Execute tools
-- GET `/api/v1/status` - Server status
+- POST `/api/v1/tools/{{name}}` - Execute tools
+- GET `/api/v1/status` - Server status (cached, never touches the browser)
+- GET `/api/v1/status/deep` - Status with a real browser round trip
+- GET `/api/v1/metrics` - Counters and latency summaries
+- GET `/api/v1/timeouts` - Adaptive timeouts per browser step
+- GET `/api/v1/resilience` - Circuit breaker state per Suno operation
+- GET `/api/v1/webhooks` - Completion callback queue and delivery latency
+- GET `/api/v1/scheduler` - Job queues, credit budgets and wait times
+- POST `/api/v1/scheduler/credits` - Set an account's remaining credits
+- GET `/api/v1/accounts` - Account pool load, credits and cooldowns
+- GET `/api/v1/downloads` - Downloaded tracks and stems
+- GET `/api/v1/downloads/{{track_id}}/{{filename}}` - Stream a downloaded file (Range/ETag)
+- GET `/api/v1/tracks/{{id}}/wait` - Long-poll until a track finishes
+- GET `/api/v1/tracks/events` - Server-Sent Events stream of track status
 """
     elif level == "examples":
         return """
@@ -364,37 +904,31 @@ suno_generate_track("ballad", "folk", "Verse lyrics here...")
 
 # Download completed track
 suno_download_track("track_123", "downloads/", true)
+
+# Download a whole album in one call
+suno_download_batch(["track_123", "track_456", "track_789"], "album/")
 ```
 
 **Studio Production:**
 ```
-# Create new project
-studio_create_project("My Album", "pop", 128, "C")
-
-# Generate drum stem
+# Generate one drum stem and wait for it
 studio_generate_stem("energetic rock drums", "drums", 0, 32)
-
-# Mix the track
-studio_adjust_volume("stem_456", 75, 2, 3)
-```
-
-**Workflow Automation:**
-```
-# Complete production pipeline
-studio_open()
-studio_create_project("AutoMix", "electronic", 140, "D")
-studio_generate_stem("deep bassline", "bass")
-studio_generate_stem("synth lead", "synth")
-studio_set_bpm(142)
-studio_export_project("wav", "high", true)
+studio_wait_generation("generation_123")
+
+# Generate and download a full stem set in one call
+studio_generate_multiple_stems([
+    {"prompt": "deep bassline", "stem_type": "bass"},
+    {"prompt": "synth lead", "stem_type": "synth"},
+    {"prompt": "punchy drums", "stem_type": "drums"},
+], "downloads/stems/")
 ```
 """
     else:
         return "Use `help()` for basic help, `help('detailed')` for comprehensive documentation, or `help('examples')` for usage examples."
 
 
-# FastMCP 2.12 Standard: Status Tool
-@mcp_app.tool()
+# Status Tool
+@registry.tool(category="meta")
 async def get_server_status() -> str:
     """
     Comprehensive server status and health check tool.
@@ -412,6 +946,10 @@ async def get_server_status() -> str:
     """
     try:
         browser_status = await basic_tools.get_browser_status()
+        breakers = "\n".join(
+            f"• {name}: {b['state']} ({b['failures']} consecutive failures)"
+            for name, b in browser_status.get("breakers", {}).items()
+        ) or "• None"
 
         status = f"""
 🎵 **Suno MCP Server Status**
@@ -419,9 +957,9 @@ async def get_server_status() -> str:
 **Server Configuration:**
 • Version: 1.0.0
 • Mode: Dual Interface (MCP stdio + FastAPI HTTP)
-• Total Tools Available: 23
-• Basic Tools: 6
-• Studio Tools: 17
+• Total Tools Available: {len(registry)}
+• Basic Tools: {len(registry.specs("basic"))}
+• Studio Tools: {len(registry.specs("studio"))}
 
 **Browser Session:**
 • Browser Open: {browser_status.get('browser_open', False)}
@@ -430,6 +968,11 @@ async def get_server_status() -> str:
 • Current URL: {browser_status.get('current_url', 'None')}
 • Page Title: {browser_status.get('page_title', 'None')}
 • In Studio Mode: {browser_status.get('in_studio', False)}
+• Pages Open: {browser_status.get('pages_open', 0)}
+• Last Error: {browser_status.get('last_error') or 'None'}
+
+**Circuit Breakers:**
+{breakers}
 
 **System Health:**
 • Status: ✅ Operational
@@ -456,29 +999,126 @@ Error: {str(e)}
 """
 
 
+# Register every declared tool with MCP and precompute the HTTP listing
+registry.freeze(mcp_app)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options shared by both entry points."""
+    parser = argparse.ArgumentParser(prog="suno-mcp", description="Suno MCP Server")
+    parser.add_argument("--api", action="store_true", help="Run the FastAPI HTTP server instead of MCP stdio")
+    har = parser.add_mutually_exclusive_group()
+    har.add_argument("--har-record", metavar="PATH", help="Record browser network traffic to a HAR archive")
+    har.add_argument("--har-replay", metavar="PATH", help="Replay browser network traffic from a HAR archive (offline)")
+    parser.add_argument(
+        "--har-fallback",
+        action="store_true",
+        help="When replaying, send requests missing from the archive to the network instead of aborting them",
+    )
+    parser.add_argument(
+        "--browser-endpoint",
+        nargs="?",
+        const="auto",
+        metavar="URL",
+        help="Connect to a shared browser instead of launching one "
+        "(no URL: the one started by suno-mcp-browser)",
+    )
+    parser.add_argument(
+        "--browser-protocol",
+        choices=["cdp", "playwright"],
+        default="cdp",
+        help="Protocol of --browser-endpoint: a CDP endpoint or a Playwright browser server",
+    )
+    parser.add_argument(
+        "--analyze",
+        action="store_true",
+        help="Analyze downloaded WAV files (loudness, peak, duration, waveform) into JSON sidecars",
+    )
+    parser.add_argument("--accounts", metavar="PATH", help="Credentials JSON for a pool of Suno accounts")
+    return parser.parse_args(argv)
+
+
+def apply_args(args: argparse.Namespace) -> None:
+    """Apply command line options to the shared configuration."""
+    if args.har_record:
+        config.set("browser.har.mode", "record")
+        config.set("browser.har.path", args.har_record)
+    elif args.har_replay:
+        config.set("browser.har.mode", "replay")
+        config.set("browser.har.path", args.har_replay)
+    if args.har_fallback:
+        config.set("browser.har.not_found", "fallback")
+    if args.browser_endpoint:
+        endpoint = args.browser_endpoint
+        if endpoint == "auto":
+            endpoint = resolve_endpoint()
+        config.set("browser.server.endpoint", endpoint)
+        config.set("browser.server.protocol", args.browser_protocol)
+    if args.accounts:
+        config.set("accounts.credentials_file", args.accounts)
+    if args.analyze:
+        config.set("analysis.enabled", True)
+
+
+def setup_account_pool() -> None:
+    """Load the account pool, if configured, to run generations in parallel.
+
+    Only generations go through the pool; tools driving the default page
+    stay serialized by the scheduler.
+    """
+    global account_pool
+    credentials_file = config.get("accounts.credentials_file")
+    if not credentials_file:
+        return
+    account_pool = AccountPool.from_file(credentials_file, basic_tools.browser_manager, scheduler.budget)
+    logging.info("Loaded %s Suno accounts from %s", len(account_pool), credentials_file)
+
+
+def startup(args: argparse.Namespace) -> bool:
+    """Apply options, logging and the account pool; False if the server cannot start.
+
+    Errors such as a missing shared browser are logged, not raised, so the
+    entry points exit non-zero with a message instead of a traceback.
+    """
+    try:
+        apply_args(args)
+        configure_logging(config)
+        setup_account_pool()
+    except SunoError as e:
+        logging.error(str(e))
+        return False
+    return True
+
+
 def main():
     """Main entry point for MCP server (stdio mode)."""
+    args = parse_args()
+    if args.api:
+        return main_api()
+    if not startup(args):
+        return 1
+
     logging.info("Starting Suno MCP server (stdio mode)")
-    asyncio.run(mcp_app.run())
+    mcp_app.run()
 
 
 def main_api():
     """Main entry point for FastAPI server."""
     import time
+
     import uvicorn
 
+    if not startup(parse_args()):
+        return 1
+
     # Store start time for uptime calculation
     fastapi_app.start_time = time.time()
 
     logging.info("Starting FastAPI server on http://0.0.0.0:3000")
     logging.info("API Docs: http://0.0.0.0:3000/api/docs")
-    uvicorn.run(fastapi_app, host="0.0.0.0", port=3000)
+    # log_config=None: uvicorn's loggers propagate to the queued root handler
+    uvicorn.run(fastapi_app, host="0.0.0.0", port=3000, log_config=None)
 
 
 if __name__ == "__main__":
-    # Configure logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
-    main()
\ No newline at end of file
+    main()
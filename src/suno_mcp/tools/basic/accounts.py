@@ -0,0 +1,227 @@
+"""Pool of Suno accounts, one browser context each, with credit-aware rotation."""
+
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from ..shared.exceptions import AuthenticationError, SunoError
+from ..shared.metrics import metrics
+from ..shared.resilience import CREDIT_MARKERS, RATE_LIMIT_MARKERS
+from ..shared.scheduler import CreditBudget
+from ..shared.utils import BrowserManager, config
+from .tools import BasicSunoTools
+
+T = TypeVar("T")
+
+
+class Account:
+    """One Suno account and the tools driving its browser context."""
+
+    def __init__(self, name: str, email: str, password: str, tools: BasicSunoTools) -> None:
+        self.name = name
+        self.email = email
+        self.password = password
+        self.tools = tools
+        self.in_flight = 0
+        self.logged_in = False
+        self.cooldown_until = 0.0
+        self.last_error: Optional[str] = None
+
+    def cooling_down(self, now: float) -> bool:
+        """Whether the account is resting after a rate limit or credit failure."""
+        return now < self.cooldown_until
+
+
+class AccountPool:
+    """Dispatches jobs to the account with the most credits and least work.
+
+    Every account gets its own authenticated context in a browser owned by
+    ``parent``. Credits are tracked in the scheduler's CreditBudget under the
+    account name. Accounts that hit a rate limit or run out of credits are
+    rested for a configurable cooldown before they are picked again.
+    """
+
+    def __init__(
+        self,
+        accounts: List[Dict[str, Any]],
+        parent: BrowserManager,
+        budget: CreditBudget,
+    ) -> None:
+        sessions_dir = Path(config.get("accounts.sessions_dir", "sessions/accounts"))
+        self.budget = budget
+        self.max_in_flight = max(1, config.get("accounts.max_in_flight", 1))
+        self.accounts: Dict[str, Account] = {}
+        for entry in accounts:
+            manager = BrowserManager(parent=parent, storage_state=str(sessions_dir / f"{entry['name']}.json"))
+            self.accounts[entry["name"]] = Account(
+                entry["name"], entry["email"], entry["password"], BasicSunoTools(manager, account=entry["name"])
+            )
+            if entry.get("credits") is not None:
+                budget.set_remaining(entry["name"], float(entry["credits"]))
+        self._changed = asyncio.Condition()
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_file(cls, path: str, parent: BrowserManager, budget: CreditBudget) -> "AccountPool":
+        """Load accounts from a local credentials JSON file.
+
+        The file holds a list (or ``{"accounts": [...]}``) of objects with
+        ``name``, ``email``, ``password`` and optionally ``credits``.
+        """
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except Exception as e:
+            raise SunoError(f"Could not read account credentials {path}: {e}", "INVALID_ACCOUNTS") from e
+
+        entries = data.get("accounts", []) if isinstance(data, dict) else data
+        names = set()
+        for entry in entries:
+            missing = [field for field in ("name", "email", "password") if not entry.get(field)]
+            if missing:
+                raise SunoError(f"Account entry missing {', '.join(missing)} in {path}", "INVALID_ACCOUNTS")
+            if entry["name"] in names:
+                raise SunoError(f"Duplicate account name \"{entry['name']}\" in {path}", "INVALID_ACCOUNTS")
+            names.add(entry["name"])
+        if not entries:
+            raise SunoError(f"No accounts found in {path}", "INVALID_ACCOUNTS")
+        return cls(entries, parent, budget)
+
+    def __len__(self) -> int:
+        return len(self.accounts)
+
+    def _pick(self, cost: float) -> Optional[Account]:
+        """Choose the idlest affordable account, richest first."""
+        now = time.time()
+        candidates = [
+            account
+            for account in self.accounts.values()
+            if account.in_flight < self.max_in_flight
+            and not account.cooling_down(now)
+            and self.budget.can_afford(account.name, cost)
+        ]
+        if not candidates:
+            return None
+
+        def credits(account: Account) -> float:
+            available = self.budget.available(account.name)
+            return float("inf") if available is None else available
+
+        return min(candidates, key=lambda account: (account.in_flight, -credits(account)))
+
+    def _next_cooldown_end(self) -> Optional[float]:
+        """Seconds until the next resting account becomes available."""
+        now = time.time()
+        ends = [a.cooldown_until - now for a in self.accounts.values() if a.cooling_down(now)]
+        return min(ends) if ends else None
+
+    async def acquire(self, cost: float = 0.0, timeout: Optional[float] = None) -> Account:
+        """Wait for an account that can take a job of this cost."""
+        timeout = config.get("accounts.acquire_timeout", 600) if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        async with self._changed:
+            while True:
+                account = self._pick(cost)
+                if account:
+                    account.in_flight += 1
+                    self.budget.reserve(account.name, cost)
+                    return account
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise SunoError(
+                        f"No account can take a job costing {cost} credits "
+                        f"(all busy, resting or out of credits)",
+                        "NO_ACCOUNT_AVAILABLE",
+                    )
+                # Wake on a release, or when the next cooldown ends
+                wait = min(remaining, self._next_cooldown_end() or remaining)
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def release(self, account: Account, cost: float, charged: bool) -> None:
+        """Return an account to the pool and settle its reserved credits."""
+        async with self._changed:
+            account.in_flight -= 1
+            self.budget.settle(account.name, cost, charged)
+            self._changed.notify_all()
+
+    async def credits_updated(self, name: str) -> None:
+        """An account's credits were topped up: end its rest and wake waiting jobs."""
+        account = self.accounts.get(name)
+        if account is None:
+            return
+        async with self._changed:
+            account.cooldown_until = 0.0
+            self._changed.notify_all()
+
+    def cool_down(self, account: Account, seconds: float, reason: str) -> None:
+        """Rest an account so jobs go elsewhere for a while."""
+        account.cooldown_until = max(account.cooldown_until, time.time() + seconds)
+        account.last_error = reason
+        metrics.increment("accounts.cooldowns")
+        self.logger.warning("Account %s cooling down for %.0fs: %s", account.name, seconds, reason)
+
+    def _classify_failure(self, account: Account, error: BaseException) -> None:
+        """Cool an account down if a failure says it is rate limited or broke."""
+        code = getattr(error, "code", None)
+        message = str(error).lower()
+        if code == "RATE_LIMITED" or any(marker in message for marker in RATE_LIMIT_MARKERS):
+            self.cool_down(account, config.get("accounts.rate_limit_cooldown", 300), str(error))
+        elif code == "INSUFFICIENT_CREDITS" or any(marker in message for marker in CREDIT_MARKERS):
+            self.budget.set_remaining(account.name, 0.0)
+            self.cool_down(account, config.get("accounts.credits_cooldown", 3600), str(error))
+        else:
+            account.last_error = str(error)
+
+    async def _ensure_logged_in(self, account: Account) -> None:
+        """Open the account's context and log in once; cookies are persisted."""
+        if account.logged_in:
+            return
+        await account.tools.open_browser(config.get("browser.headless", True))
+        result = await account.tools.login(account.email, account.password)
+        if not result.logged_in:
+            raise AuthenticationError(f"Login for account {account.name} did not complete", "LOGIN_ERROR")
+        account.logged_in = True
+        await account.tools.browser_manager.save_storage_state()
+
+    async def run(self, fn: Callable[[BasicSunoTools], Awaitable[T]], cost: float = 0.0) -> T:
+        """Run a job on the best available account."""
+        account = await self.acquire(cost)
+        charged = False
+        try:
+            await self._ensure_logged_in(account)
+            metrics.increment(f"accounts.jobs.{account.name}")
+            result = await fn(account.tools)
+            charged = True
+            return result
+        except Exception as e:
+            self._classify_failure(account, e)
+            raise
+        finally:
+            await self.release(account, cost, charged)
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Per-account load, credits and cooldowns (no credentials)."""
+        now = time.time()
+        return [
+            {
+                "name": account.name,
+                "logged_in": account.logged_in,
+                "in_flight": account.in_flight,
+                "credits": self.budget.available(account.name),
+                "cooldown_remaining": round(max(0.0, account.cooldown_until - now), 1),
+                "last_error": account.last_error,
+            }
+            for account in self.accounts.values()
+        ]
+
+    async def close(self) -> None:
+        """Close every account's context."""
+        for account in self.accounts.values():
+            await account.tools.browser_manager.close()
+            account.logged_in = False
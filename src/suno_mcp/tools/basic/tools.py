@@ -2,42 +2,187 @@
 
 import asyncio
 import logging
+import time
 from pathlib import Path
-from typing import Any, Dict, Optional
-
-from playwright.async_api import Browser, BrowserContext, Page, Playwright, async_playwright
-
-from ..shared.exceptions import BrowserError, SunoError
-from ..shared.utils import BrowserManager, SelectorHelper
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from playwright.async_api import Page
+
+from ..shared.analysis import AudioAnalyzer
+from ..shared.downloads import DownloadStore
+from ..shared.exceptions import BrowserError, DownloadError, GenerationError, SunoError
+from ..shared.forms import fill_form
+from ..shared.library import LibraryIndex, clip_to_record, iter_clips
+from ..shared.metrics import metrics
+from ..shared.models import (
+    BatchDownloadResult,
+    BatchItem,
+    BrowserResult,
+    CompletionResult,
+    DownloadResult,
+    FileInfo,
+    GenerationResult,
+    LibrarySearchResult,
+    LibrarySyncResult,
+    LoginResult,
+    MessageResult,
+    SessionStatus,
+    track_info,
+)
+from ..shared.resilience import CREDIT_MARKERS, RATE_LIMIT_MARKERS
+from ..shared.utils import (
+    BrowserManager,
+    SelectorHelper,
+    config,
+    navigate,
+    resilience,
+    timeouts,
+    wait_for_load,
+)
+
+# Returns {track_id: {url, title}} for every track card currently rendered
+LIBRARY_SCAN_SCRIPT = """
+() => {
+  const found = {};
+  document.querySelectorAll(
+    '[data-clip-id], [data-track-id], [data-song-id], a[href*="/song/"]'
+  ).forEach((el) => {
+    const link = el.matches('a[href*="/song/"]') ? el : el.querySelector('a[href*="/song/"]');
+    const href = link ? link.getAttribute("href") : null;
+    const match = href && href.match(/\\/song\\/([\\w-]+)/);
+    const id = el.getAttribute("data-clip-id") || el.getAttribute("data-track-id")
+      || el.getAttribute("data-song-id") || (match && match[1]);
+    if (!id) return;
+    const titleEl = el.querySelector('[data-testid="song-title"], .song-title, .track-title');
+    found[id] = {
+      url: href ? new URL(href, location.href).href : `${location.origin}/song/${id}`,
+      title: el.getAttribute("data-title") || (titleEl && titleEl.textContent.trim()) || null,
+    };
+  });
+  return found;
+}
+"""
+
+# Text of the toasts, alerts and dialogs Suno shows when a submission is refused
+PAGE_NOTICE_SCRIPT = """
+() => Array.from(document.querySelectorAll(
+  '[role="alert"], [role="alertdialog"], [role="status"], [data-sonner-toast], .toast, .Toastify__toast'
+)).map((el) => el.textContent.trim()).filter(Boolean)
+"""
+
+
+# Create form fields, tried in order; plain CSS so the batched driver can use them
+PROMPT_SELECTORS = [
+    'textarea[placeholder*="Describe" i]',
+    'textarea[placeholder*="prompt" i]',
+    'textarea[name="prompt"]',
+    'textarea[data-testid="prompt-input"]',
+    '.prompt-input',
+    '#prompt',
+]
+LYRICS_SELECTORS = [
+    'textarea[placeholder*="lyrics" i]',
+    'textarea[placeholder*="Lyrics" i]',
+    'textarea[name="lyrics"]',
+    'textarea[data-testid="lyrics-input"]',
+    '.lyrics-input',
+]
+STYLE_SELECTORS = [
+    'select[name="style"]',
+    'input[placeholder*="style" i]',
+    'select[data-testid="style-select"]',
+]
+GENERATE_BUTTON_TEXTS = ["Create", "Generate", "Make Song"]
+GENERATE_SELECTORS = [f'button:has-text("{text}")' for text in GENERATE_BUTTON_TEXTS] + [
+    'button[type="submit"]',
+    '[data-testid="generate-button"]',
+    '.generate-button',
+]
+
+
+def elapsed_ms(started: float) -> float:
+    """Milliseconds since a time.perf_counter() reading."""
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+async def scroll_library(page: Page) -> int:
+    """Scroll the library to the bottom; returns the page height before loading more."""
+    return await page.evaluate("""() => {
+        window.scrollTo(0, document.body.scrollHeight);
+        return document.body.scrollHeight;
+    }""")
+
+
+async def wait_for_more(page: Page, height: int, feed_arrived: asyncio.Event) -> None:
+    """Wait until the page grows past height or a feed page arrives.
+
+    Gives up after ``library.scroll_timeout`` seconds, which just means
+    nothing more loaded.
+    """
+    timeout = config.get("library.scroll_timeout", 5.0)
+    grown = asyncio.ensure_future(page.wait_for_function(
+        "height => document.body.scrollHeight > height", arg=height, timeout=timeout * 1000
+    ))
+    fed = asyncio.ensure_future(feed_arrived.wait())
+    done, pending = await asyncio.wait({grown, fed}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    for task in done:
+        task.exception()
 
 
 class BasicSunoTools:
     """Basic Suno AI tools for music generation."""
 
-    def __init__(self) -> None:
-        self.browser_manager = BrowserManager()
+    def __init__(self, browser_manager: Optional[BrowserManager] = None, account: str = "default") -> None:
+        self.browser_manager = browser_manager or BrowserManager()
+        self.account = account  # Keys this instance's circuit breakers
+        self.last_generated_ids: list[str] = []
+        self.library = LibraryIndex(config.get("paths.library_index", "library.db"))
+        self._analyzer: Optional[AudioAnalyzer] = None
         self.logger = logging.getLogger(__name__)
 
-    async def open_browser(self, headless: bool = True) -> str:
+    def _analyze_later(self, files: List[Dict[str, Any]]) -> None:
+        """Queue post-download analysis of saved files, if enabled."""
+        if not config.get("analysis.enabled", False):
+            return
+        if self._analyzer is None:
+            if not AudioAnalyzer.available():
+                self.logger.warning("Audio analysis is enabled but NumPy is not installed; skipping")
+                config.set("analysis.enabled", False)
+                return
+            self._analyzer = AudioAnalyzer(
+                workers=config.get("analysis.workers", 2),
+                peaks=config.get("analysis.waveform_peaks", 800),
+                chunk_frames=config.get("analysis.chunk_frames", 262144),
+            )
+        self._analyzer.schedule(Path(f["path"]) for f in files)
+
+    async def open_browser(self, headless: bool = True) -> BrowserResult:
         """Open browser and navigate to Suno AI create page."""
+        started = time.perf_counter()
         try:
             components = await self.browser_manager.ensure_browser(headless)
             page = components["page"]
 
-            await page.goto("https://app.suno.ai/create/", wait_until="networkidle")
-            await page.wait_for_load_state("domcontentloaded")
+            await navigate(page, "https://app.suno.ai/create/", wait_until="networkidle")
+            await wait_for_load(page)
 
             title = await page.title()
             url = page.url
 
-            return f"✅ Browser opened successfully. Navigated to Suno AI.\nPage title: {title}\nURL: {url}\nHeadless mode: {headless}"
+            return BrowserResult(title=title, url=url, headless=headless, elapsed_ms=elapsed_ms(started))
 
         except Exception as e:
-            self.logger.error(f"Browser open failed: {e}")
+            self.browser_manager.record_error(e)
+            self.logger.error("Browser open failed: %s", e)
             raise BrowserError(f"Browser initialization failed: {str(e)}", "BROWSER_INIT_ERROR")
 
-    async def login(self, email: str, password: str) -> str:
+    @resilience.wrap("login")
+    async def login(self, email: str, password: str) -> LoginResult:
         """Login to Suno AI account."""
+        started = time.perf_counter()
         try:
             components = await self.browser_manager.ensure_browser()
             page = components["page"]
@@ -45,7 +190,12 @@ class BasicSunoTools:
             # Check if already logged in
             current_url = page.url
             if current_url and "/create" in current_url and "/login" not in current_url:
-                return f"✅ Already logged in. Current URL: {current_url}\nReady for music generation!"
+                return LoginResult(
+                    logged_in=True,
+                    already_logged_in=True,
+                    url=current_url,
+                    elapsed_ms=elapsed_ms(started),
+                )
 
             # Try to find and click login button
             login_selectors = [
@@ -100,267 +250,640 @@ class BasicSunoTools:
 
             # Wait for navigation to create page or dashboard
             try:
-                await page.wait_for_url("**/create/**", timeout=10000)
+                await timeouts.run(
+                    "login_redirect", lambda timeout: page.wait_for_url("**/create/**", timeout=timeout)
+                )
             except Exception:
                 await asyncio.sleep(3)  # May have 2FA or other auth steps
 
             final_url = page.url
             is_logged_in = "/create" in final_url or "/library" in final_url
 
-            return f"✅ Login {'successful' if is_logged_in else 'attempted'}. Current URL: {final_url}\n{'Ready for music generation!' if is_logged_in else 'May require additional authentication steps.'}"
+            return LoginResult(
+                status="ok" if is_logged_in else "pending",
+                logged_in=is_logged_in,
+                url=final_url,
+                elapsed_ms=elapsed_ms(started),
+            )
 
         except Exception as e:
-            self.logger.error(f"Login failed: {e}")
+            self.browser_manager.record_error(e)
+            self.logger.error("Login failed: %s", e)
             raise SunoError(f"Login failed: {str(e)}", "LOGIN_ERROR")
 
+    @resilience.wrap("generate")
     async def generate_track(
         self,
         prompt: str,
         style: str = "synthwave",
         lyrics: Optional[str] = None,
         duration: str = "auto",
-    ) -> str:
-        """Generate a new music track using Suno AI."""
+    ) -> GenerationResult:
+        """Generate a new music track using Suno AI.
+
+        Failures after the form may have been submitted are not retried, since
+        a retry would start (and pay for) a second generation.
+        """
+        started = time.perf_counter()
+        submitted = False
         try:
             components = await self.browser_manager.ensure_browser()
             page = components["page"]
 
             # Ensure we're on the create page
             if not page.url or "/create" not in page.url:
-                await page.goto("https://app.suno.ai/create/", wait_until="networkidle")
-                await page.wait_for_load_state("domcontentloaded")
+                await navigate(page, "https://app.suno.ai/create/", wait_until="networkidle")
+                await wait_for_load(page)
 
             # Wait for the form to be ready
             await asyncio.sleep(2)
 
-            # Clear and fill the prompt field
-            prompt_selectors = [
-                'textarea[placeholder*="Describe" i]',
-                'textarea[placeholder*="prompt" i]',
-                'textarea[name="prompt"]',
-                'textarea[data-testid="prompt-input"]',
-                '.prompt-input',
-                '#prompt',
-            ]
-
-            for selector in prompt_selectors:
-                try:
-                    await page.fill(selector, "")  # Clear first
-                    await page.fill(selector, prompt)
-                    break
-                except Exception:
-                    continue
-
-            # Fill lyrics if provided
-            if lyrics:
-                lyrics_selectors = [
-                    'textarea[placeholder*="lyrics" i]',
-                    'textarea[placeholder*="Lyrics" i]',
-                    'textarea[name="lyrics"]',
-                    'textarea[data-testid="lyrics-input"]',
-                    '.lyrics-input',
-                ]
-                await SelectorHelper.try_selectors(page, lyrics_selectors, "fill", value=lyrics)
-
-            # Try to set style (may not be available in all versions)
-            if style and style != "synthwave":
-                style_selectors = [
-                    'select[name="style"]',
-                    'input[placeholder*="style" i]',
-                    'select[data-testid="style-select"]',
-                ]
-
-                for selector in style_selectors:
-                    try:
-                        await page.select_option(selector, style)
-                        break
-                    except Exception:
-                        try:
-                            await page.fill(selector, style)
-                            break
-                        except Exception:
-                            continue
-
-            # Find and click the generate/create button
-            generate_selectors = [
-                'button:has-text("Create")',
-                'button:has-text("Generate")',
-                'button:has-text("Make Song")',
-                'button[type="submit"]',
-                '[data-testid="generate-button"]',
-                '.generate-button',
-            ]
-
-            generate_clicked = await SelectorHelper.try_selectors(page, generate_selectors, "click")
+            tracker = self.browser_manager.tracker
+            known_ids = tracker.known_ids()
+
+            # One in-page script fills the form and clicks Create; fall back
+            # to per-field actions if it cannot find the fields or button
+            generate_clicked = False
+            submitted = True
+            if config.get("browser.form_driver", "batched") == "batched":
+                generate_clicked = await self._submit_create_form_batched(page, prompt, style, lyrics)
+                if not generate_clicked:
+                    metrics.increment("generate.form_fallbacks")
+            if not generate_clicked:
+                generate_clicked = await self._submit_create_form_per_field(page, prompt, style, lyrics)
 
             if not generate_clicked:
                 raise SunoError("Could not find generate button", "GENERATE_ERROR")
 
             # Wait for generation to start (may show progress indicator)
             await asyncio.sleep(3)
+            await self._raise_for_page_notice(page)
 
             # Try to detect if generation started
             generation_started = False
             try:
-                await page.wait_for_selector(
+                await timeouts.run("generation_indicator", lambda timeout: page.wait_for_selector(
                     '[data-testid="generating"], .generating, [data-status="generating"]',
-                    timeout=5000
-                )
+                    timeout=timeout,
+                ))
                 generation_started = True
             except Exception:
                 pass  # Generation may have started without visible indicator
 
-            return f"🎵 Track generation {'started' if generation_started else 'initiated'}!\nPrompt: \"{prompt}\"\nStyle: {style}\n{f'Lyrics: {lyrics[:50]}...' if lyrics else ''}\n\nGeneration in progress... Use suno_get_status to check progress."
+            # Clips reported by the in-page observer since the click are ours
+            self.last_generated_ids = sorted(tracker.known_ids() - known_ids)
+
+            return GenerationResult(
+                status="started" if generation_started or self.last_generated_ids else "submitted",
+                prompt=prompt,
+                style=style,
+                lyrics=lyrics,
+                started=generation_started or bool(self.last_generated_ids),
+                track_ids=self.last_generated_ids,
+                elapsed_ms=elapsed_ms(started),
+            )
 
         except Exception as e:
+            self.browser_manager.record_error(e)
             if isinstance(e, SunoError):
+                e.retryable = e.retryable and not submitted
                 raise
-            self.logger.error(f"Track generation failed: {e}")
-            raise SunoError(f"Track generation failed: {str(e)}", "GENERATE_ERROR")
+            self.logger.error("Track generation failed: %s", e)
+            raise SunoError(f"Track generation failed: {str(e)}", "GENERATE_ERROR", retryable=not submitted)
+
+    async def _raise_for_page_notice(self, page: Page) -> None:
+        """Turn Suno's on-page rate-limit or out-of-credits message into an error."""
+        try:
+            notices = await page.evaluate(PAGE_NOTICE_SCRIPT)
+        except Exception:
+            return
+        for notice in notices:
+            text = notice.lower()
+            if any(marker in text for marker in CREDIT_MARKERS):
+                raise SunoError(f"Suno refused the generation: {notice}", "INSUFFICIENT_CREDITS")
+            if any(marker in text for marker in RATE_LIMIT_MARKERS):
+                raise SunoError(f"Suno refused the generation: {notice}", "RATE_LIMITED")
+
+    async def _submit_create_form_batched(
+        self, page: Page, prompt: str, style: str, lyrics: Optional[str]
+    ) -> bool:
+        """Fill and submit the create form in a single browser round trip.
+
+        Returns False only when the script reports it found no fields or
+        button to click, so per-field fallback cannot submit twice.
+        """
+        started = time.perf_counter()
+        fields = [{"name": "prompt", "selectors": PROMPT_SELECTORS, "value": prompt, "required": True}]
+        if lyrics:
+            fields.append({"name": "lyrics", "selectors": LYRICS_SELECTORS, "value": lyrics, "required": False})
+        if style and style != "synthwave":
+            fields.append({"name": "style", "selectors": STYLE_SELECTORS, "value": style, "required": False})
+
+        try:
+            result = await fill_form(
+                page,
+                fields,
+                submit={"texts": GENERATE_BUTTON_TEXTS, "selectors": GENERATE_SELECTORS[len(GENERATE_BUTTON_TEXTS):]},
+            )
+        except Exception as e:
+            # The script may have clicked Create before failing (e.g. the page
+            # navigated away); filling the form again would start a second
+            # paid generation, so only a reported miss falls back
+            self.logger.warning("Batched form fill failed, treating the form as submitted: %s", e)
+            metrics.increment("generate.form_errors")
+            return True
+
+        metrics.observe("generate.form_ms.batched", (time.perf_counter() - started) * 1000)
+        return bool(result.get("submitted"))
+
+    async def _submit_create_form_per_field(
+        self, page: Page, prompt: str, style: str, lyrics: Optional[str]
+    ) -> bool:
+        """Fill and submit the create form one Playwright action at a time."""
+        started = time.perf_counter()
+
+        # Clear and fill the prompt field
+        for selector in PROMPT_SELECTORS:
+            try:
+                await page.fill(selector, "")  # Clear first
+                await page.fill(selector, prompt)
+                break
+            except Exception:
+                continue
 
+        # Fill lyrics if provided
+        if lyrics:
+            await SelectorHelper.try_selectors(page, LYRICS_SELECTORS, "fill", value=lyrics)
+
+        # Try to set style (may not be available in all versions)
+        if style and style != "synthwave":
+            for selector in STYLE_SELECTORS:
+                try:
+                    await page.select_option(selector, style)
+                    break
+                except Exception:
+                    try:
+                        await page.fill(selector, style)
+                        break
+                    except Exception:
+                        continue
+
+        # Find and click the generate/create button
+        clicked = await SelectorHelper.try_selectors(page, GENERATE_SELECTORS, "click")
+        metrics.observe("generate.form_ms.per_field", (time.perf_counter() - started) * 1000)
+        return clicked
+
+    @resilience.wrap("download")
     async def download_track(
         self,
         track_id: str,
         download_path: str = "downloads/",
         include_stems: bool = True,
-    ) -> str:
+    ) -> DownloadResult:
         """Download a generated track from Suno AI library."""
+        started = time.perf_counter()
         try:
             components = await self.browser_manager.ensure_browser()
             page = components["page"]
 
+            # Resolve from the local library index first: go straight to the track page
+            track_found = False
+            indexed = self.library.get(track_id)
+            if indexed and indexed.get("url"):
+                await navigate(page, indexed["url"], wait_until="domcontentloaded")
+                track_found = True
+
             # Navigate to library if not already there
-            if not page.url or "/library" not in page.url:
-                await page.goto("https://app.suno.ai/library/", wait_until="networkidle")
-                await page.wait_for_load_state("domcontentloaded")
+            if not track_found and (not page.url or "/library" not in page.url):
+                await navigate(page, "https://app.suno.ai/library/", wait_until="networkidle")
+                await wait_for_load(page)
                 await asyncio.sleep(2)
 
             # Look for the specific track
-            track_found = False
-            track_selectors = [
-                f'[data-track-id="{track_id}"]',
-                f'[data-song-id="{track_id}"]',
-                f'a[href*="{track_id}"]',
-                f'[data-testid="track-{track_id}"]',
-            ]
-
-            for selector in track_selectors:
-                try:
-                    track_element = page.locator(selector).first
-                    if await track_element.count() > 0:
-                        await track_element.click()
-                        track_found = True
-                        break
-                except Exception:
-                    continue
-
             if not track_found:
-                # Try searching by scrolling and looking for tracks
-                await asyncio.sleep(2)
-
-                # Look for any track cards and try to find by content
-                track_cards = page.locator('[data-testid*="track"], .track-card, .song-card')
-                count = await track_cards.count()
+                track_selectors = [
+                    f'[data-track-id="{track_id}"]',
+                    f'[data-song-id="{track_id}"]',
+                    f'a[href*="{track_id}"]',
+                    f'[data-testid="track-{track_id}"]',
+                ]
 
-                for i in range(count):
+                for selector in track_selectors:
                     try:
-                        card = track_cards.nth(i)
-                        card_text = await card.text_content()
-                        if card_text and track_id.lower()[:8] in card_text.lower():
-                            await card.click()
+                        track_element = page.locator(selector).first
+                        if await track_element.count() > 0:
+                            await timeouts.run(
+                                "element", lambda timeout, element=track_element: element.click(timeout=timeout)
+                            )
                             track_found = True
                             break
                     except Exception:
                         continue
 
-            if not track_found:
-                raise SunoError(f"Track with ID \"{track_id}\" not found in library", "TRACK_NOT_FOUND")
+                if not track_found:
+                    # Try searching by scrolling and looking for tracks
+                    await asyncio.sleep(2)
 
-            # Wait for track page to load
-            await asyncio.sleep(2)
+                    # Look for any track cards and try to find by content
+                    track_cards = page.locator('[data-testid*="track"], .track-card, .song-card')
+                    count = await track_cards.count()
 
-            # Set up download handling
-            download_dir = Path(download_path)
-            download_dir.mkdir(parents=True, exist_ok=True)
-
-            # Handle main track download
-            download_event = page.wait_for_event("download")
-            download_selectors = [
-                'button:has-text("Download")',
-                'button:has-text("Export")',
-                'a:has-text("Download")',
-                '[data-testid="download-button"]',
-                '.download-button',
+                    for i in range(count):
+                        try:
+                            card = track_cards.nth(i)
+                            card_text = await card.text_content()
+                            if card_text and track_id.lower()[:8] in card_text.lower():
+                                await timeouts.run("element", lambda timeout, card=card: card.click(timeout=timeout))
+                                track_found = True
+                                break
+                        except Exception:
+                            continue
+
+                if not track_found:
+                    raise SunoError(f"Track with ID \"{track_id}\" not found in library", "TRACK_NOT_FOUND")
+
+                # Wait for track page to load
+                await asyncio.sleep(2)
+
+            files = await self._save_track_files(page, Path(download_path), include_stems)
+            DownloadStore.for_directory(download_path).record(track_id, files)
+            self._analyze_later(files)
+
+            return DownloadResult(
+                track_id=track_id,
+                files=[FileInfo(**dict(f, path=str(f["path"]))) for f in files],
+                elapsed_ms=elapsed_ms(started),
+            )
+
+        except Exception as e:
+            self.browser_manager.record_error(e)
+            if isinstance(e, SunoError):
+                raise
+            self.logger.error("Download failed: %s", e)
+            raise SunoError(f"Download failed: {str(e)}", "DOWNLOAD_ERROR")
+
+    async def _save_track_files(
+        self, page: Page, download_dir: Path, include_stems: bool
+    ) -> List[Dict[str, Any]]:
+        """Download the track (and optionally stems) shown on an open track page."""
+        # Downloads are routed straight into download_dir and saved once
+        router = self.browser_manager.downloads
+
+        # Handle main track download
+        saved = router.expect(page, download_dir)
+        download_selectors = [
+            'button:has-text("Download")',
+            'button:has-text("Export")',
+            'a:has-text("Download")',
+            '[data-testid="download-button"]',
+            '.download-button',
+        ]
+
+        download_clicked = await SelectorHelper.try_selectors(page, download_selectors, "click")
+
+        if not download_clicked:
+            router.discard(page, saved)
+            raise SunoError("Could not find download button", "DOWNLOAD_ERROR")
+
+        # Wait for download to complete
+        files = [dict(await asyncio.wait_for(saved, timeout=30), kind="track")]
+
+        # Handle stems download if requested
+        if include_stems:
+            stems_selectors = [
+                'button:has-text("Download Stems")',
+                'button:has-text("Export Stems")',
+                '[data-testid="stems-button"]',
+                '.stems-button',
             ]
 
-            download_clicked = await SelectorHelper.try_selectors(page, download_selectors, "click")
+            stems_saved = router.expect(page, download_dir)
+            try:
+                for selector in stems_selectors:
+                    try:
+                        await timeouts.run(
+                            "selector",
+                            lambda timeout, selector=selector: page.click(selector, timeout=timeout),
+                            censor=False,
+                        )
+                        stems_file = await asyncio.wait_for(asyncio.shield(stems_saved), timeout=30)
+                        files.append(dict(stems_file, kind="stems"))
+                        break
+                    except Exception:
+                        continue
+            except Exception:
+                pass  # Stems download failed, but main track succeeded
+            finally:
+                if len(files) == 1:
+                    router.discard(page, stems_saved)
 
-            if not download_clicked:
-                raise SunoError("Could not find download button", "DOWNLOAD_ERROR")
+        return files
 
-            # Wait for download to complete
-            download = await download_event
-            suggested_filename = download.suggested_filename
-            full_path = download_dir / suggested_filename
+    async def _scan_library(self, page: Page, track_ids: List[str], max_scrolls: int = 20) -> Dict[str, str]:
+        """Resolve track IDs to track page URLs with a single library scan."""
+        if not page.url or "/library" not in page.url:
+            await navigate(page, "https://app.suno.ai/library/", wait_until="networkidle")
+            await wait_for_load(page)
 
-            await download.save_as(str(full_path))
+        wanted = set(track_ids)
+        found: Dict[str, str] = {}
+        seen: Set[str] = set()
+        feed_arrived = asyncio.Event()
 
-            # Handle stems download if requested
-            stems_downloaded = False
-            if include_stems:
-                try:
-                    stems_selectors = [
-                        'button:has-text("Download Stems")',
-                        'button:has-text("Export Stems")',
-                        '[data-testid="stems-button"]',
-                        '.stems-button',
-                    ]
+        def on_response(response: Any) -> None:
+            if "/api/feed" in response.url:
+                feed_arrived.set()
+
+        page.on("response", on_response)
+        try:
+            idle_scrolls = 0
+            for _ in range(max_scrolls):
+                # One round trip returns every track currently rendered
+                visible = await page.evaluate(LIBRARY_SCAN_SCRIPT)
+                found.update({tid: item["url"] for tid, item in visible.items() if tid in wanted})
+                if wanted.issubset(found):
+                    break
 
-                    stems_download_event = page.wait_for_event("download")
+                # As in sync_library, the end of the library looks like a
+                # slow page, so only stop after several idle scrolls in a row
+                idle_scrolls = 0 if set(visible) - seen else idle_scrolls + 1
+                if idle_scrolls >= config.get("library.idle_scrolls", 3):
+                    break
+                seen.update(visible)
 
-                    for selector in stems_selectors:
-                        try:
-                            await page.click(selector, timeout=3000)
-                            stems_download = await stems_download_event
-                            stems_filename = stems_download.suggested_filename
-                            stems_path = download_dir / stems_filename
-                            await stems_download.save_as(str(stems_path))
-                            stems_downloaded = True
-                            break
-                        except Exception:
-                            continue
+                feed_arrived.clear()
+                await wait_for_more(page, await scroll_library(page), feed_arrived)
+        finally:
+            page.remove_listener("response", on_response)
+
+        return found
+
+    async def download_batch(
+        self,
+        track_ids: List[str],
+        download_path: str = "downloads/",
+        include_stems: bool = False,
+        concurrency: int = 3,
+        skip_existing: bool = True,
+        on_progress: Optional[Callable[[int, int, Dict[str, Any]], Awaitable[None]]] = None,
+    ) -> BatchDownloadResult:
+        """Download many tracks from one library scan with bounded parallelism."""
+        try:
+            started = time.perf_counter()
+            components = await self.browser_manager.ensure_browser()
+            page = components["page"]
+            context = components["context"]
+            router = self.browser_manager.downloads
+            store = DownloadStore.for_directory(download_path)
+            download_dir = Path(download_path)
+
+            unique_ids = list(dict.fromkeys(track_ids))
+            total = len(unique_ids)
+            results: Dict[str, Dict[str, Any]] = {}
+            done = 0
+
+            async def report(track_id: str, result: Dict[str, Any]) -> None:
+                nonlocal done
+                results[track_id] = result
+                done += 1
+                self.logger.info("Batch download %s/%s: %s %s", done, total, track_id, result["status"])
+                if on_progress:
+                    await on_progress(done, total, dict(result, track_id=track_id))
+
+            pending = []
+            for track_id in unique_ids:
+                if skip_existing and store.is_downloaded(track_id):
+                    await report(track_id, {"status": "skipped", "files": store.get(track_id)["files"]})
+                else:
+                    pending.append(track_id)
+
+            # Resolve from the local index first; only scan the library for the rest
+            urls: Dict[str, str] = {}
+            for track_id in pending:
+                indexed = self.library.get(track_id)
+                if indexed and indexed.get("url"):
+                    urls[track_id] = indexed["url"]
+            unresolved = [track_id for track_id in pending if track_id not in urls]
+            if unresolved:
+                urls.update(await self._scan_library(page, unresolved))
+            semaphore = asyncio.Semaphore(max(1, concurrency))
+
+            async def download_one(track_id: str) -> None:
+                url = urls.get(track_id)
+                if not url:
+                    await report(track_id, {"status": "failed", "error": "not found in library"})
+                    return
+
+                async with semaphore:
+                    item_page = await context.new_page()
+                    router.attach(item_page)
+                    try:
+                        await navigate(item_page, url, wait_until="domcontentloaded")
+                        files = await self._save_track_files(item_page, download_dir, include_stems)
+                        store.record(track_id, files)
+                        self._analyze_later(files)
+                        result = {"status": "downloaded", "files": files}
+                    except Exception as e:
+                        result = {"status": "failed", "error": str(e)}
+                    finally:
+                        await item_page.close()
+                await report(track_id, result)
+
+            await asyncio.gather(*(download_one(track_id) for track_id in pending))
+
+            return BatchDownloadResult(
+                download_path=str(download_dir),
+                items=[
+                    BatchItem(
+                        track_id=track_id,
+                        status=results[track_id]["status"],
+                        files=[
+                            FileInfo(**dict(f, path=str(f["path"])))
+                            for f in results[track_id].get("files", [])
+                        ],
+                        error=results[track_id].get("error"),
+                    )
+                    for track_id in unique_ids
+                ],
+                elapsed_ms=elapsed_ms(started),
+            )
+
+        except Exception as e:
+            self.browser_manager.record_error(e)
+            if isinstance(e, SunoError):
+                raise
+            self.logger.error("Batch download failed: %s", e)
+            raise DownloadError(f"Batch download failed: {str(e)}", "DOWNLOAD_ERROR") from e
+
+    async def sync_library(self, full: bool = False, max_scrolls: int = 50) -> LibrarySyncResult:
+        """Crawl the library into the local index, stopping at the last sync cursor."""
+        try:
+            started = time.perf_counter()
+            components = await self.browser_manager.ensure_browser()
+            page = components["page"]
+            cursor = None if full else self.library.get_cursor()
+
+            records: Dict[str, Dict[str, Any]] = {}
+            parse_tasks: Set[asyncio.Task] = set()
+            feed_arrived = asyncio.Event()
+
+            async def capture_feed(response: Any) -> None:
+                try:
+                    payload = await response.json()
                 except Exception:
-                    pass  # Stems download failed, but main track succeeded
+                    return
+                for clip in iter_clips(payload):
+                    records[clip["id"]] = clip_to_record(clip)
+
+            def on_response(response: Any) -> None:
+                # The library page pages through Suno's feed API; its clip
+                # objects carry prompt, style, duration and status
+                if "/api/feed" in response.url:
+                    task = asyncio.create_task(capture_feed(response))
+                    parse_tasks.add(task)
+                    task.add_done_callback(parse_tasks.discard)
+                    feed_arrived.set()
+
+            def reached_synced_items() -> bool:
+                for record in records.values():
+                    if cursor and record.get("created_at") and record["created_at"] <= cursor:
+                        return True
+                    if not record.get("created_at") and self.library.contains(record["track_id"]):
+                        return True
+                return False
+
+            page.on("response", on_response)
+            try:
+                await navigate(page, "https://app.suno.ai/library/", wait_until="networkidle")
+                await wait_for_load(page)
+
+                idle_scrolls = known = 0
+                for _ in range(max_scrolls):
+                    visible = await page.evaluate(LIBRARY_SCAN_SCRIPT)
+                    for track_id, item in visible.items():
+                        record = records.setdefault(track_id, {"track_id": track_id})
+                        record.setdefault("url", item["url"])
+                        if item.get("title") and not record.get("title"):
+                            record["title"] = item["title"]
+
+                    if not full and reached_synced_items():
+                        break
+                    # The end of the library looks like a slow page; only give
+                    # up after several scrolls in a row turn up nothing new
+                    idle_scrolls = idle_scrolls + 1 if len(records) == known else 0
+                    if idle_scrolls >= config.get("library.idle_scrolls", 3):
+                        break
 
-            return f"✅ Download completed!\nTrack: {suggested_filename}\nPath: {full_path}\nStems included: {stems_downloaded}\n\nTrack ID: {track_id}"
+                    known = len(records)
+                    feed_arrived.clear()
+                    await wait_for_more(page, await scroll_library(page), feed_arrived)
+                    if parse_tasks:
+                        await asyncio.gather(*parse_tasks, return_exceptions=True)
+
+                if parse_tasks:
+                    await asyncio.gather(*parse_tasks, return_exceptions=True)
+            finally:
+                page.remove_listener("response", on_response)
+
+            synced = self.library.upsert(records.values())
+            newest = max((r["created_at"] for r in records.values() if r.get("created_at")), default=None)
+            if newest and (not cursor or newest > cursor):
+                self.library.set_cursor(newest)
+
+            return LibrarySyncResult(
+                full=full,
+                synced=synced,
+                indexed=self.library.count(),
+                cursor=self.library.get_cursor(),
+                elapsed_ms=elapsed_ms(started),
+            )
 
         except Exception as e:
+            self.browser_manager.record_error(e)
             if isinstance(e, SunoError):
                 raise
-            self.logger.error(f"Download failed: {e}")
-            raise SunoError(f"Download failed: {str(e)}", "DOWNLOAD_ERROR")
+            self.logger.error("Library sync failed: %s", e)
+            raise SunoError(f"Library sync failed: {str(e)}", "SYNC_ERROR") from e
 
-    async def get_status(self) -> str:
+    async def search_library(
+        self,
+        query: str = "",
+        status: Optional[str] = None,
+        limit: int = 20,
+    ) -> LibrarySearchResult:
+        """Search the local library index without touching the browser."""
+        started = time.perf_counter()
+        tracks = self.library.search(query, status, limit)
+        return LibrarySearchResult(
+            query=query,
+            tracks=[track_info(track) for track in tracks],
+            elapsed_ms=elapsed_ms(started),
+        )
+
+    async def wait_for_completion(
+        self,
+        track_id: Optional[str] = None,
+        timeout: float = 300,
+        track_ids: Optional[List[str]] = None,
+    ) -> CompletionResult:
+        """Wait until a track (or all of ``track_ids``) finishes generating, as pushed by the page."""
+        tracker = self.browser_manager.tracker
+        if not track_ids:
+            track_ids = [track_id] if track_id else list(self.last_generated_ids)
+        if not track_ids:
+            raise SunoError("No track ID given and no recent generation to wait for", "WAIT_ERROR")
+
+        started = time.perf_counter()
+        try:
+            tracks = await tracker.wait_for_all(track_ids, timeout)
+        except asyncio.TimeoutError:
+            pending = [
+                f"{tid} ({(tracker.get(tid) or {}).get('status', 'unknown')})"
+                for tid in track_ids
+            ]
+            raise SunoError(
+                f"Timed out after {timeout}s waiting for: {', '.join(pending)}", "WAIT_TIMEOUT"
+            ) from None
+        waited_ms = elapsed_ms(started)
+
+        failed = [t["track_id"] for t in tracks if t["status"] == "failed"]
+        if failed:
+            raise GenerationError(f"Generation failed for: {', '.join(failed)}", "GENERATION_FAILED")
+
+        return CompletionResult(
+            tracks=[track_info(track) for track in tracks],
+            waited_s=waited_ms / 1000,
+            elapsed_ms=waited_ms,
+        )
+
+    async def get_status(self) -> SessionStatus:
         """Get current Suno AI session status."""
         try:
             status = await self.browser_manager.get_status()
+            status["breakers"] = resilience.snapshot()
 
-            return f"📊 Suno MCP Status:\nBrowser Open: {status.get('browser_open', False)}\nPage Ready: {status.get('page_ready', False)}\nCurrent URL: {status.get('current_url', 'None')}\nPage Title: {status.get('page_title', 'None')}\nIn Studio: {status.get('in_studio', False)}"
+            return SessionStatus(
+                **{k: v for k, v in status.items() if k in SessionStatus.model_fields}
+            )
 
         except Exception as e:
-            self.logger.error(f"Status check failed: {e}")
+            self.browser_manager.record_error(e)
+            self.logger.error("Status check failed: %s", e)
             raise SunoError(f"Status check failed: {str(e)}", "STATUS_ERROR")
 
-    async def close_browser(self) -> str:
+    async def close_browser(self) -> MessageResult:
         """Close the browser session."""
         try:
             await self.browser_manager.close()
-            return "✅ Browser closed successfully."
+            return MessageResult(message="✅ Browser closed successfully.")
 
         except Exception as e:
-            self.logger.error(f"Browser close failed: {e}")
+            self.browser_manager.record_error(e)
+            self.logger.error("Browser close failed: %s", e)
             raise SunoError(f"Browser close failed: {str(e)}", "CLOSE_ERROR")
 
     async def get_browser_status(self) -> Dict[str, Any]:
         """Get detailed browser status for internal use."""
-        return await self.browser_manager.get_status()
+        status = await self.browser_manager.get_status()
+        status["breakers"] = resilience.snapshot()
+        return status
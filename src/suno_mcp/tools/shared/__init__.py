@@ -1,6 +1,21 @@
 """Shared utilities for Suno MCP tools."""
 
+from .downloads import DownloadRouter
 from .exceptions import SunoError
+from .library import LibraryIndex
+from .metrics import Metrics, metrics
+from .models import ToolResult
+from .tracking import TrackStatusTracker
 from .utils import BrowserManager, SelectorHelper
 
-__all__ = ["SunoError", "BrowserManager", "SelectorHelper"]
+__all__ = [
+    "SunoError",
+    "BrowserManager",
+    "SelectorHelper",
+    "DownloadRouter",
+    "LibraryIndex",
+    "Metrics",
+    "ToolResult",
+    "TrackStatusTracker",
+    "metrics",
+]
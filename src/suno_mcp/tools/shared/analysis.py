@@ -0,0 +1,240 @@
+"""Post-download audio analysis over memory-mapped WAV files.
+
+Requires the optional ``analysis`` extra (NumPy). Samples are read through
+``numpy.memmap`` in fixed-size chunks, so memory stays flat no matter how
+long the file is.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from .exceptions import AnalysisError
+from .metrics import metrics
+
+SIDECAR_SUFFIX = ".analysis.json"
+
+# WAVE format tags
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def read_wav_layout(path: Path) -> Dict[str, Any]:
+    """Locate the sample data of a WAV file without reading it."""
+    with open(path, "rb") as f:
+        riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+        if riff not in (b"RIFF", b"RF64") or wave != b"WAVE":
+            raise AnalysisError(f"Not a WAV file: {path}", "UNSUPPORTED_AUDIO")
+
+        fmt: Optional[Tuple[int, ...]] = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise AnalysisError(f"No audio data chunk in {path}", "INVALID_AUDIO")
+            chunk_id, size = struct.unpack("<4sI", header)
+            if chunk_id == b"fmt ":
+                body = f.read(size)
+                fmt = struct.unpack("<HHIIHH", body[:16])
+                if fmt[0] == WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                    # The real format tag is the first field of the sub-format GUID
+                    fmt = (struct.unpack("<H", body[24:26])[0],) + fmt[1:]
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise AnalysisError(f"WAV data before format chunk in {path}", "INVALID_AUDIO")
+                data_offset = f.tell()
+                # Streamed or RF64 files may report a bogus size; trust the file length
+                data_size = min(size, path.stat().st_size - data_offset) if size else path.stat().st_size - data_offset
+                break
+            else:
+                f.seek(size + (size & 1), 1)
+
+    format_tag, channels, sample_rate, _, block_align, bits = fmt
+    if format_tag not in (WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT) or bits not in (8, 16, 24, 32, 64):
+        raise AnalysisError(f"Unsupported WAV encoding ({format_tag}, {bits} bit) in {path}", "UNSUPPORTED_AUDIO")
+    return {
+        "format": "float" if format_tag == WAVE_FORMAT_IEEE_FLOAT else "pcm",
+        "channels": channels,
+        "sample_rate": sample_rate,
+        "bits": bits,
+        "block_align": block_align,
+        "data_offset": data_offset,
+        "frames": data_size // block_align,
+    }
+
+
+def _open_samples(path: Path, layout: Dict[str, Any]) -> Tuple[Any, float]:
+    """Memory-map the sample data; returns (frames x channels array, full scale)."""
+    frames, channels, bits = layout["frames"], layout["channels"], layout["bits"]
+    if bits == 24:
+        raw = np.memmap(path, dtype=np.uint8, mode="r", offset=layout["data_offset"], shape=(frames, channels, 3))
+        return raw, float(1 << 23)
+
+    if layout["format"] == "float":
+        dtype, scale = ("<f4" if bits == 32 else "<f8"), 1.0
+    elif bits == 8:
+        dtype, scale = np.uint8, 128.0
+    else:
+        dtype, scale = f"<i{bits // 8}", float(1 << (bits - 1))
+    samples = np.memmap(path, dtype=dtype, mode="r", offset=layout["data_offset"], shape=(frames, channels))
+    return samples, scale
+
+
+def _to_float(chunk: Any, bits: int, scale: float) -> Any:
+    """Convert one chunk of raw samples to float32 in [-1, 1]."""
+    if bits == 24:
+        # Little-endian 3-byte samples, sign-extended via a left shift into int32
+        wide = (
+            chunk[..., 0].astype(np.int32) << 8
+            | chunk[..., 1].astype(np.int32) << 16
+            | chunk[..., 2].astype(np.int32) << 24
+        ) >> 8
+        return wide.astype(np.float32) / scale
+    if bits == 8:
+        return (chunk.astype(np.float32) - 128.0) / scale
+    return chunk.astype(np.float32) / scale
+
+
+def _dbfs(value: float) -> Optional[float]:
+    """Level in dB relative to full scale (None for silence)."""
+    return round(20 * math.log10(value), 2) if value > 0 else None
+
+
+def analyze_wav(path: Path, peaks: int = 800, chunk_frames: int = 262144) -> Dict[str, Any]:
+    """Compute duration, peak, RMS loudness and waveform peaks of a WAV file.
+
+    The file is processed ``chunk_frames`` frames at a time. Waveform peaks
+    are the maximum absolute sample (over all channels) in each of ``peaks``
+    equal-width buckets.
+    """
+    if np is None:
+        raise AnalysisError("Audio analysis requires NumPy: pip install suno-mcp[analysis]", "ANALYSIS_UNAVAILABLE")
+
+    path = Path(path)
+    layout = read_wav_layout(path)
+    frames = layout["frames"]
+    samples, scale = _open_samples(path, layout)
+
+    buckets = max(1, min(peaks, frames))
+    # Frame index where each bucket starts, plus the end of the file
+    edges = np.linspace(0, frames, buckets + 1).astype(np.int64)
+    waveform = np.zeros(buckets, dtype=np.float32)
+    peak = 0.0
+    sum_squares = 0.0
+
+    for start in range(0, frames, chunk_frames):
+        stop = min(start + chunk_frames, frames)
+        chunk = _to_float(samples[start:stop], layout["bits"], scale)
+        magnitude = np.abs(chunk).max(axis=1)
+
+        peak = max(peak, float(magnitude.max()))
+        sum_squares += float(np.square(chunk, dtype=np.float64).sum())
+
+        # Buckets overlapping this chunk, reduced in one vectorized call
+        first = int(np.searchsorted(edges, start, side="right")) - 1
+        last = int(np.searchsorted(edges, stop, side="left"))
+        starts = np.clip(edges[first:last], start, stop) - start
+        starts = starts[starts < len(magnitude)]
+        if len(starts):
+            bucket_max = np.maximum.reduceat(magnitude, starts)
+            np.maximum(waveform[first:first + len(bucket_max)], bucket_max, out=waveform[first:first + len(bucket_max)])
+
+    del samples  # Release the mapping before returning
+    rms = math.sqrt(sum_squares / (frames * layout["channels"])) if frames else 0.0
+    return {
+        "file": path.name,
+        "bytes": path.stat().st_size,
+        "duration_s": round(frames / layout["sample_rate"], 3) if layout["sample_rate"] else 0.0,
+        "sample_rate": layout["sample_rate"],
+        "channels": layout["channels"],
+        "bits": layout["bits"],
+        "peak": round(peak, 5),
+        "peak_dbfs": _dbfs(peak),
+        "rms_dbfs": _dbfs(rms),
+        "waveform": [round(float(v), 4) for v in waveform],
+    }
+
+
+def sidecar_path(path: Path) -> Path:
+    """Where the analysis of an audio file is written."""
+    return path.with_name(path.name + SIDECAR_SUFFIX)
+
+
+class AudioAnalyzer:
+    """Runs audio analysis on a worker pool after downloads finish.
+
+    NumPy releases the GIL for the heavy array work, so a thread pool keeps
+    the event loop responsive without the cost of worker processes.
+    """
+
+    def __init__(self, workers: int = 2, peaks: int = 800, chunk_frames: int = 262144) -> None:
+        self.peaks = peaks
+        self.chunk_frames = chunk_frames
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="suno-analysis")
+        self._tasks: Set[asyncio.Task] = set()
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def available() -> bool:
+        """Whether the optional NumPy dependency is installed."""
+        return np is not None
+
+    def _analyze_to_sidecar(self, path: Path) -> Dict[str, Any]:
+        """Analyze one file and write its JSON sidecar (runs on a worker)."""
+        started = time.perf_counter()
+        analysis = analyze_wav(path, self.peaks, self.chunk_frames)
+        sidecar = sidecar_path(path)
+        tmp_path = sidecar.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(analysis, separators=(",", ":")), encoding="utf-8")
+        tmp_path.replace(sidecar)
+        metrics.observe("analysis.ms", (time.perf_counter() - started) * 1000)
+        return analysis
+
+    async def analyze(self, path: Path) -> Dict[str, Any]:
+        """Analyze a WAV file off the event loop."""
+        loop = asyncio.get_running_loop()
+        try:
+            analysis = await loop.run_in_executor(self._executor, self._analyze_to_sidecar, Path(path))
+        except Exception:
+            metrics.increment("analysis.failed")
+            raise
+        metrics.increment("analysis.files")
+        return analysis
+
+    def schedule(self, paths: Iterable[Path]) -> None:
+        """Queue analysis of freshly downloaded files without waiting for it."""
+        for path in paths:
+            path = Path(path)
+            if path.suffix.lower() != ".wav":
+                metrics.increment("analysis.skipped")
+                self.logger.debug("Skipping analysis of non-WAV file %s", path)
+                continue
+            task = asyncio.create_task(self._analyze_logged(path))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _analyze_logged(self, path: Path) -> None:
+        """Background analysis whose failures are logged, not raised."""
+        try:
+            analysis = await self.analyze(path)
+            self.logger.info(
+                "Analyzed %s: %ss, peak %s dBFS, RMS %s dBFS",
+                path.name, analysis["duration_s"], analysis["peak_dbfs"], analysis["rms_dbfs"],
+            )
+        except Exception as e:
+            self.logger.warning("Audio analysis of %s failed: %s", path, e)
+
+    def shutdown(self) -> None:
+        """Stop the worker pool."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,226 @@
+"""Download routing so every browser download is written exactly once."""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, ClassVar, Deque, Dict, List, Optional, Set
+
+import httpx
+from playwright.async_api import BrowserContext, Download, Page
+
+from .exceptions import DownloadError
+from .metrics import metrics
+
+# Bytes read from the network and written to disk at a time
+FETCH_CHUNK_SIZE = 1 << 20
+
+
+class DownloadRouter:
+    """Routes each browser download to the operation that triggered it.
+
+    Operations call ``expect`` before clicking a download button. The next
+    download on that page is saved straight into the expected destination;
+    downloads nobody asked for land in the default directory. Either way the
+    file is written once. Files Suno only exposes as URLs go through
+    ``fetch``, which streams them to disk with the session's cookies.
+    """
+
+    def __init__(self, default_dir: str = "downloads") -> None:
+        self.default_dir = Path(default_dir)
+        self._pending: Dict[Page, Deque[Dict[str, Any]]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self.logger = logging.getLogger(__name__)
+
+    def attach(self, page: Page) -> None:
+        """Start routing downloads from a page."""
+        page.on("download", self._on_download)
+        page.on("close", lambda closed: self._drop_page(closed))
+
+    def expect(self, page: Page, destination: Path, filename: Optional[str] = None) -> asyncio.Future:
+        """Claim the next download on a page.
+
+        Returns a future resolving to ``{"path", "filename", "bytes"}`` once
+        the file has been saved into destination.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(page, deque()).append(
+            {"destination": Path(destination), "filename": filename, "future": future}
+        )
+        return future
+
+    def discard(self, page: Page, future: asyncio.Future) -> None:
+        """Withdraw an expectation whose download never started."""
+        pending = self._pending.get(page)
+        if pending:
+            for expectation in list(pending):
+                if expectation["future"] is future:
+                    pending.remove(expectation)
+        if not future.done():
+            future.cancel()
+
+    def _drop_page(self, page: Page) -> None:
+        """Fail any expectations left on a page that has closed."""
+        for expectation in self._pending.pop(page, ()):
+            if not expectation["future"].done():
+                expectation["future"].set_exception(
+                    ConnectionError("Page closed before the download started")
+                )
+
+    def _on_download(self, download: Download) -> None:
+        """Dispatch a download event to its single destination."""
+        pending = self._pending.get(download.page)
+        expectation = None
+        while pending and expectation is None:
+            candidate = pending.popleft()
+            # Skip expectations whose caller already gave up waiting
+            if not candidate["future"].done():
+                expectation = candidate
+        task = asyncio.create_task(self._save(download, expectation))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def fetch(
+        self, context: BrowserContext, url: str, destination: Path, filename: str
+    ) -> Dict[str, Any]:
+        """Stream a URL into destination in chunks, authenticated as the browser session.
+
+        Returns ``{"path", "filename", "bytes"}`` like ``expect``.
+        """
+        cookies = await context.cookies(url)
+        headers = {"Cookie": "; ".join(f"{c['name']}={c['value']}" for c in cookies)} if cookies else {}
+        destination.mkdir(parents=True, exist_ok=True)
+        path = destination / filename
+        size = 0
+        try:
+            async with httpx.AsyncClient(follow_redirects=True, timeout=60.0) as client:
+                async with client.stream("GET", url, headers=headers) as response:
+                    if response.is_error:
+                        raise DownloadError(f"Download returned HTTP {response.status_code}", "DOWNLOAD_ERROR")
+                    with path.open("wb") as file:
+                        async for chunk in response.aiter_bytes(FETCH_CHUNK_SIZE):
+                            await asyncio.to_thread(file.write, chunk)
+                            size += len(chunk)
+        except Exception as e:
+            metrics.increment("downloads.failed")
+            path.unlink(missing_ok=True)
+            if isinstance(e, DownloadError):
+                raise
+            raise DownloadError(f"Download of {url} failed: {e}", "DOWNLOAD_ERROR") from e
+
+        metrics.increment("downloads.saved")
+        metrics.increment("downloads.bytes_written", size)
+        metrics.observe("downloads.bytes", size)
+        self.logger.info("Downloaded file: %s (%s bytes)", path, size)
+        return {"path": path, "filename": filename, "bytes": size}
+
+    async def _save(self, download: Download, expectation: Optional[Dict[str, Any]]) -> None:
+        """Write a download to disk once and record its size."""
+        destination = expectation["destination"] if expectation else self.default_dir
+        filename = (expectation and expectation["filename"]) or download.suggested_filename
+        future = expectation["future"] if expectation else None
+
+        try:
+            destination.mkdir(parents=True, exist_ok=True)
+            path = destination / filename
+            await download.save_as(str(path))
+            size = path.stat().st_size
+
+            metrics.increment("downloads.saved")
+            metrics.increment("downloads.bytes_written", size)
+            metrics.observe("downloads.bytes", size)
+            self.logger.info("Downloaded file: %s (%s bytes)", path, size)
+
+            if future and not future.done():
+                future.set_result({"path": path, "filename": filename, "bytes": size})
+        except Exception as e:
+            metrics.increment("downloads.failed")
+            self.logger.error("Download failed: %s", e)
+            if future and not future.done():
+                future.set_exception(e)
+
+
+class DownloadStore:
+    """Manifest of the tracks already downloaded into a directory.
+
+    Use ``for_directory`` so every caller in the process shares one store
+    per directory. Writes re-read the manifest and merge under a lock, so
+    entries recorded by another store or process are not overwritten.
+    """
+
+    MANIFEST_NAME = ".suno-downloads.json"
+
+    _stores: ClassVar[Dict[Path, "DownloadStore"]] = {}
+    _stores_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, directory: str) -> None:
+        self.directory = Path(directory)
+        self.manifest_path = self.directory / self.MANIFEST_NAME
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+
+    @classmethod
+    def for_directory(cls, directory: str) -> "DownloadStore":
+        """The process-wide store for a directory."""
+        key = Path(directory).resolve()
+        with cls._stores_lock:
+            if key not in cls._stores:
+                cls._stores[key] = cls(directory)
+            return cls._stores[key]
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Read the manifest, tolerating a missing or corrupt file."""
+        try:
+            return json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.logger.warning("Ignoring unreadable download manifest %s: %s", self.manifest_path, e)
+            return {}
+
+    def _save(self) -> None:
+        """Atomically rewrite the manifest."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._entries, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.manifest_path)
+
+    def get(self, track_id: str) -> Optional[Dict[str, Any]]:
+        """Return the manifest entry for a track, if any."""
+        return self._entries.get(track_id)
+
+    def is_downloaded(self, track_id: str) -> bool:
+        """Whether every file recorded for a track is still on disk."""
+        entry = self._entries.get(track_id)
+        if not entry or not entry.get("files"):
+            return False
+        return all(Path(f["path"]).exists() for f in entry["files"])
+
+    def record(self, track_id: str, files: List[Dict[str, Any]]) -> None:
+        """Record the files saved for a track."""
+        entry = {
+            "track_id": track_id,
+            "files": [
+                {
+                    "path": str(f["path"]),
+                    "filename": f["filename"],
+                    "bytes": f["bytes"],
+                    "kind": f.get("kind", "track"),
+                }
+                for f in files
+            ],
+            "downloaded_at": time.time(),
+        }
+        with self._lock:
+            # Start from the manifest on disk, not our snapshot of it
+            self._entries = {**self._load(), track_id: entry}
+            self._save()
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Return every manifest entry."""
+        return list(self._entries.values())
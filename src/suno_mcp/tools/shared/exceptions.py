@@ -4,9 +4,11 @@
 class SunoError(Exception):
     """Custom exception for Suno-related errors."""
 
-    def __init__(self, message: str, code: str = "SUNO_ERROR") -> None:
+    def __init__(self, message: str, code: str = "SUNO_ERROR", retryable: bool = True) -> None:
         super().__init__(message)
         self.code = code
+        # False once retrying could repeat a side effect, e.g. a submitted generation
+        self.retryable = retryable
 
 
 class BrowserError(SunoError):
@@ -32,3 +34,8 @@ class DownloadError(SunoError):
 class StudioError(SunoError):
     """Studio/DAW-related errors."""
     pass
+
+
+class AnalysisError(SunoError):
+    """Audio analysis errors."""
+    pass
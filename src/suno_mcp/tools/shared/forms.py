@@ -0,0 +1,87 @@
+"""Fill and submit a whole form in one browser round trip."""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from playwright.async_api import Page
+
+logger = logging.getLogger(__name__)
+
+# Sets every field and clicks submit inside the page. Values go through the
+# native value setter and fire input/change events, so framework-controlled
+# inputs (React) see them as user edits. Submit is skipped when a required
+# field is missing, leaving the caller free to fall back to per-field actions.
+FORM_FILL_SCRIPT = """
+async ({ fields, submit }) => {
+  const visible = (el) => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+  const find = (selectors) => {
+    for (const selector of selectors) {
+      let el = null;
+      try { el = document.querySelector(selector); } catch (e) { continue; }
+      if (el && visible(el)) return [el, selector];
+    }
+    return [null, null];
+  };
+
+  const setValue = (el, value) => {
+    if (el instanceof HTMLSelectElement) {
+      const option = Array.from(el.options).find(
+        (o) => o.value === value || o.textContent.trim().toLowerCase() === String(value).toLowerCase()
+      );
+      if (!option) return false;
+      el.value = option.value;
+    } else {
+      const proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+      const setter = Object.getOwnPropertyDescriptor(proto, "value").set;
+      el.focus();
+      setter.call(el, value);
+    }
+    el.dispatchEvent(new Event("input", { bubbles: true }));
+    el.dispatchEvent(new Event("change", { bubbles: true }));
+    return true;
+  };
+
+  const filled = {};
+  let missingRequired = false;
+  for (const field of fields) {
+    const [el, selector] = find(field.selectors);
+    filled[field.name] = el && setValue(el, field.value) ? selector : null;
+    if (!filled[field.name] && field.required) missingRequired = true;
+  }
+  if (missingRequired || !submit) return { filled, submitted: null };
+
+  // Let the app re-render (e.g. enable its submit button) before clicking
+  await new Promise((resolve) => requestAnimationFrame(() => setTimeout(resolve, 0)));
+
+  const usable = (el) => el && visible(el) && !el.disabled && el.getAttribute("aria-disabled") !== "true";
+  for (const text of submit.texts || []) {
+    const button = Array.from(document.querySelectorAll("button, [role=button]")).find(
+      (el) => usable(el) && el.textContent.trim().toLowerCase().includes(text.toLowerCase())
+    );
+    if (button) { button.click(); return { filled, submitted: `text=${text}` }; }
+  }
+  for (const selector of submit.selectors || []) {
+    let button = null;
+    try { button = document.querySelector(selector); } catch (e) { continue; }
+    if (usable(button)) { button.click(); return { filled, submitted: selector }; }
+  }
+  return { filled, submitted: null };
+}
+"""
+
+
+async def fill_form(
+    page: Page,
+    fields: List[Dict[str, Any]],
+    submit: Optional[Dict[str, List[str]]] = None,
+) -> Dict[str, Any]:
+    """Fill fields and click submit with a single ``page.evaluate``.
+
+    Each field is ``{"name", "selectors", "value", "required"}``; selectors
+    must be plain CSS. ``submit`` holds button ``texts`` to match and CSS
+    ``selectors``. Returns which selector filled each field and which
+    button was clicked (None if nothing was submitted).
+    """
+    result = await page.evaluate(FORM_FILL_SCRIPT, {"fields": fields, "submit": submit})
+    logger.debug("Batched form fill: %s", result)
+    return result
@@ -0,0 +1,190 @@
+"""Local SQLite index of the Suno library for offline lookup and search."""
+
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+TRACK_COLUMNS = (
+    "track_id",
+    "title",
+    "prompt",
+    "style",
+    "duration",
+    "status",
+    "url",
+    "audio_url",
+    "image_url",
+    "created_at",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tracks (
+    track_id   TEXT PRIMARY KEY,
+    title      TEXT,
+    prompt     TEXT,
+    style      TEXT,
+    duration   REAL,
+    status     TEXT,
+    url        TEXT,
+    audio_url  TEXT,
+    image_url  TEXT,
+    created_at TEXT,
+    synced_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tracks_created_at ON tracks (created_at);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def iter_clips(payload: Any) -> Iterable[Dict[str, Any]]:
+    """Yield every clip object found in a feed API response payload."""
+    if isinstance(payload, list):
+        for item in payload:
+            yield from iter_clips(item)
+    elif isinstance(payload, dict):
+        if payload.get("id") and "status" in payload:
+            yield payload
+        for key in ("clips", "data", "songs"):
+            if key in payload:
+                yield from iter_clips(payload[key])
+
+
+def clip_to_record(clip: Dict[str, Any], origin: str = "https://app.suno.ai") -> Dict[str, Any]:
+    """Convert a clip object from Suno's feed API into an index record."""
+    metadata = clip.get("metadata") or {}
+    return {
+        "track_id": clip["id"],
+        "title": clip.get("title"),
+        "prompt": metadata.get("gpt_description_prompt") or metadata.get("prompt"),
+        "style": metadata.get("tags"),
+        "duration": metadata.get("duration"),
+        "status": clip.get("status"),
+        "url": f"{origin}/song/{clip['id']}",
+        "audio_url": clip.get("audio_url"),
+        "image_url": clip.get("image_url"),
+        "created_at": clip.get("created_at"),
+    }
+
+
+class LibraryIndex:
+    """SQLite-backed index of library tracks with an incremental sync cursor."""
+
+    def __init__(self, path: str = "library.db") -> None:
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Open the database on first use."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path))
+            self._conn.row_factory = sqlite3.Row
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def _exists(self) -> bool:
+        """Whether there is anything to read, without creating the database."""
+        return self._conn is not None or self.path.exists()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def upsert(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Insert or update tracks; fields missing from a record are kept."""
+        now = time.time()
+        rows = [
+            tuple(record.get(column) for column in TRACK_COLUMNS) + (now,)
+            for record in records
+            if record.get("track_id")
+        ]
+        if not rows:
+            return 0
+
+        updates = ", ".join(
+            f"{column} = COALESCE(excluded.{column}, {column})" for column in TRACK_COLUMNS[1:]
+        )
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO tracks ({', '.join(TRACK_COLUMNS)}, synced_at) "
+                f"VALUES ({', '.join('?' * (len(TRACK_COLUMNS) + 1))}) "
+                f"ON CONFLICT(track_id) DO UPDATE SET {updates}, synced_at = excluded.synced_at",
+                rows,
+            )
+        return len(rows)
+
+    def get(self, track_id: str) -> Optional[Dict[str, Any]]:
+        """Return one indexed track."""
+        if not self._exists():
+            return None
+        row = self.conn.execute("SELECT * FROM tracks WHERE track_id = ?", (track_id,)).fetchone()
+        return dict(row) if row else None
+
+    def contains(self, track_id: str) -> bool:
+        """Whether a track is already indexed."""
+        if not self._exists():
+            return False
+        return self.conn.execute(
+            "SELECT 1 FROM tracks WHERE track_id = ?", (track_id,)
+        ).fetchone() is not None
+
+    def search(
+        self,
+        query: str = "",
+        status: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """Find tracks whose title, prompt or style match every query term."""
+        if not self._exists():
+            return []
+        clauses: List[str] = []
+        params: List[Any] = []
+        for term in query.split():
+            # Match % and _ in the query literally
+            escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            clauses.append(
+                "(title LIKE ? ESCAPE '\\' OR prompt LIKE ? ESCAPE '\\' "
+                "OR style LIKE ? ESCAPE '\\' OR track_id LIKE ? ESCAPE '\\')"
+            )
+            params.extend([f"%{escaped}%"] * 4)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.conn.execute(
+            f"SELECT * FROM tracks {where} ORDER BY created_at DESC, synced_at DESC LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count(self) -> int:
+        """Number of indexed tracks."""
+        if not self._exists():
+            return 0
+        return self.conn.execute("SELECT COUNT(*) FROM tracks").fetchone()[0]
+
+    def get_cursor(self) -> Optional[str]:
+        """Creation time of the newest track seen by the last sync."""
+        if not self._exists():
+            return None
+        row = self.conn.execute("SELECT value FROM sync_state WHERE key = 'cursor'").fetchone()
+        return row[0] if row else None
+
+    def set_cursor(self, cursor: str) -> None:
+        """Advance the sync cursor."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO sync_state (key, value) VALUES ('cursor', ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (cursor,),
+            )
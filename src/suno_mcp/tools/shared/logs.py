@@ -0,0 +1,172 @@
+"""Structured logging that never blocks the event loop.
+
+Records are enqueued by the thread that logs them and written by a
+background ``QueueListener`` thread. Message formatting (``msg % args``)
+and JSON encoding happen on that thread, so a slow disk or pipe cannot
+stall the asyncio loop that drives the browser.
+"""
+
+import atexit
+import contextlib
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from .metrics import metrics
+
+# Fields attached to every record logged while they are bound
+CONTEXT_FIELDS = ("tool", "session", "job")
+
+log_context: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar("suno_log_context", default=None)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+@contextlib.contextmanager
+def bind(**fields: Any) -> Iterator[None]:
+    """Attach fields (tool, session, job) to records logged in this block."""
+    token = log_context.set({**(log_context.get() or {}), **fields})
+    try:
+        yield
+    finally:
+        log_context.reset(token)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with the bound context fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, separators=(",", ":"))
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to a bounded queue without formatting or waiting.
+
+    DEBUG records are sampled per call site (the first of every
+    ``debug_sample_every`` is kept). When the queue is full the record is
+    dropped and counted; the count is logged once the queue drains.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[Any]", debug_sample_every: int = 1) -> None:
+        super().__init__(log_queue)
+        self.debug_sample_every = max(1, debug_sample_every)
+        self.dropped = 0
+        self._unreported = 0
+        self._debug_seen: Dict[Any, int] = {}
+        self._lock = threading.Lock()
+
+    def _sampled_out(self, record: logging.LogRecord) -> bool:
+        """Whether a DEBUG record falls outside the sample."""
+        if record.levelno != logging.DEBUG or self.debug_sample_every == 1:
+            return False
+        site = (record.pathname, record.lineno)
+        with self._lock:
+            seen = self._debug_seen.get(site, 0)
+            self._debug_seen[site] = seen + 1
+        if seen % self.debug_sample_every:
+            metrics.increment("logging.sampled_out")
+            return True
+        return False
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Attach the context fields, leaving message formatting to the writer."""
+        record = copy.copy(record)
+        for field, value in (log_context.get() or {}).items():
+            setattr(record, field, value)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                self._unreported += 1
+            metrics.increment("logging.dropped")
+            return
+
+        if self._unreported:
+            with self._lock:
+                dropped, self._unreported = self._unreported, 0
+            notice = logging.makeLogRecord({
+                "name": __name__,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": "Dropped %s log records while the log queue was full",
+                "args": (dropped,),
+            })
+            try:
+                self.queue.put_nowait(notice)
+            except queue.Full:
+                with self._lock:
+                    self._unreported += dropped
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._sampled_out(record):
+            return
+        try:
+            self.enqueue(self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+
+def configure_logging(config: Any) -> logging.handlers.QueueListener:
+    """Route all logging through a background writer thread.
+
+    Replaces the root logger's handlers with a non-blocking queue handler.
+    Writes go to stderr (stdout carries the MCP protocol) and, if
+    configured, to a file. Safe to call more than once.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    settings = config.get("logging", {})
+    if settings.get("json", True):
+        formatter: logging.Formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(settings.get("format", "%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+
+    handlers = [logging.StreamHandler(sys.stderr)]
+    if settings.get("file"):
+        log_file = Path(settings["file"])
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        handlers.append(logging.FileHandler(log_file, encoding="utf-8"))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: "queue.Queue[Any]" = queue.Queue(maxsize=settings.get("queue_size", 10000))
+    queue_handler = NonBlockingQueueHandler(log_queue, settings.get("debug_sample_every", 1))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(settings.get("level", "INFO"))
+    # httpx logs every webhook request at INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return _listener
@@ -0,0 +1,74 @@
+"""Lightweight in-process metrics for the MCP server."""
+
+import math
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+
+class Metrics:
+    """Counters and rolling observation windows keyed by dot-notation names."""
+
+    def __init__(self, window: int = 1024) -> None:
+        self.window = window
+        self._counters: Dict[str, float] = {}
+        self._observations: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1.0) -> None:
+        """Add value to a counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0.0) + value
+
+    def observe(self, name: str, value: float) -> None:
+        """Record one observation (a latency, a size) in a rolling window."""
+        with self._lock:
+            if name not in self._observations:
+                self._observations[name] = deque(maxlen=self.window)
+            self._observations[name].append(value)
+
+    def counter(self, name: str) -> float:
+        """Return the current value of a counter."""
+        return self._counters.get(name, 0.0)
+
+    def percentile(self, name: str, pct: float) -> Optional[float]:
+        """Return a nearest-rank percentile of an observation window."""
+        with self._lock:
+            values = sorted(self._observations.get(name, ()))
+        if not values:
+            return None
+        rank = max(0, math.ceil(pct / 100 * len(values)) - 1)
+        return values[rank]
+
+    def summary(self, name: str) -> Dict[str, Any]:
+        """Summarize an observation window."""
+        with self._lock:
+            values = sorted(self._observations.get(name, ()))
+        if not values:
+            return {"count": 0}
+
+        def rank(pct: float) -> float:
+            return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+        return {
+            "count": len(values),
+            "min": values[0],
+            "p50": rank(50),
+            "p95": rank(95),
+            "p99": rank(99),
+            "max": values[-1],
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return all counters and observation summaries."""
+        with self._lock:
+            counters = dict(self._counters)
+            names = list(self._observations)
+        return {
+            "counters": counters,
+            "observations": {name: self.summary(name) for name in names},
+        }
+
+
+# Global metrics instance
+metrics = Metrics()
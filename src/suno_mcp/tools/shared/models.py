@@ -0,0 +1,260 @@
+"""Typed tool results, rendered to text only for MCP clients."""
+
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ToolResult(BaseModel):
+    """Base result returned by every tool."""
+
+    status: str = "ok"
+    elapsed_ms: Optional[float] = None
+
+    def render(self) -> str:
+        """Human-readable text for MCP text content."""
+        return f"✅ {self.status}"
+
+
+class FileInfo(BaseModel):
+    """A file saved to disk by a download."""
+
+    path: str
+    filename: str
+    bytes: int
+    kind: str = "track"
+
+
+class TrackInfo(BaseModel):
+    """Known details of a Suno track."""
+
+    track_id: str
+    title: Optional[str] = None
+    status: Optional[str] = None
+    style: Optional[str] = None
+    prompt: Optional[str] = None
+    duration: Optional[float] = None
+    url: Optional[str] = None
+    audio_url: Optional[str] = None
+
+
+class BrowserResult(ToolResult):
+    """Result of opening the browser."""
+
+    title: str
+    url: str
+    headless: bool
+
+    def render(self) -> str:
+        return f"✅ Browser opened successfully. Navigated to Suno AI.\nPage title: {self.title}\nURL: {self.url}\nHeadless mode: {self.headless}"
+
+
+class LoginResult(ToolResult):
+    """Result of a login attempt."""
+
+    logged_in: bool
+    already_logged_in: bool = False
+    url: str
+
+    def render(self) -> str:
+        if self.already_logged_in:
+            return f"✅ Already logged in. Current URL: {self.url}\nReady for music generation!"
+        return f"✅ Login {'successful' if self.logged_in else 'attempted'}. Current URL: {self.url}\n{'Ready for music generation!' if self.logged_in else 'May require additional authentication steps.'}"
+
+
+class GenerationResult(ToolResult):
+    """Result of submitting a generation."""
+
+    prompt: str
+    style: str
+    lyrics: Optional[str] = None
+    started: bool
+    track_ids: List[str] = Field(default_factory=list)
+
+    def render(self) -> str:
+        track_ids = ", ".join(self.track_ids) or "pending"
+        lyrics = f"Lyrics: {self.lyrics[:50]}..." if self.lyrics else ""
+        return f"🎵 Track generation {'started' if self.started else 'initiated'}!\nPrompt: \"{self.prompt}\"\nStyle: {self.style}\n{lyrics}\nTrack IDs: {track_ids}\n\nGeneration in progress... Use suno_wait_for_completion to wait for the finished track."
+
+
+class CompletionResult(ToolResult):
+    """Tracks that finished generating."""
+
+    tracks: List[TrackInfo]
+    waited_s: float
+
+    def render(self) -> str:
+        lines = [
+            f"Track ID: {t.track_id}\nTitle: {t.title or 'Unknown'}\nAudio URL: {t.audio_url or 'None'}"
+            for t in self.tracks
+        ]
+        return "✅ Generation complete!\n" + "\n\n".join(lines) + f"\n\nWaited: {self.waited_s:.1f}s"
+
+
+class DownloadResult(ToolResult):
+    """Files saved for one track."""
+
+    track_id: str
+    files: List[FileInfo]
+
+    @property
+    def stems_included(self) -> bool:
+        return any(f.kind == "stems" for f in self.files)
+
+    def render(self) -> str:
+        main = self.files[0]
+        return f"✅ Download completed!\nTrack: {main.filename}\nPath: {main.path}\nSize: {main.bytes} bytes\nStems included: {self.stems_included}\n\nTrack ID: {self.track_id}"
+
+
+class BatchItem(BaseModel):
+    """Outcome of one track in a batch download."""
+
+    track_id: str
+    status: str
+    files: List[FileInfo] = Field(default_factory=list)
+    error: Optional[str] = None
+
+
+class BatchDownloadResult(ToolResult):
+    """Outcome of a batch download."""
+
+    download_path: str
+    items: List[BatchItem]
+
+    def counts(self) -> Dict[str, int]:
+        counts = {"downloaded": 0, "skipped": 0, "failed": 0}
+        for item in self.items:
+            counts[item.status] = counts.get(item.status, 0) + 1
+        return counts
+
+    def render(self) -> str:
+        icons = {"downloaded": "✅", "skipped": "⏭️", "failed": "❌"}
+        lines = []
+        for item in self.items:
+            if item.status == "failed":
+                detail = item.error or "unknown error"
+            else:
+                detail = ", ".join(f"{f.filename} ({f.bytes} bytes)" for f in item.files)
+            lines.append(f"{icons.get(item.status, '•')} {item.track_id}: {detail}")
+
+        counts = self.counts()
+        elapsed = (self.elapsed_ms or 0) / 1000
+        return f"📦 Batch download finished in {elapsed:.1f}s\nDownloaded: {counts['downloaded']}  Skipped: {counts['skipped']}  Failed: {counts['failed']}\nPath: {self.download_path}\n\n" + "\n".join(lines)
+
+
+class LibrarySyncResult(ToolResult):
+    """Outcome of a library sync."""
+
+    full: bool
+    synced: int
+    indexed: int
+    cursor: Optional[str] = None
+
+    def render(self) -> str:
+        elapsed = (self.elapsed_ms or 0) / 1000
+        return f"🔄 Library sync {'(full) ' if self.full else ''}complete!\nTracks synced: {self.synced}\nTracks indexed: {self.indexed}\nCursor: {self.cursor or 'None'}\nElapsed: {elapsed:.1f}s"
+
+
+class LibrarySearchResult(ToolResult):
+    """Tracks matching a library search."""
+
+    query: str
+    tracks: List[TrackInfo]
+
+    def render(self) -> str:
+        if not self.tracks:
+            return f"🔍 No indexed tracks match \"{self.query}\". Run suno_sync_library to refresh the index."
+
+        lines = [
+            f"• {t.title or 'Untitled'} [{t.status or 'unknown'}]\n  ID: {t.track_id}\n  Style: {t.style or '-'}\n  URL: {t.url or '-'}"
+            for t in self.tracks
+        ]
+        return f"🔍 {len(self.tracks)} track(s) matching \"{self.query}\" ({self.elapsed_ms or 0:.1f} ms)\n\n" + "\n".join(lines)
+
+
+class SessionStatus(ToolResult):
+    """Current browser session state."""
+
+    browser_open: bool = False
+    shared_browser: bool = False
+    context_ready: bool = False
+    page_ready: bool = False
+    current_url: Optional[str] = None
+    page_title: Optional[str] = None
+    in_studio: bool = False
+    pages_open: int = 0
+    last_error: Optional[str] = None
+    breakers: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+
+    def render(self) -> str:
+        breakers = ", ".join(f"{name} {b['state']}" for name, b in self.breakers.items()) or "None"
+        return f"📊 Suno MCP Status:\nBrowser Open: {self.browser_open}\nPage Ready: {self.page_ready}\nCurrent URL: {self.current_url or 'None'}\nPage Title: {self.page_title or 'None'}\nIn Studio: {self.in_studio}\nCircuit Breakers: {breakers}\nLast Error: {self.last_error or 'None'}"
+
+
+class StemRequest(BaseModel):
+    """One stem to generate in Suno Studio."""
+
+    prompt: str
+    stem_type: str = "instrumental"
+    position: float = 0.0
+    duration: Optional[float] = None
+    style: Optional[str] = None
+
+
+class StemSubmission(ToolResult):
+    """A stem generation submitted to Suno Studio."""
+
+    stem_type: str
+    prompt: str
+    generation_ids: List[str] = Field(default_factory=list)
+
+    def render(self) -> str:
+        ids = ", ".join(self.generation_ids) or "pending"
+        return f"🎛️ Stem generation submitted!\nType: {self.stem_type}\nPrompt: \"{self.prompt}\"\nGeneration IDs: {ids}\n\nUse studio_wait_generation to wait for it."
+
+
+class StemItem(BaseModel):
+    """Outcome of one stem in a multi-stem generation."""
+
+    stem_type: str
+    prompt: str
+    status: str
+    generation_ids: List[str] = Field(default_factory=list)
+    files: List[FileInfo] = Field(default_factory=list)
+    error: Optional[str] = None
+    elapsed_ms: Optional[float] = None
+
+
+class StemSetResult(ToolResult):
+    """Outcome of generating and downloading a set of stems."""
+
+    download_path: str
+    items: List[StemItem]
+
+    def render(self) -> str:
+        icons = {"complete": "✅", "failed": "❌"}
+        lines = []
+        for item in self.items:
+            if item.status == "complete":
+                detail = ", ".join(f"{f.filename} ({f.bytes} bytes)" for f in item.files) or "no files"
+            else:
+                detail = item.error or "unknown error"
+            lines.append(f"{icons.get(item.status, '•')} {item.stem_type}: {detail} ({(item.elapsed_ms or 0) / 1000:.1f}s)")
+
+        done = sum(1 for item in self.items if item.status == "complete")
+        elapsed = (self.elapsed_ms or 0) / 1000
+        return f"🎛️ Stems finished in {elapsed:.1f}s\nComplete: {done}/{len(self.items)}\nPath: {self.download_path}\n\n" + "\n".join(lines)
+
+
+class MessageResult(ToolResult):
+    """A result that is just a confirmation message."""
+
+    message: str
+
+    def render(self) -> str:
+        return self.message
+
+
+def track_info(data: Dict[str, Any]) -> TrackInfo:
+    """Build a TrackInfo from a tracker or library index record."""
+    return TrackInfo(**{k: v for k, v in data.items() if k in TrackInfo.model_fields})
@@ -0,0 +1,231 @@
+"""Retries with jittered backoff and per-operation, per-account circuit breakers."""
+
+import asyncio
+import functools
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+from .exceptions import SunoError
+from .metrics import metrics
+
+T = TypeVar("T")
+
+# Codes that describe the request itself; retrying cannot help and they say
+# nothing about Suno's health
+PERMANENT_CODES = frozenset({
+    "TRACK_NOT_FOUND",
+    "GENERATION_FAILED",
+    "HAR_NOT_FOUND",
+    "INVALID_ACCOUNTS",
+    "INVALID_PRIORITY",
+    "NO_ACCOUNT_AVAILABLE",
+    "CIRCUIT_OPEN",
+    "RATE_LIMITED",
+    "INSUFFICIENT_CREDITS",
+})
+
+# Codes that are always worth another attempt
+TRANSIENT_CODES = frozenset({
+    "BROWSER_INIT_ERROR",
+    "BROWSER_SERVER_UNAVAILABLE",
+})
+
+# Messages saying the account is throttled or broke. Retrying in place only
+# digs deeper; the account pool rests the account and moves on instead
+RATE_LIMIT_MARKERS = ("rate limit", "too many requests", "429")
+CREDIT_MARKERS = ("out of credits", "insufficient credits", "not enough credits")
+
+# Wrapped errors (LOGIN_ERROR, GENERATE_ERROR, ...) are transient when the
+# underlying message looks like an upstream or network problem
+TRANSIENT_MARKERS = (
+    "timeout",
+    "timed out",
+    "net::err",
+    "connection",
+    "target closed",
+    "econnreset",
+    "502",
+    "503",
+    "504",
+)
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether an error is likely to go away if the operation is retried."""
+    code = getattr(error, "code", None)
+    if code in PERMANENT_CODES:
+        return False
+    if code in TRANSIENT_CODES:
+        return True
+    message = str(error).lower()
+    if any(marker in message for marker in RATE_LIMIT_MARKERS + CREDIT_MARKERS):
+        return False
+    return any(marker in message for marker in TRANSIENT_MARKERS)
+
+
+class CircuitBreaker:
+    """Fails fast after repeated transient failures, then probes for recovery.
+
+    Closed: calls run normally. After ``failure_threshold`` consecutive
+    transient failures the breaker opens and calls fail immediately. Once
+    ``reset_timeout`` seconds pass it is half-open: a single probe call is
+    let through, and its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.last_error: str = ""
+        self._probing = False
+        self.logger = logging.getLogger(__name__)
+
+    def before_call(self) -> None:
+        """Raise CIRCUIT_OPEN unless this call may proceed."""
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self._transition("half_open")
+        if self.state == "open" or (self.state == "half_open" and self._probing):
+            metrics.increment(f"resilience.short_circuited.{self.name}")
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+            raise SunoError(
+                f"Suno {self.name} is failing ({self.last_error}); not trying again for {retry_in:.0f}s",
+                "CIRCUIT_OPEN",
+            )
+        if self.state == "half_open":
+            self._probing = True
+
+    def record_success(self) -> None:
+        """A call succeeded (or failed for reasons unrelated to Suno's health)."""
+        self._probing = False
+        self.failures = 0
+        if self.state != "closed":
+            self._transition("closed")
+
+    def record_abandoned(self) -> None:
+        """A call was cancelled before it finished; it says nothing either way."""
+        self._probing = False
+
+    def record_failure(self, error: BaseException) -> None:
+        """A call failed transiently."""
+        self._probing = False
+        self.failures += 1
+        self.last_error = str(error)[:200]
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._transition("open")
+
+    def _transition(self, state: str) -> None:
+        if state != self.state:
+            self.logger.warning("Circuit breaker %s: %s -> %s", self.name, self.state, state)
+            metrics.increment(f"resilience.breaker.{self.name}.{state}")
+            self.state = state
+
+    def snapshot(self) -> Dict[str, Any]:
+        """State for status endpoints."""
+        retry_in = None
+        if self.state == "open":
+            retry_in = round(max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at)), 1)
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_in_s": retry_in,
+            "last_error": self.last_error or None,
+        }
+
+
+class Resilience:
+    """Retry policy and circuit breakers for each named Suno operation.
+
+    Breakers are kept per operation and account, so one throttled or
+    broken account in the pool does not fail fast for the others.
+    """
+
+    def __init__(self, config: Any) -> None:
+        self.config = config
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.logger = logging.getLogger(__name__)
+
+    def _setting(self, operation: str, key: str, default: Any) -> Any:
+        """Per-operation setting, falling back to the resilience defaults."""
+        return self.config.get(
+            f"resilience.operations.{operation}.{key}",
+            self.config.get(f"resilience.{key}", default),
+        )
+
+    def breaker(self, operation: str, account: str = "default") -> CircuitBreaker:
+        """The breaker guarding an operation for one account."""
+        name = operation if account == "default" else f"{operation}@{account}"
+        if name not in self.breakers:
+            self.breakers[name] = CircuitBreaker(
+                name,
+                failure_threshold=self._setting(operation, "failure_threshold", 5),
+                reset_timeout=self._setting(operation, "reset_timeout", 30.0),
+            )
+        return self.breakers[name]
+
+    def backoff(self, operation: str, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry number ``attempt``."""
+        base = self._setting(operation, "base_delay", 0.5)
+        cap = self._setting(operation, "max_delay", 8.0)
+        return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+    async def call(self, operation: str, fn: Callable[[], Awaitable[T]], account: str = "default") -> T:
+        """Run an operation through its account's breaker, retrying transient failures."""
+        if not self.config.get("resilience.enabled", True):
+            return await fn()
+
+        breaker = self.breaker(operation, account)
+        attempts = max(1, self._setting(operation, "attempts", 3))
+        for attempt in range(1, attempts + 1):
+            breaker.before_call()
+            try:
+                result = await fn()
+            except Exception as e:
+                if not is_transient(e):
+                    breaker.record_success()  # Suno answered; the request was the problem
+                    raise
+                breaker.record_failure(e)
+                if attempt == attempts or breaker.state == "open" or not getattr(e, "retryable", True):
+                    raise
+                delay = self.backoff(operation, attempt)
+                metrics.increment(f"resilience.retries.{operation}")
+                self.logger.info("Retrying %s in %.2fs after transient failure: %s", operation, delay, e)
+                await asyncio.sleep(delay)
+            except BaseException:
+                # Cancelled mid-call: free the half-open probe slot for the next caller
+                breaker.record_abandoned()
+                raise
+            else:
+                breaker.record_success()
+                return result
+        raise AssertionError("unreachable")
+
+    def wrap(self, operation: str) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+        """Decorate an async method so every call goes through ``call``.
+
+        The breaker is chosen by the instance's ``account`` attribute.
+        """
+
+        def decorator(fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+            @functools.wraps(fn)
+            async def wrapper(instance: Any, *args: Any, **kwargs: Any) -> T:
+                return await self.call(
+                    operation,
+                    lambda: fn(instance, *args, **kwargs),
+                    account=getattr(instance, "account", "default"),
+                )
+
+            return wrapper
+
+        return decorator
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """State of every configured or used breaker."""
+        for operation in self.config.get("resilience.operations", {}):
+            self.breaker(operation)
+        return {name: breaker.snapshot() for name, breaker in sorted(self.breakers.items())}
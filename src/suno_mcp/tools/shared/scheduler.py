@@ -0,0 +1,245 @@
+"""Priority job scheduler with per-client fairness and credit-aware dispatch."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from . import logs
+from .exceptions import SunoError
+from .metrics import metrics
+
+# Lower value is dispatched first; classes are served in strict priority order
+PRIORITIES = {"interactive": 0, "normal": 1, "batch": 2}
+
+
+class CreditBudget:
+    """Per-account credit accounting with reservations for running jobs.
+
+    An account without a configured budget is treated as unlimited.
+    """
+
+    def __init__(self, budgets: Optional[Dict[str, Optional[float]]] = None) -> None:
+        self._remaining: Dict[str, Optional[float]] = dict(budgets or {})
+        self._reserved: Dict[str, float] = {}
+
+    def set_remaining(self, account: str, credits: Optional[float]) -> None:
+        """Set the credits an account has left (None for unlimited)."""
+        self._remaining[account] = credits
+
+    def available(self, account: str) -> Optional[float]:
+        """Credits not yet spent or reserved, or None if unlimited."""
+        remaining = self._remaining.get(account)
+        if remaining is None:
+            return None
+        return remaining - self._reserved.get(account, 0.0)
+
+    def can_afford(self, account: str, cost: float) -> bool:
+        """Whether a job of this cost can start now."""
+        available = self.available(account)
+        return available is None or cost <= available
+
+    def reserve(self, account: str, cost: float) -> None:
+        """Hold credits for a job that is starting."""
+        self._reserved[account] = self._reserved.get(account, 0.0) + cost
+
+    def settle(self, account: str, cost: float, charged: bool) -> None:
+        """Release a reservation, spending it if the job consumed credits."""
+        self._reserved[account] = max(0.0, self._reserved.get(account, 0.0) - cost)
+        remaining = self._remaining.get(account)
+        if charged and remaining is not None:
+            self._remaining[account] = max(0.0, remaining - cost)
+
+    def snapshot(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Remaining and reserved credits per account."""
+        accounts = set(self._remaining) | set(self._reserved)
+        return {
+            account: {
+                "remaining": self._remaining.get(account),
+                "reserved": self._reserved.get(account, 0.0),
+            }
+            for account in sorted(accounts)
+        }
+
+
+class JobScheduler:
+    """Dispatches jobs by priority class, then weighted fair queueing by client.
+
+    Within a priority class each client gets a share of dispatches
+    proportional to its weight: jobs are tagged with a virtual finish time
+    and the smallest tag runs next. Jobs that cost more credits than their
+    account has available are deferred, not started, until credits are
+    added (``set_credits``) or reservations are released. A job deferred
+    for longer than ``max_deferral`` seconds fails with INSUFFICIENT_CREDITS.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 1,
+        budget: Optional[CreditBudget] = None,
+        client_weights: Optional[Dict[str, float]] = None,
+        max_deferral: Optional[float] = 300.0,
+    ) -> None:
+        self.concurrency = max(1, concurrency)
+        self.budget = budget or CreditBudget()
+        self.client_weights = dict(client_weights or {})
+        self.max_deferral = max_deferral
+        self._queues: Dict[int, List[Tuple[float, int, Dict[str, Any]]]] = {
+            level: [] for level in PRIORITIES.values()
+        }
+        self._virtual_time: Dict[int, float] = dict.fromkeys(PRIORITIES.values(), 0.0)
+        self._last_finish: Dict[Tuple[int, str], float] = {}
+        self._sequence = itertools.count()
+        self._running: Dict[int, Dict[str, Any]] = {}
+        self._tasks: set = set()
+        self.logger = logging.getLogger(__name__)
+
+    async def submit(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        client_id: str = "default",
+        priority: str = "normal",
+        cost: float = 0.0,
+        account: str = "default",
+        name: str = "job",
+    ) -> Any:
+        """Queue a job and wait for its result."""
+        if priority not in PRIORITIES:
+            raise SunoError(
+                f"Unknown priority \"{priority}\" (expected one of: {', '.join(PRIORITIES)})",
+                "INVALID_PRIORITY",
+            )
+
+        level = PRIORITIES[priority]
+        weight = max(self.client_weights.get(client_id, 1.0), 1e-6)
+        start_tag = max(self._virtual_time[level], self._last_finish.get((level, client_id), 0.0))
+        finish_tag = start_tag + 1.0 / weight
+        self._last_finish[(level, client_id)] = finish_tag
+
+        job = {
+            "id": next(self._sequence),
+            "name": name,
+            "fn": fn,
+            "client_id": client_id,
+            "priority": priority,
+            "cost": cost,
+            "account": account,
+            "finish_tag": finish_tag,
+            "submitted": time.monotonic(),
+            "future": asyncio.get_running_loop().create_future(),
+        }
+        heapq.heappush(self._queues[level], (finish_tag, job["id"], job))
+        self._dispatch()
+        return await job["future"]
+
+    def _next_job(self) -> Optional[Dict[str, Any]]:
+        """Pop the next affordable job, leaving deferred ones queued."""
+        for level in sorted(self._queues):
+            queue = self._queues[level]
+            deferred = []
+            chosen = None
+            while queue:
+                entry = heapq.heappop(queue)
+                job = entry[2]
+                if job["future"].done():
+                    continue  # Caller went away while queued
+                if self.budget.can_afford(job["account"], job["cost"]):
+                    chosen = job
+                    break
+                if not job.get("deferred"):
+                    job["deferred"] = True
+                    metrics.increment("scheduler.deferred")
+                    self.logger.info(
+                        "Deferring %s for %s: account %s lacks %s credits",
+                        job["name"], job["client_id"], job["account"], job["cost"],
+                    )
+                    if self.max_deferral is not None:
+                        job["expiry"] = asyncio.get_running_loop().call_later(
+                            self.max_deferral, self._expire, job
+                        )
+                deferred.append(entry)
+            for entry in deferred:
+                heapq.heappush(queue, entry)
+            if chosen:
+                if chosen.get("expiry"):
+                    chosen["expiry"].cancel()
+                self._virtual_time[level] = chosen["finish_tag"]
+                return chosen
+        return None
+
+    def _expire(self, job: Dict[str, Any]) -> None:
+        """Fail a job that has waited too long for credits."""
+        if job["future"].done() or job["id"] in self._running:
+            return
+        metrics.increment("scheduler.deferral_expired")
+        available = self.budget.available(job["account"])
+        job["future"].set_exception(SunoError(
+            f"{job['name']} needs {job['cost']} credits but account {job['account']} has "
+            f"{available} available; gave up after {self.max_deferral:.0f}s. "
+            "Top up with suno_set_credits or POST /api/v1/scheduler/credits",
+            "INSUFFICIENT_CREDITS",
+        ))
+
+    def _dispatch(self) -> None:
+        """Start queued jobs while there is free capacity."""
+        while len(self._running) < self.concurrency:
+            job = self._next_job()
+            if job is None:
+                return
+            wait_ms = (time.monotonic() - job["submitted"]) * 1000
+            metrics.observe(f"scheduler.wait_ms.{job['priority']}", wait_ms)
+            self.budget.reserve(job["account"], job["cost"])
+            self._running[job["id"]] = job
+            task = asyncio.create_task(self._run(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        """Run one job and hand its outcome to the waiting caller."""
+        charged = False
+        try:
+            # Jobs may be started from another job's task; log as the submitter
+            with logs.bind(tool=job["name"], session=job["client_id"], job=job["id"]):
+                result = await job["fn"]()
+            charged = True
+            if not job["future"].done():
+                job["future"].set_result(result)
+        except BaseException as e:
+            if not job["future"].done():
+                job["future"].set_exception(e)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+        finally:
+            self.budget.settle(job["account"], job["cost"], charged)
+            del self._running[job["id"]]
+            self._dispatch()
+
+    def set_credits(self, account: str, credits: Optional[float]) -> None:
+        """Update an account's credits and start any jobs it now affords."""
+        self.budget.set_remaining(account, credits)
+        self._dispatch()
+
+    def status(self) -> Dict[str, Any]:
+        """Queue depths, deferrals, credits and wait times by priority."""
+        queued: Dict[str, int] = {}
+        deferred = 0
+        for priority, level in PRIORITIES.items():
+            jobs = [entry[2] for entry in self._queues[level] if not entry[2]["future"].done()]
+            queued[priority] = len(jobs)
+            deferred += sum(1 for job in jobs if job.get("deferred"))
+
+        return {
+            "concurrency": self.concurrency,
+            "running": [
+                {"name": job["name"], "client_id": job["client_id"], "priority": job["priority"]}
+                for job in self._running.values()
+            ],
+            "queued": queued,
+            "deferred": deferred,
+            "credits": self.budget.snapshot(),
+            "wait_ms": {
+                priority: metrics.summary(f"scheduler.wait_ms.{priority}") for priority in PRIORITIES
+            },
+        }
@@ -0,0 +1,118 @@
+"""Adaptive timeouts derived from the observed latency of each named step."""
+
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from .metrics import Metrics, metrics
+
+T = TypeVar("T")
+
+# Step name -> (default timeout ms, lower bound, upper bound); config overrides
+STEP_DEFAULTS: Dict[str, Tuple[float, float, float]] = {
+    "selector": (2000, 500, 10000),
+    "element": (10000, 1000, 30000),
+    "navigation": (30000, 5000, 90000),
+    "page_load": (60000, 10000, 120000),
+    "login_redirect": (10000, 3000, 30000),
+    "generation_indicator": (5000, 1000, 15000),
+}
+
+
+class TimeoutController:
+    """Derives each step's timeout from a rolling percentile of its latencies.
+
+    Until a step has ``min_samples`` observations its configured timeout
+    is used. After that the timeout is the configured percentile of recent
+    latencies times ``headroom``, clamped to the step's bounds, so dead
+    fallbacks give up quickly and slow-but-working steps get room under
+    load. A timeout is recorded as a censored observation at the limit it
+    hit (the step took at least that long), so repeated timeouts raise the
+    limit by ``headroom`` each time instead of pinning it at the floor.
+    """
+
+    def __init__(self, config: Any, registry: Optional[Metrics] = None) -> None:
+        self.config = config
+        self.metrics = registry or metrics
+        self.logger = logging.getLogger(__name__)
+
+    def _settings(self) -> Dict[str, Any]:
+        """Timeout settings, read live so runtime config changes apply."""
+        return {
+            "timeouts": self.config.get("timeouts", {}),
+            "adaptive": self.config.get("timeouts.adaptive", {}),
+        }
+
+    def _step_config(self, step: str) -> Tuple[float, float, float]:
+        """Configured default and bounds for a step."""
+        settings = self._settings()
+        default, low, high = STEP_DEFAULTS.get(step, (10000, 1000, 60000))
+        default = settings["timeouts"].get(step, default)
+        low, high = settings["adaptive"].get("bounds", {}).get(step, (low, high))
+        return float(default), float(low), float(high)
+
+    def get(self, step: str) -> float:
+        """Current timeout for a step in milliseconds."""
+        default, low, high = self._step_config(step)
+        adaptive = self._settings()["adaptive"]
+        if not adaptive.get("enabled", True):
+            return default
+
+        name = f"step_ms.{step}"
+        if self.metrics.summary(name)["count"] < adaptive.get("min_samples", 10):
+            return min(max(default, low), high)
+
+        observed = self.metrics.percentile(name, adaptive.get("percentile", 99))
+        return float(round(min(max(observed * adaptive.get("headroom", 1.5), low), high)))
+
+    def observe(self, step: str, elapsed_ms: float) -> None:
+        """Record how long a successful step took."""
+        self.metrics.observe(f"step_ms.{step}", elapsed_ms)
+
+    def observe_timeout(self, step: str, timeout_ms: float) -> None:
+        """Record a step that ran out of time: it needed at least ``timeout_ms``."""
+        self.metrics.increment(f"step_timeouts.{step}")
+        self.metrics.observe(f"step_ms.{step}", timeout_ms)
+
+    async def run(self, step: str, action: Callable[[float], Awaitable[T]], censor: bool = True) -> T:
+        """Run ``action(timeout_ms)`` and learn from how long it took.
+
+        Pass ``censor=False`` when a timeout may mean the target does not
+        exist (one of several fallback selectors) rather than that it was
+        slow; the caller can report the step with ``observe_timeout`` once
+        every fallback has failed.
+        """
+        timeout = self.get(step)
+        started = time.perf_counter()
+        try:
+            result = await action(timeout)
+        except PlaywrightTimeoutError:
+            if censor:
+                self.observe_timeout(step, timeout)
+            else:
+                self.metrics.increment(f"step_timeouts.{step}")
+            raise
+        self.observe(step, (time.perf_counter() - started) * 1000)
+        return result
+
+    def apply(self, page: Any) -> None:
+        """Set a page's default action and navigation timeouts to the learned ones."""
+        page.set_default_timeout(self.get("element"))
+        page.set_default_navigation_timeout(self.get("navigation"))
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Current timeout, bounds and observed latencies of every known step."""
+        steps = set(STEP_DEFAULTS) | set(self._settings()["adaptive"].get("bounds", {}))
+        result = {}
+        for step in sorted(steps):
+            default, low, high = self._step_config(step)
+            result[step] = {
+                "timeout_ms": self.get(step),
+                "default_ms": default,
+                "bounds_ms": [low, high],
+                "latency_ms": self.metrics.summary(f"step_ms.{step}"),
+                "timeouts": self.metrics.counter(f"step_timeouts.{step}"),
+            }
+        return result
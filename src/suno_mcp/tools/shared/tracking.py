@@ -0,0 +1,234 @@
+"""Push-based track status tracking driven by an in-page observer."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from playwright.async_api import BrowserContext
+
+TRACK_STATUSES = ("queued", "streaming", "complete", "failed")
+TERMINAL_STATUSES = frozenset({"complete", "failed"})
+
+BINDING_NAME = "__sunoTrackStatus"
+
+# Injected into every page of the context. Suno's UI polls its feed API for
+# clip state, so wrapping fetch gives us the authoritative status as soon as
+# the app itself sees it. The MutationObserver is a fallback for clips that
+# only ever show up in the DOM (e.g. after a full page load of the library);
+# its reports carry source "dom" so feed data can correct them.
+OBSERVER_SCRIPT = """
+(() => {
+  if (window.__sunoTrackObserverInstalled) return;
+  window.__sunoTrackObserverInstalled = true;
+
+  const STATUS_MAP = {
+    submitted: "queued", queued: "queued", pending: "queued",
+    streaming: "streaming", generating: "streaming", running: "streaming",
+    complete: "complete", completed: "complete", done: "complete",
+    error: "failed", failed: "failed",
+  };
+  const seen = new Map();
+
+  const report = (id, rawStatus, extra) => {
+    const status = STATUS_MAP[String(rawStatus || "").toLowerCase()];
+    if (!id || !status) return;
+    const key = status + "|" + (extra.audio_url || "");
+    if (seen.get(id) === key) return;
+    seen.set(id, key);
+    try {
+      window.__sunoTrackStatus(Object.assign({ track_id: String(id), status }, extra));
+    } catch (e) { /* binding not ready yet */ }
+  };
+
+  const reportClip = (clip) => {
+    if (!clip || typeof clip !== "object" || !clip.id || !clip.status) return;
+    report(clip.id, clip.status, {
+      title: clip.title || null,
+      audio_url: clip.audio_url || null,
+      source: "feed",
+    });
+  };
+
+  const scanPayload = (data) => {
+    if (Array.isArray(data)) { data.forEach(scanPayload); return; }
+    if (!data || typeof data !== "object") return;
+    if (data.id && data.status) reportClip(data);
+    ["clips", "data", "songs"].forEach((k) => { if (data[k]) scanPayload(data[k]); });
+  };
+
+  const originalFetch = window.fetch;
+  if (originalFetch) {
+    window.fetch = async (...args) => {
+      const response = await originalFetch(...args);
+      try {
+        const url = String((args[0] && args[0].url) || args[0] || "");
+        if (/\\/api\\/(feed|generate|clip)/.test(url)) {
+          response.clone().json().then(scanPayload).catch(() => {});
+        }
+      } catch (e) { /* never break the app's own requests */ }
+      return response;
+    };
+  }
+
+  // Terminal statuses only come from explicit status attributes; an audio
+  // element or the word "error" in a title is too weak to end a wait on
+  const domStatus = (el) => {
+    const attr = el.getAttribute("data-status") || el.getAttribute("data-clip-status");
+    if (attr) return attr;
+    if (el.querySelector('[data-testid="generating"], .generating, [data-status="generating"]')) return "generating";
+    const text = (el.textContent || "").toLowerCase();
+    if (/\\bqueued\\b|\\bin queue\\b/.test(text)) return "queued";
+    return null;
+  };
+
+  const domId = (el) => {
+    const id = el.getAttribute("data-clip-id") || el.getAttribute("data-track-id") || el.getAttribute("data-song-id");
+    if (id) return id;
+    const link = el.matches('a[href*="/song/"]') ? el : el.querySelector('a[href*="/song/"]');
+    const match = link && link.getAttribute("href").match(/\\/song\\/([\\w-]+)/);
+    return match ? match[1] : null;
+  };
+
+  let scheduled = false;
+  const scanDom = () => {
+    scheduled = false;
+    document.querySelectorAll("[data-clip-id], [data-track-id], [data-song-id]").forEach((el) => {
+      const audio = el.querySelector("audio[src]");
+      report(domId(el), domStatus(el), {
+        title: el.getAttribute("data-title") || null,
+        audio_url: audio ? audio.getAttribute("src") : null,
+        source: "dom",
+      });
+    });
+  };
+
+  const start = () => {
+    new MutationObserver(() => {
+      if (!scheduled) { scheduled = true; setTimeout(scanDom, 250); }
+    }).observe(document.documentElement, {
+      subtree: true, childList: true, attributes: true,
+      attributeFilter: ["data-status", "data-clip-status", "src", "class"],
+    });
+    scanDom();
+  };
+
+  if (document.documentElement) start();
+  else document.addEventListener("DOMContentLoaded", start, { once: true });
+})();
+"""
+
+
+class TrackStatusTracker:
+    """Keeps the latest known status of each track and wakes up waiters.
+
+    A tracker with a parent forwards every update to it, so one tracker can
+    see the tracks of several browser contexts.
+    """
+
+    def __init__(self, parent: Optional["TrackStatusTracker"] = None) -> None:
+        self.parent = parent
+        self.tracks: Dict[str, Dict[str, Any]] = {}
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._subscribers: List[asyncio.Queue] = []
+        self.logger = logging.getLogger(__name__)
+
+    async def install(self, context: BrowserContext) -> None:
+        """Expose the status binding and inject the observer into a context."""
+        await context.expose_binding(BINDING_NAME, self._on_binding)
+        await context.add_init_script(OBSERVER_SCRIPT)
+
+    def _on_binding(self, source: Any, payload: Dict[str, Any]) -> None:
+        """Receive a status push from the page."""
+        try:
+            self.update(payload["track_id"], payload["status"], **{
+                k: v for k, v in payload.items() if k not in ("track_id", "status")
+            })
+        except Exception as e:
+            self.logger.debug("Ignoring malformed track status push: %s", e)
+
+    def update(self, track_id: str, status: str, **fields: Any) -> Dict[str, Any]:
+        """Record a status change and notify waiters and subscribers."""
+        if status not in TRACK_STATUSES:
+            raise ValueError(f"Unknown track status: {status}")
+
+        now = time.time()
+        track = self.tracks.setdefault(track_id, {"track_id": track_id, "first_seen": now})
+        previous = track.get("status")
+        # A terminal state is final, except that feed data may correct a
+        # status the DOM fallback inferred. DOM scans never override the feed.
+        if previous in TERMINAL_STATUSES:
+            from_dom = fields.get("source") == "dom"
+            settled_by_dom = track.get("source") == "dom"
+            if from_dom and not settled_by_dom:
+                return dict(track)
+            if status not in TERMINAL_STATUSES and (from_dom or not settled_by_dom):
+                return dict(track)
+
+        track.update({k: v for k, v in fields.items() if v is not None})
+        track["status"] = status
+        track["updated_at"] = now
+        snapshot = dict(track)
+
+        if previous != status:
+            self.logger.info("Track %s: %s -> %s", track_id, previous or "new", status)
+            for queue in list(self._subscribers):
+                queue.put_nowait(snapshot)
+
+        if status in TERMINAL_STATUSES:
+            for future in self._waiters.pop(track_id, []):
+                if not future.done():
+                    future.set_result(snapshot)
+
+        if self.parent:
+            self.parent.update(track_id, status, **fields)
+        return snapshot
+
+    def get(self, track_id: str) -> Optional[Dict[str, Any]]:
+        """Return the last known status of a track, if any."""
+        track = self.tracks.get(track_id)
+        return dict(track) if track else None
+
+    def known_ids(self) -> Set[str]:
+        """Return the IDs of every track seen so far."""
+        return set(self.tracks)
+
+    async def wait_for(self, track_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Wait until a track reaches a terminal status.
+
+        Raises asyncio.TimeoutError if the track is still running after timeout.
+        """
+        track = self.tracks.get(track_id)
+        if track and track.get("status") in TERMINAL_STATUSES:
+            return dict(track)
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(track_id, []).append(future)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            waiters = self._waiters.get(track_id)
+            if waiters and future in waiters:
+                waiters.remove(future)
+                if not waiters:
+                    del self._waiters[track_id]
+
+    async def wait_for_all(
+        self, track_ids: Iterable[str], timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Wait until every given track reaches a terminal status."""
+        return await asyncio.wait_for(
+            asyncio.gather(*(self.wait_for(track_id) for track_id in track_ids)),
+            timeout,
+        )
+
+    def subscribe(self) -> asyncio.Queue:
+        """Return a queue that receives every subsequent status change."""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Stop delivering status changes to a queue."""
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
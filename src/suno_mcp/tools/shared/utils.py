@@ -2,12 +2,35 @@
 
 import asyncio
 import logging
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-from playwright.async_api import Browser, BrowserContext, Page, Playwright, async_playwright
-
-from .exceptions import BrowserError, SunoError
+from typing import Any, Dict, Optional
+
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Page,
+    Playwright,
+    async_playwright,
+)
+
+from .downloads import DownloadRouter
+from .exceptions import BrowserError
+from .resilience import Resilience
+from .timeouts import TimeoutController
+from .tracking import TrackStatusTracker
+
+# Flags for every Chromium we start, in-process or as the shared server
+CHROMIUM_ARGS = [
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-accelerated-2d-canvas",
+    "--no-first-run",
+    "--disable-gpu",
+    "--disable-web-security",
+    "--disable-features=VizDisplayCompositor",
+]
 
 
 class SelectorHelper:
@@ -18,18 +41,25 @@ class SelectorHelper:
         page: Page, selectors: list[str], action: str = "click", **kwargs
     ) -> bool:
         """Try multiple selectors for an action."""
+        async def attempt(selector: str, timeout: float) -> None:
+            if action == "click":
+                await page.click(selector, timeout=timeout, **kwargs)
+            elif action == "fill":
+                await page.fill(selector, "", timeout=timeout)  # Clear first
+                await page.fill(selector, kwargs.get("value", ""), timeout=timeout)
+            elif action == "select":
+                await page.select_option(selector, kwargs.get("value", ""), timeout=timeout)
+
         for selector in selectors:
             try:
-                if action == "click":
-                    await page.click(selector, timeout=2000, **kwargs)
-                elif action == "fill":
-                    await page.fill(selector, "", timeout=2000)  # Clear first
-                    await page.fill(selector, kwargs.get("value", ""), timeout=2000)
-                elif action == "select":
-                    await page.select_option(selector, kwargs.get("value", ""), timeout=2000)
+                await timeouts.run(
+                    "selector", lambda timeout, selector=selector: attempt(selector, timeout), censor=False
+                )
                 return True
             except Exception:
                 continue
+        # Every fallback timing out hints at a slow page rather than a dead selector
+        timeouts.observe_timeout("selector", timeouts.get("selector"))
         return False
 
     @staticmethod
@@ -37,63 +67,220 @@ class SelectorHelper:
         """Wait for any of the selectors to appear."""
         for selector in selectors:
             try:
-                await page.wait_for_selector(selector, timeout=2000, **kwargs)
+                await timeouts.run(
+                    "selector",
+                    lambda timeout, selector=selector: page.wait_for_selector(selector, timeout=timeout, **kwargs),
+                    censor=False,
+                )
                 return selector
             except Exception:
                 continue
+        timeouts.observe_timeout("selector", timeouts.get("selector"))
         return None
 
 
-class BrowserManager:
-    """Manages browser lifecycle and sessions."""
+async def navigate(page: Page, url: str, wait_until: str = "networkidle") -> Any:
+    """Navigate with a timeout learned from earlier navigations of the same kind."""
+    step = "page_load" if wait_until in ("load", "networkidle") else "navigation"
+    return await timeouts.run(step, lambda timeout: page.goto(url, wait_until=wait_until, timeout=timeout))
 
-    def __init__(self) -> None:
+
+async def wait_for_load(page: Page, state: str = "domcontentloaded") -> None:
+    """Wait for a load state with a learned timeout, and learn from how long it took."""
+    step = "page_load" if state in ("load", "networkidle") else "navigation"
+    await timeouts.run(step, lambda timeout: page.wait_for_load_state(state, timeout=timeout))
+
+
+class BrowserManager:
+    """Manages browser lifecycle and sessions.
+
+    A manager with a parent borrows the parent's browser and only owns its
+    own context, e.g. one context per account in an account pool.
+    """
+
+    def __init__(
+        self,
+        parent: Optional["BrowserManager"] = None,
+        storage_state: Optional[str] = None,
+    ) -> None:
+        self.parent = parent
+        self.storage_state = Path(storage_state) if storage_state else None
         self.playwright: Optional[Playwright] = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
+        self.tracker = TrackStatusTracker(parent=parent.tracker if parent else None)
+        self.downloads = DownloadRouter()
+        self.snapshot: Dict[str, Any] = self._closed_snapshot()
+        self._title_tasks: set = set()
+        self._launch_lock = asyncio.Lock()
         self.logger = logging.getLogger(__name__)
 
-    async def ensure_browser(self, headless: bool = True) -> Dict[str, Any]:
-        """Ensure browser is initialized and return browser components."""
+    @staticmethod
+    def _closed_snapshot() -> Dict[str, Any]:
+        """Status of a manager with no browser."""
+        return {
+            "browser_open": False,
+            "shared_browser": False,
+            "context_ready": False,
+            "page_ready": False,
+            "pages_open": 0,
+            "current_url": None,
+            "page_title": None,
+            "in_studio": False,
+            "last_error": None,
+            "updated_at": time.time(),
+        }
+
+    def _update_snapshot(self, **fields: Any) -> None:
+        """Apply an event to the in-memory status snapshot."""
+        self.snapshot.update(fields, updated_at=time.time())
+
+    def record_error(self, error: BaseException) -> None:
+        """Remember the most recent failure for status endpoints."""
+        self._update_snapshot(last_error=f"{type(error).__name__}: {error}")
+
+    def _watch_page(self, page: Page) -> None:
+        """Keep the snapshot current from page events instead of probing."""
+
+        def on_navigated(frame: Any) -> None:
+            if frame == page.main_frame:
+                self._update_snapshot(
+                    current_url=frame.url,
+                    page_title=None,
+                    in_studio="/studio" in (frame.url or ""),
+                )
+
+        def on_load(loaded: Page) -> None:
+            # One title fetch per load, not per status probe
+            task = asyncio.create_task(self._refresh_title(loaded))
+            self._title_tasks.add(task)
+            task.add_done_callback(self._title_tasks.discard)
+
+        def on_close(closed: Page) -> None:
+            if closed is self.page:
+                self.page = None
+                self._update_snapshot(page_ready=False, current_url=None, page_title=None, in_studio=False)
+
+        page.on("framenavigated", on_navigated)
+        page.on("load", on_load)
+        page.on("close", on_close)
+
+    async def _refresh_title(self, page: Page) -> None:
+        """Record the page title after a load."""
         try:
+            title = await page.title()
+        except Exception:
+            return  # Page closed or navigated again
+        if page is self.page:
+            self._update_snapshot(page_title=title)
+
+    def _watch_context(self, context: BrowserContext) -> None:
+        """Track how many pages the context has open."""
+
+        def on_page(page: Page) -> None:
+            self._update_snapshot(pages_open=len(context.pages))
+            page.on("close", lambda closed: self._update_snapshot(pages_open=len(context.pages)))
+
+        context.on("page", on_page)
+
+    async def _connect_shared(self, endpoint: str) -> Browser:
+        """Connect to a long-lived browser server instead of launching one."""
+        protocol = config.get("browser.server.protocol", "cdp")
+        try:
+            if protocol == "playwright":
+                browser = await self.playwright.chromium.connect(endpoint)
+            else:
+                browser = await self.playwright.chromium.connect_over_cdp(endpoint)
+        except Exception as e:
+            raise BrowserError(
+                f"Could not connect to shared browser at {endpoint}: {e}. "
+                "Is it running? Start it with: suno-mcp-browser start",
+                "BROWSER_SERVER_UNAVAILABLE",
+            ) from e
+        self.logger.info("Connected to shared browser at %s (%s)", endpoint, protocol)
+        return browser
+
+    async def _ensure_launched(self, headless: bool) -> None:
+        """Start Playwright and launch or connect to the browser."""
+        if self.playwright and self.browser:
+            return
+        # Pool accounts open their contexts concurrently; launch only once
+        async with self._launch_lock:
             if not self.playwright:
                 self.playwright = await async_playwright().start()
 
             if not self.browser:
-                self.browser = await self.playwright.chromium.launch(
-                    headless=headless,
-                    args=[
-                        "--no-sandbox",
-                        "--disable-setuid-sandbox",
-                        "--disable-dev-shm-usage",
-                        "--disable-accelerated-2d-canvas",
-                        "--no-first-run",
-                        "--disable-gpu",
-                        "--disable-web-security",
-                        "--disable-features=VizDisplayCompositor",
-                    ],
-                )
+                endpoint = config.get("browser.server.endpoint")
+                if endpoint:
+                    self.browser = await self._connect_shared(endpoint)
+                else:
+                    self.browser = await self.playwright.chromium.launch(headless=headless, args=CHROMIUM_ARGS)
+                self.browser.on("disconnected", lambda browser: self._on_disconnected())
+                self._update_snapshot(browser_open=True, shared_browser=bool(endpoint))
 
-            if not self.context:
-                self.context = await self.browser.new_context(
-                    viewport={"width": 1920, "height": 1080},
-                    user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                    accept_downloads=True,
-                )
+    async def ensure_browser(self, headless: bool = True) -> Dict[str, Any]:
+        """Ensure browser is initialized and return browser components."""
+        try:
+            if self.parent:
+                await self.parent._ensure_launched(headless)
+                if self.browser is not self.parent.browser:
+                    self.playwright = self.parent.playwright
+                    self.browser = self.parent.browser
+                    self.browser.on("disconnected", lambda browser: self._on_disconnected())
+                    self._update_snapshot(browser_open=True, shared_browser=self.parent.snapshot["shared_browser"])
+            else:
+                await self._ensure_launched(headless)
 
-                # Set default download path
-                downloads_path = Path("downloads")
-                downloads_path.mkdir(exist_ok=True)
+            if not self.context:
+                har_mode = config.get("browser.har.mode")
+                har_path = Path(config.get("browser.har.path", "sessions/suno.har"))
+                context_options: Dict[str, Any] = {
+                    "viewport": {"width": 1920, "height": 1080},
+                    "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+                    "accept_downloads": True,
+                }
+
+                if har_mode == "record":
+                    # Written when the context closes (see close())
+                    har_path.parent.mkdir(parents=True, exist_ok=True)
+                    context_options["record_har_path"] = str(har_path)
+                    context_options["record_har_mode"] = "full"
+                elif har_mode == "replay" and not har_path.exists():
+                    raise BrowserError(f"HAR archive not found: {har_path}", "HAR_NOT_FOUND")
+
+                if self.storage_state and self.storage_state.exists():
+                    # Reuse the cookies of an earlier login
+                    context_options["storage_state"] = str(self.storage_state)
+
+                self.context = await self.browser.new_context(**context_options)
+
+                if har_mode == "replay":
+                    # Serve every request from the archive; unknown requests
+                    # abort by default so runs stay network-free
+                    await self.context.route_from_har(
+                        str(har_path),
+                        not_found=config.get("browser.har.not_found", "abort"),
+                    )
+                    self.logger.info("Replaying network traffic from %s", har_path)
+                elif har_mode == "record":
+                    self.logger.info("Recording network traffic to %s", har_path)
+
+                # Push track status changes from the page into the tracker
+                await self.tracker.install(self.context)
+                self._watch_context(self.context)
+                self._update_snapshot(context_ready=True)
 
             if not self.page:
                 self.page = await self.context.new_page()
-                self.page.set_default_timeout(30000)
-                self.page.set_default_navigation_timeout(30000)
 
-                # Handle downloads
-                self.page.on("download", lambda download: self._handle_download(download))
+                # Route every download to exactly one destination
+                self.downloads.attach(self.page)
+                self._watch_page(self.page)
+                self._update_snapshot(page_ready=True, pages_open=len(self.context.pages))
 
+            # Defaults govern every action without an explicit timeout; keep them current
+            timeouts.apply(self.page)
             return {
                 "playwright": self.playwright,
                 "browser": self.browser,
@@ -101,24 +288,12 @@ class BrowserManager:
                 "page": self.page,
             }
         except Exception as e:
-            self.logger.error(f"Failed to initialize browser: {e}")
+            self.logger.error("Failed to initialize browser: %s", e)
+            self.record_error(e)
+            if isinstance(e, BrowserError):
+                raise
             raise BrowserError(f"Browser initialization failed: {str(e)}", "BROWSER_INIT_ERROR")
 
-    async def _handle_download(self, download) -> None:
-        """Handle file downloads."""
-        try:
-            downloads_path = Path("downloads")
-            downloads_path.mkdir(exist_ok=True)
-
-            filename = download.suggested_filename
-            filepath = downloads_path / filename
-
-            await download.save_as(str(filepath))
-            self.logger.info(f"Downloaded file: {filepath}")
-
-        except Exception as e:
-            self.logger.error(f"Download failed: {e}")
-
     async def close(self) -> None:
         """Close browser and cleanup resources."""
         try:
@@ -128,52 +303,64 @@ class BrowserManager:
             if self.context:
                 await self.context.close()
                 self.context = None
+            if self.parent:
+                # The browser belongs to the parent; only our context is closed
+                self.browser = None
+                self.playwright = None
             if self.browser:
+                # For a shared browser this only disconnects; the server and
+                # other processes' contexts keep running
                 await self.browser.close()
                 self.browser = None
             if self.playwright:
                 await self.playwright.stop()
                 self.playwright = None
 
+            self.snapshot = self._closed_snapshot()
             self.logger.info("Browser session closed successfully")
 
         except Exception as e:
-            self.logger.error(f"Error closing browser: {e}")
+            self.logger.error("Error closing browser: %s", e)
             raise BrowserError(f"Browser cleanup failed: {str(e)}", "BROWSER_CLOSE_ERROR")
 
+    async def save_storage_state(self) -> None:
+        """Persist the context's cookies so the next session starts logged in."""
+        if self.context and self.storage_state:
+            self.storage_state.parent.mkdir(parents=True, exist_ok=True)
+            await self.context.storage_state(path=str(self.storage_state))
+
+    def _on_disconnected(self) -> None:
+        """Forget browser objects when the browser goes away underneath us."""
+        self.browser = None
+        self.context = None
+        self.page = None
+        last_error = self.snapshot.get("last_error")
+        self.snapshot = self._closed_snapshot()
+        self._update_snapshot(last_error=last_error)
+
     async def get_status(self) -> Dict[str, Any]:
-        """Get current browser status."""
-        try:
-            status = {
-                "browser_open": self.browser is not None,
-                "context_ready": self.context is not None,
-                "page_ready": self.page is not None,
-                "current_url": None,
-                "page_title": None,
-                "in_studio": False,
-            }
+        """Get current browser status from the event-updated snapshot.
 
-            if self.page:
-                try:
-                    status["current_url"] = self.page.url
-                    status["page_title"] = await self.page.title()
-                    status["in_studio"] = "/studio" in (self.page.url or "")
-                except Exception:
-                    pass  # Page might be closed or unavailable
+        Never touches the browser, so it is safe to call on every probe.
+        """
+        return dict(self.snapshot)
 
+    async def deep_check(self) -> Dict[str, Any]:
+        """Do a real browser round trip and refresh the snapshot with it."""
+        status = dict(self.snapshot, responsive=False, latency_ms=None)
+        if not self.page:
             return status
 
+        started = time.perf_counter()
+        try:
+            title = await self.page.title()
+            self._update_snapshot(page_title=title, current_url=self.page.url)
+            status.update(self.snapshot, responsive=True)
         except Exception as e:
-            self.logger.error(f"Status check failed: {e}")
-            return {
-                "browser_open": False,
-                "context_ready": False,
-                "page_ready": False,
-                "current_url": None,
-                "page_title": None,
-                "in_studio": False,
-                "error": str(e),
-            }
+            self.record_error(e)
+            status.update(self.snapshot)
+        status["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return status
 
 
 class ConfigManager:
@@ -185,22 +372,111 @@ class ConfigManager:
                 "headless": True,
                 "default_viewport": {"width": 1920, "height": 1080},
                 "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+                "form_driver": "batched",  # "batched" (one in-page script) or "per_field"
+                "server": {
+                    "endpoint": None,  # Shared browser to connect to; None launches one in-process
+                    "protocol": "cdp",  # "cdp" (suno-mcp-browser) or "playwright" (run-server)
+                    "state_file": "sessions/browser-server.json",
+                    "port": 9222,
+                },
+                "har": {
+                    "mode": None,  # None, "record" or "replay"
+                    "path": "sessions/suno.har",
+                    "not_found": "abort",  # replay: "abort" stays offline, "fallback" hits the network
+                },
             },
             "timeouts": {
+                # Defaults in ms, used until a step has enough observations
                 "navigation": 30000,
                 "element": 10000,
                 "page_load": 60000,
+                "selector": 2000,
+                "login_redirect": 10000,
+                "generation_indicator": 5000,
+                "adaptive": {
+                    "enabled": True,
+                    "percentile": 99,
+                    "headroom": 1.5,  # Timeout = percentile latency x headroom
+                    "min_samples": 10,
+                    "bounds": {
+                        "selector": [500, 10000],
+                        "element": [1000, 30000],
+                        "navigation": [5000, 90000],
+                        "page_load": [10000, 120000],
+                        "login_redirect": [3000, 30000],
+                        "generation_indicator": [1000, 15000],
+                    },
+                },
             },
             "paths": {
                 "downloads": "downloads/",
                 "temp": "temp/",
                 "exports": "exports/",
+                "library_index": "library.db",
+            },
+            "library": {
+                "scroll_timeout": 5.0,  # Seconds to wait for more tracks after each scroll
+                "idle_scrolls": 3,  # Consecutive scrolls with nothing new that end a sync
+            },
+            "analysis": {
+                "enabled": False,  # Write a JSON sidecar for each downloaded WAV (needs NumPy)
+                "workers": 2,
+                "waveform_peaks": 800,
+                "chunk_frames": 262144,  # Frames per vectorized chunk; bounds memory use
             },
             "suno": {
                 "base_url": "https://app.suno.ai",
                 "studio_url": "https://studio.suno.ai",
                 "api_timeout": 120000,
             },
+            "accounts": {
+                "credentials_file": None,  # JSON list of {name, email, password, credits}
+                "sessions_dir": "sessions/accounts",
+                "max_in_flight": 1,  # Jobs per account; each account drives one page
+                "rate_limit_cooldown": 300,  # Seconds an account rests after a rate limit
+                "credits_cooldown": 3600,  # Seconds an account rests after running out of credits
+                "acquire_timeout": 600,  # Seconds to wait for a free account
+            },
+            "scheduler": {
+                "concurrency": 1,
+                "generation_cost": 10,  # Credits per generation (two clips)
+                "client_weights": {},  # client_id -> share within a priority class
+                "credit_budgets": {},  # account -> remaining credits (unset = unlimited)
+                "max_deferral": 300,  # Seconds a job waits for credits before INSUFFICIENT_CREDITS
+            },
+            "resilience": {
+                "enabled": True,
+                "attempts": 3,  # Tries per call, including the first
+                "base_delay": 0.5,  # Seconds; backoff doubles per retry, with full jitter
+                "max_delay": 8.0,
+                "failure_threshold": 5,  # Consecutive transient failures that open a breaker
+                "reset_timeout": 30.0,  # Seconds an open breaker fails fast before probing
+                "operations": {
+                    "login": {"attempts": 2},
+                    "generate": {"attempts": 2},  # Failures after the form may have been submitted are not retried
+                    "download": {"attempts": 3},
+                },
+            },
+            "webhooks": {
+                "queue_path": "webhooks.db",  # SQLite outbox; pending events survive restarts
+                "secret": None,  # HMAC-SHA256 signing key (or SUNO_WEBHOOK_SECRET)
+                "batch_size": 50,  # Events per POST to one endpoint
+                "batch_window": 0.2,  # Seconds to gather events before posting
+                "max_connections": 20,
+                "timeout": 10.0,
+                "max_attempts": 8,
+                "base_delay": 1.0,  # Seconds; retry delay doubles per attempt, with jitter
+                "max_delay": 300.0,
+                "generation_timeout": 900,  # Seconds to wait for tracks before generation.failed
+            },
+            "logging": {
+                "level": "INFO",
+                "json": True,  # One JSON object per line; False uses "format"
+                "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+                "file": None,  # Also write to this file
+                "queue_size": 10000,  # Records buffered for the writer thread; overflow is dropped
+                "debug_sample_every": 10,  # Keep 1 in N DEBUG records per call site
+            },
             "security": {
                 "max_concurrent_sessions": 3,
                 "session_timeout": 3600000,  # 1 hour
@@ -239,3 +515,9 @@ class ConfigManager:
 
 # Global config instance
 config = ConfigManager()
+
+# Global timeout controller, fed by every instrumented browser step
+timeouts = TimeoutController(config)
+
+# Global retry policy and circuit breakers for Suno operations
+resilience = Resilience(config)
@@ -0,0 +1,263 @@
+"""Completion callbacks delivered from a persistent, batched outbound queue."""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import os
+import random
+import sqlite3
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from .exceptions import SunoError
+from .metrics import metrics
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS deliveries (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    url          TEXT NOT NULL,
+    event        TEXT NOT NULL,
+    created_at   REAL NOT NULL,
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL,
+    status       TEXT NOT NULL DEFAULT 'pending',
+    last_error   TEXT
+);
+CREATE INDEX IF NOT EXISTS deliveries_due ON deliveries (status, next_attempt);
+"""
+
+SIGNATURE_HEADER = "X-Suno-Signature"
+TIMESTAMP_HEADER = "X-Suno-Timestamp"
+DELIVERY_HEADER = "X-Suno-Delivery"
+
+
+def validate_callback_url(url: str) -> str:
+    """Reject callback URLs that httpx cannot send to or that are not absolute http(s)."""
+    try:
+        parsed = httpx.URL(url)
+    except Exception as e:
+        raise SunoError(f"Invalid callback URL {url!r}: {e}", "INVALID_CALLBACK_URL") from e
+    if parsed.scheme not in ("http", "https") or not parsed.host:
+        raise SunoError(f"Invalid callback URL: {url!r}", "INVALID_CALLBACK_URL")
+    return url
+
+
+def sign(secret: str, timestamp: str, body: bytes) -> str:
+    """HMAC-SHA256 over ``"<timestamp>.<body>"``, as sent in X-Suno-Signature."""
+    digest = hmac.new(secret.encode("utf-8"), timestamp.encode("ascii") + b"." + body, hashlib.sha256)
+    return f"sha256={digest.hexdigest()}"
+
+
+class WebhookDispatcher:
+    """Delivers completion events to callback URLs.
+
+    Events are written to SQLite before anything is sent, so pending
+    deliveries survive a restart. A single worker drains the queue: due
+    events are grouped by endpoint and posted in batches over one pooled
+    HTTP client, each batch signed with HMAC-SHA256. Failed batches are
+    retried with jittered exponential backoff until ``max_attempts``,
+    after which their events are kept as dead letters.
+    """
+
+    def __init__(self, config: Any, transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        self.config = config
+        self.transport = transport
+        self.path = Path(config.get("webhooks.queue_path", "webhooks.db"))
+        self._conn: Optional[sqlite3.Connection] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Open the queue database on first use."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path))
+            self._conn.row_factory = sqlite3.Row
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    @property
+    def secret(self) -> Optional[str]:
+        """Signing secret; the environment wins over the config file."""
+        return os.environ.get("SUNO_WEBHOOK_SECRET") or self.config.get("webhooks.secret")
+
+    def start(self) -> None:
+        """Start the delivery worker (also resumes deliveries left by a previous run)."""
+        if self._worker is None or self._worker.done():
+            self._wake = asyncio.Event()
+            self._worker = asyncio.create_task(self._run())
+
+    def enqueue(self, url: str, event_type: str, data: Dict[str, Any]) -> str:
+        """Persist an event for delivery and wake the worker; returns the event ID."""
+        validate_callback_url(url)
+        now = time.time()
+        event = {"id": uuid.uuid4().hex, "type": event_type, "created_at": now, "data": data}
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO deliveries (url, event, created_at, next_attempt) VALUES (?, ?, ?, ?)",
+                (url, json.dumps(event, default=str), now, now),
+            )
+        metrics.increment("webhooks.enqueued")
+        self.start()
+        self._wake.set()
+        return event["id"]
+
+    def _due(self, now: float) -> Dict[str, List[sqlite3.Row]]:
+        """Pending events whose retry time has come, grouped by endpoint."""
+        rows = self.conn.execute(
+            "SELECT * FROM deliveries WHERE status = 'pending' AND next_attempt <= ? ORDER BY id LIMIT ?",
+            (now, self.config.get("webhooks.max_pending_scan", 1000)),
+        ).fetchall()
+        batch_size = self.config.get("webhooks.batch_size", 50)
+        by_url: Dict[str, List[sqlite3.Row]] = defaultdict(list)
+        for row in rows:
+            if len(by_url[row["url"]]) < batch_size:
+                by_url[row["url"]].append(row)
+        return by_url
+
+    def _next_due_in(self) -> Optional[float]:
+        """Seconds until the next pending retry, or None if nothing is pending."""
+        row = self.conn.execute("SELECT MIN(next_attempt) FROM deliveries WHERE status = 'pending'").fetchone()
+        return None if row[0] is None else max(0.0, row[0] - time.time())
+
+    async def _run(self) -> None:
+        """Deliver due batches until cancelled."""
+        limits = httpx.Limits(
+            max_connections=self.config.get("webhooks.max_connections", 20),
+            max_keepalive_connections=self.config.get("webhooks.max_connections", 20),
+        )
+        self._client = httpx.AsyncClient(
+            limits=limits, timeout=self.config.get("webhooks.timeout", 10.0), transport=self.transport
+        )
+        try:
+            while True:
+                # Give concurrent completions a moment to land in the same batch
+                await asyncio.sleep(self.config.get("webhooks.batch_window", 0.2))
+                self._wake.clear()
+                batches = self._due(time.time())
+                if batches:
+                    results = await asyncio.gather(
+                        *(self._deliver(url, rows) for url, rows in batches.items()), return_exceptions=True
+                    )
+                    for error in results:
+                        if isinstance(error, Exception):
+                            # Never let one endpoint's failure stop delivery to the others
+                            self.logger.error("Webhook delivery error: %s", error, exc_info=error)
+                    continue
+
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self._next_due_in())
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await self._client.aclose()
+            self._client = None
+
+    async def _deliver(self, url: str, rows: List[sqlite3.Row]) -> None:
+        """POST one batch of events to an endpoint and record the outcome."""
+        body = json.dumps(
+            {"events": [json.loads(row["event"]) for row in rows]}, separators=(",", ":")
+        ).encode("utf-8")
+        timestamp = str(int(time.time()))
+        headers = {
+            "Content-Type": "application/json",
+            "User-Agent": "suno-mcp-webhooks",
+            TIMESTAMP_HEADER: timestamp,
+            DELIVERY_HEADER: uuid.uuid4().hex,
+        }
+        if self.secret:
+            headers[SIGNATURE_HEADER] = sign(self.secret, timestamp, body)
+
+        started = time.perf_counter()
+        try:
+            response = await self._client.post(url, content=body, headers=headers)
+            error = None if response.is_success else f"HTTP {response.status_code}"
+            # Client errors other than timeouts and throttling will not heal by retrying
+            permanent = 400 <= response.status_code < 500 and response.status_code not in (408, 429)
+        except httpx.HTTPError as e:
+            error, permanent = f"{type(e).__name__}: {e}", False
+        except Exception as e:
+            # Not a network failure (e.g. a URL httpx refuses); retrying cannot help,
+            # and letting it escape would kill the worker on every restart
+            error, permanent = f"{type(e).__name__}: {e}", True
+        metrics.observe("webhooks.request_ms", (time.perf_counter() - started) * 1000)
+
+        if error is None:
+            now = time.time()
+            for row in rows:
+                metrics.observe("webhooks.delivery_ms", (now - row["created_at"]) * 1000)
+            metrics.increment("webhooks.delivered", len(rows))
+            with self.conn:
+                self.conn.executemany("DELETE FROM deliveries WHERE id = ?", [(row["id"],) for row in rows])
+            return
+
+        metrics.increment("webhooks.failed_requests")
+        self.logger.warning("Webhook delivery of %s events to %s failed: %s", len(rows), url, error)
+        max_attempts = self.config.get("webhooks.max_attempts", 8)
+        base = self.config.get("webhooks.base_delay", 1.0)
+        cap = self.config.get("webhooks.max_delay", 300.0)
+        dead, retry = [], []
+        for row in rows:
+            # Rows in one batch may have been tried a different number of times
+            attempts = row["attempts"] + 1
+            if permanent or attempts >= max_attempts:
+                dead.append((attempts, error, row["id"]))
+            else:
+                next_attempt = time.time() + random.uniform(base, min(cap, base * 2 ** attempts))
+                retry.append((attempts, next_attempt, error, row["id"]))
+
+        with self.conn:
+            if dead:
+                self.conn.executemany(
+                    "UPDATE deliveries SET status = 'dead', attempts = ?, last_error = ? WHERE id = ?", dead
+                )
+            if retry:
+                self.conn.executemany(
+                    "UPDATE deliveries SET attempts = ?, next_attempt = ?, last_error = ? WHERE id = ?", retry
+                )
+        if dead:
+            metrics.increment("webhooks.dead", len(dead))
+
+    def status(self) -> Dict[str, Any]:
+        """Queue depth per endpoint, dead letters and delivery metrics."""
+        endpoints: Dict[str, Dict[str, Any]] = {}
+        if self._conn is not None or self.path.exists():
+            for row in self.conn.execute(
+                "SELECT url, status, COUNT(*) AS events, MAX(attempts) AS attempts, "
+                "MAX(last_error) AS last_error FROM deliveries GROUP BY url, status"
+            ):
+                entry = endpoints.setdefault(row["url"], {"pending": 0, "dead": 0, "last_error": None})
+                entry[row["status"]] = row["events"]
+                entry["last_error"] = entry["last_error"] or row["last_error"]
+        return {
+            "running": self._worker is not None and not self._worker.done(),
+            "signed": bool(self.secret),
+            "endpoints": endpoints,
+            "delivered": metrics.counter("webhooks.delivered"),
+            "dead": metrics.counter("webhooks.dead"),
+            "delivery_ms": metrics.summary("webhooks.delivery_ms"),
+            "request_ms": metrics.summary("webhooks.request_ms"),
+        }
+
+    async def close(self) -> None:
+        """Stop the worker; undelivered events stay queued for the next run."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,5 @@
+"""Suno Studio tools for stem generation."""
+
+from .tools import StudioTools
+
+__all__ = ["StudioTools"]
@@ -0,0 +1,308 @@
+"""Suno Studio tools for stem generation."""
+
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+from urllib.parse import urlparse
+
+from playwright.async_api import Page
+
+from ..basic.tools import elapsed_ms
+from ..shared.downloads import DownloadStore
+from ..shared.exceptions import GenerationError, StudioError, SunoError
+from ..shared.metrics import metrics
+from ..shared.models import (
+    CompletionResult,
+    FileInfo,
+    StemItem,
+    StemRequest,
+    StemSetResult,
+    StemSubmission,
+    track_info,
+)
+from ..shared.utils import (
+    BrowserManager,
+    SelectorHelper,
+    config,
+    navigate,
+    timeouts,
+    wait_for_load,
+)
+
+# How long to keep collecting clip IDs after the first one shows up;
+# one generation request usually yields two clips
+ID_SETTLE_SECONDS = 1.5
+
+
+class StudioTools:
+    """Suno Studio stem generation, pipelined over the track tracker.
+
+    Submitting a stem only fills and clicks the generate form, so stems are
+    submitted back to back. Each stem's clips are then awaited concurrently
+    through the push-based tracker and downloaded as soon as they complete,
+    so a full stem set takes about as long as its slowest stem.
+    """
+
+    def __init__(self, browser_manager: BrowserManager) -> None:
+        self.browser_manager = browser_manager
+        self.page: Optional[Page] = None
+        # The generate form is one piece of UI; submissions take turns
+        self._form_lock = asyncio.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    async def _studio_page(self) -> Page:
+        """Open Suno Studio in its own tab of the session's context."""
+        components = await self.browser_manager.ensure_browser()
+        if self.page is None or self.page.is_closed():
+            self.page = await components["context"].new_page()
+            self.browser_manager.downloads.attach(self.page)
+        timeouts.apply(self.page)
+
+        if "/studio" not in (self.page.url or "") and "studio." not in (self.page.url or ""):
+            await navigate(self.page, config.get("suno.studio_url", "https://studio.suno.ai"), wait_until="domcontentloaded")
+            await wait_for_load(self.page, "networkidle")
+        return self.page
+
+    async def _await_new_ids(self, known_ids: Set[str], timeout: float) -> List[str]:
+        """Collect the clip IDs the tracker reports after a submission."""
+        tracker = self.browser_manager.tracker
+        queue = tracker.subscribe()
+        try:
+            new_ids = set(tracker.known_ids() - known_ids)
+            deadline = time.monotonic() + timeout
+            while True:
+                if new_ids:
+                    # Give the sibling clip of the same request a moment to appear
+                    deadline = min(deadline, time.monotonic() + ID_SETTLE_SECONDS)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    update = await asyncio.wait_for(queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                if update["track_id"] not in known_ids:
+                    new_ids.add(update["track_id"])
+            return sorted(new_ids)
+        finally:
+            tracker.unsubscribe(queue)
+
+    async def _submit(self, stem: StemRequest) -> List[str]:
+        """Fill and submit the stem form; returns the new generation IDs."""
+        async with self._form_lock:
+            page = await self._studio_page()
+
+            # Open the generate panel (may already be open)
+            await SelectorHelper.try_selectors(page, [
+                'button:has-text("Generate")',
+                'button:has-text("Add Stem")',
+                '[data-testid="generate-stem-button"]',
+                '.generate-stem',
+            ], "click")
+
+            # Choose the stem type
+            type_selected = await SelectorHelper.try_selectors(
+                page, ['select[name="stemType"]', 'select[data-testid="stem-type-select"]'], "select", value=stem.stem_type
+            )
+            if not type_selected:
+                await SelectorHelper.try_selectors(page, [
+                    f'button:has-text("{stem.stem_type}")',
+                    f'[data-stem-type="{stem.stem_type}"]',
+                ], "click")
+
+            prompt_filled = await SelectorHelper.try_selectors(page, [
+                'textarea[placeholder*="Describe" i]',
+                'textarea[placeholder*="prompt" i]',
+                'textarea[name="prompt"]',
+                '[data-testid="stem-prompt-input"]',
+            ], "fill", value=stem.prompt)
+            if not prompt_filled:
+                raise StudioError("Could not find the stem prompt field", "STEM_FORM_ERROR")
+
+            if stem.style:
+                await SelectorHelper.try_selectors(page, [
+                    'input[placeholder*="style" i]',
+                    'input[name="style"]',
+                    '[data-testid="stem-style-input"]',
+                ], "fill", value=stem.style)
+            if stem.duration:
+                await SelectorHelper.try_selectors(page, [
+                    'input[name="duration"]',
+                    '[data-testid="stem-duration-input"]',
+                ], "fill", value=str(stem.duration))
+            await SelectorHelper.try_selectors(page, [
+                'input[name="position"]',
+                '[data-testid="stem-position-input"]',
+            ], "fill", value=str(stem.position))
+
+            known_ids = self.browser_manager.tracker.known_ids()
+            submitted = await SelectorHelper.try_selectors(page, [
+                'button:has-text("Create")',
+                'button[type="submit"]',
+                '[data-testid="submit-stem-button"]',
+            ], "click")
+            if not submitted:
+                raise StudioError("Could not find the stem generate button", "STEM_FORM_ERROR")
+
+            return await self._await_new_ids(known_ids, timeout=15)
+
+    async def generate_stem(
+        self,
+        prompt: str,
+        stem_type: str = "instrumental",
+        position: float = 0.0,
+        duration: Optional[float] = None,
+        style: Optional[str] = None,
+    ) -> StemSubmission:
+        """Submit one stem generation without waiting for it to finish."""
+        started = time.perf_counter()
+        try:
+            stem = StemRequest(prompt=prompt, stem_type=stem_type, position=position, duration=duration, style=style)
+            generation_ids = await self._submit(stem)
+            return StemSubmission(
+                status="started" if generation_ids else "submitted",
+                stem_type=stem_type,
+                prompt=prompt,
+                generation_ids=generation_ids,
+                elapsed_ms=elapsed_ms(started),
+            )
+        except Exception as e:
+            self.browser_manager.record_error(e)
+            if isinstance(e, SunoError):
+                raise
+            self.logger.error("Stem generation failed: %s", e)
+            raise StudioError(f"Stem generation failed: {str(e)}", "STEM_ERROR") from e
+
+    async def wait_generation(self, generation_id: str, timeout: float = 300) -> CompletionResult:
+        """Wait for one stem generation to complete."""
+        tracker = self.browser_manager.tracker
+        started = time.perf_counter()
+        try:
+            track = await tracker.wait_for(generation_id, timeout)
+        except asyncio.TimeoutError:
+            status = (tracker.get(generation_id) or {}).get("status", "unknown")
+            raise StudioError(f"Timed out after {timeout}s waiting for {generation_id} ({status})", "WAIT_TIMEOUT") from None
+        if track["status"] == "failed":
+            raise GenerationError(f"Generation failed for: {generation_id}", "GENERATION_FAILED")
+
+        waited_ms = elapsed_ms(started)
+        return CompletionResult(tracks=[track_info(track)], waited_s=waited_ms / 1000, elapsed_ms=waited_ms)
+
+    async def _fetch_audio(self, track: Dict[str, Any], destination: Path, filename_prefix: str) -> FileInfo:
+        """Download a finished clip's audio through the session's cookies."""
+        audio_url = track.get("audio_url")
+        if not audio_url:
+            raise StudioError(f"No audio URL reported for {track['track_id']}", "STEM_DOWNLOAD_ERROR")
+
+        suffix = Path(urlparse(audio_url).path).suffix or ".mp3"
+        filename = f"{filename_prefix}-{track['track_id']}{suffix}"
+        try:
+            saved = await self.browser_manager.downloads.fetch(
+                self.browser_manager.context, audio_url, destination, filename
+            )
+        except SunoError as e:
+            raise StudioError(str(e), "STEM_DOWNLOAD_ERROR") from e
+        return FileInfo(path=str(saved["path"]), filename=filename, bytes=saved["bytes"], kind="stem")
+
+    async def _finish_stem(
+        self,
+        index: int,
+        stem: StemRequest,
+        generation_ids: List[str],
+        destination: Path,
+        timeout: float,
+        started: float,
+        store: DownloadStore,
+    ) -> StemItem:
+        """Wait for a stem's clips and download each one the moment it completes."""
+        tracker = self.browser_manager.tracker
+        prefix = f"{index + 1:02d}-{stem.stem_type}"
+
+        async def complete_one(generation_id: str) -> FileInfo:
+            track = await tracker.wait_for(generation_id, timeout)
+            if track["status"] == "failed":
+                raise GenerationError(f"Generation failed for: {generation_id}", "GENERATION_FAILED")
+            file = await self._fetch_audio(track, destination, prefix)
+            store.record(generation_id, [file.model_dump()])
+            return file
+
+        item = StemItem(stem_type=stem.stem_type, prompt=stem.prompt, status="complete", generation_ids=generation_ids)
+        try:
+            if not generation_ids:
+                raise StudioError("Studio reported no generation for this stem", "STEM_ERROR")
+            item.files = list(await asyncio.gather(*(complete_one(gid) for gid in generation_ids)))
+        except asyncio.TimeoutError:
+            item.status = "failed"
+            item.error = f"Timed out after {timeout}s"
+        except Exception as e:
+            item.status = "failed"
+            item.error = str(e)
+
+        item.elapsed_ms = elapsed_ms(started)
+        metrics.observe("studio.stem_ms", item.elapsed_ms)
+        return item
+
+    async def generate_multiple_stems(
+        self,
+        stems: List[StemRequest],
+        download_path: str = "downloads/stems/",
+        timeout: float = 600,
+        schedule: Optional[Callable[[Callable[[], Awaitable[None]]], Awaitable[Any]]] = None,
+    ) -> StemSetResult:
+        """Generate a set of stems as a pipeline: submit all, then finish each as it completes.
+
+        ``schedule``, if given, runs the submission phase (the only part that
+        drives the Studio form), e.g. in a job scheduler slot. Waiting for
+        the stems and downloading them happen outside it.
+        """
+        if not stems:
+            raise StudioError("No stems requested", "STEM_ERROR")
+
+        started = time.perf_counter()
+        destination = Path(download_path)
+        store = DownloadStore.for_directory(download_path)
+        # Stems that failed to submit get their item right away; the rest
+        # are finished by a task per stem, filled in by index once done
+        items: List[Optional[StemItem]] = [None] * len(stems)
+        finishing: Dict[int, asyncio.Task] = {}
+
+        async def submit_all() -> None:
+            for index, stem in enumerate(stems):
+                stem_started = time.perf_counter()
+                try:
+                    generation_ids = await self._submit(stem)
+                except Exception as e:
+                    self.browser_manager.record_error(e)
+                    self.logger.error("Submitting %s stem failed: %s", stem.stem_type, e)
+                    items[index] = StemItem(stem_type=stem.stem_type, prompt=stem.prompt, status="failed", error=str(e))
+                    continue
+
+                # Earlier stems keep generating and downloading while we submit the rest
+                finishing[index] = asyncio.create_task(
+                    self._finish_stem(index, stem, generation_ids, destination, timeout, stem_started, store)
+                )
+
+        try:
+            if schedule is None:
+                await submit_all()
+            else:
+                await schedule(submit_all)
+            finished = await asyncio.gather(*finishing.values())
+        except BaseException:
+            # Submission failed or we were cancelled: don't leave stems running
+            for task in finishing.values():
+                task.cancel()
+            await asyncio.gather(*finishing.values(), return_exceptions=True)
+            raise
+        for index, item in zip(finishing, finished, strict=True):
+            items[index] = item
+
+        results = [item for item in items if item is not None]
+        return StemSetResult(
+            status="ok" if all(item.status == "complete" for item in results) else "partial",
+            download_path=str(destination),
+            items=results,
+            elapsed_ms=elapsed_ms(started),
+        )
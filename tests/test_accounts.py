@@ -0,0 +1,116 @@
+"""Tests for the account pool's shared browser and failure handling."""
+
+import asyncio
+
+import pytest
+
+from suno_mcp import server
+from suno_mcp.loadtest import FakeSunoTools
+from suno_mcp.tools.basic.accounts import AccountPool
+from suno_mcp.tools.basic.tools import BasicSunoTools
+from suno_mcp.tools.shared import utils
+from suno_mcp.tools.shared.exceptions import SunoError
+from suno_mcp.tools.shared.scheduler import CreditBudget
+from suno_mcp.tools.shared.utils import BrowserManager
+
+
+class FakeBrowser:
+    def on(self, event, handler):
+        pass
+
+
+class FakeChromium:
+    def __init__(self):
+        self.launches = 0
+
+    async def launch(self, **kwargs):
+        self.launches += 1
+        await asyncio.sleep(0.01)
+        return FakeBrowser()
+
+
+class FakePlaywright:
+    def __init__(self, chromium):
+        self.chromium = chromium
+
+    async def start(self):
+        await asyncio.sleep(0.01)
+        return self
+
+
+@pytest.mark.asyncio
+async def test_parent_browser_is_launched_once_under_concurrency(monkeypatch):
+    chromium = FakeChromium()
+    monkeypatch.setattr(utils, "async_playwright", lambda: FakePlaywright(chromium))
+    parent = BrowserManager()
+
+    await asyncio.gather(*(parent._ensure_launched(True) for _ in range(5)))
+    assert chromium.launches == 1
+
+
+class NoticePage:
+    def __init__(self, notices):
+        self.notices = notices
+
+    async def evaluate(self, script):
+        return self.notices
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("notice, code", [
+    ("You're out of credits. Upgrade to keep creating.", "INSUFFICIENT_CREDITS"),
+    ("Too many requests, please slow down", "RATE_LIMITED"),
+])
+async def test_page_notices_raise_matching_codes(tmp_path, monkeypatch, notice, code):
+    monkeypatch.setitem(utils.config.config["paths"], "library_index", str(tmp_path / "library.db"))
+    tools = BasicSunoTools(BrowserManager())
+    with pytest.raises(SunoError) as excinfo:
+        await tools._raise_for_page_notice(NoticePage(["Saved", notice]))
+    assert excinfo.value.code == code
+
+
+@pytest.mark.asyncio
+async def test_unrelated_page_notices_are_ignored(tmp_path, monkeypatch):
+    monkeypatch.setitem(utils.config.config["paths"], "library_index", str(tmp_path / "library.db"))
+    tools = BasicSunoTools(BrowserManager())
+    await tools._raise_for_page_notice(NoticePage(["Song created"]))
+
+
+def test_failure_codes_cool_accounts_down(tmp_path, monkeypatch):
+    monkeypatch.setitem(utils.config.config["paths"], "library_index", str(tmp_path / "library.db"))
+    budget = CreditBudget()
+    pool = AccountPool(
+        [{"name": "a", "email": "a@example.com", "password": "x", "credits": 50}],
+        BrowserManager(),
+        budget,
+    )
+    account = pool.accounts["a"]
+
+    pool._classify_failure(account, SunoError("Suno refused the generation", "INSUFFICIENT_CREDITS"))
+    assert budget.available("a") == 0.0
+    assert account.cooling_down(account.cooldown_until - 1)
+
+
+@pytest.mark.asyncio
+async def test_pool_generation_reserves_credits_once(tmp_path, monkeypatch):
+    monkeypatch.setitem(utils.config.config["paths"], "library_index", str(tmp_path / "library.db"))
+    monkeypatch.setitem(utils.config.config["scheduler"], "generation_cost", 10)
+    budget = CreditBudget({"default": 5})
+    pool = AccountPool(
+        [{"name": "a", "email": "a@example.com", "password": "x", "credits": 50}],
+        BrowserManager(),
+        budget,
+    )
+    pool.accounts["a"].tools = FakeSunoTools(latency_ms=1)
+    pool.accounts["a"].logged_in = True
+    monkeypatch.setattr(server, "basic_tools", FakeSunoTools(latency_ms=1))
+    monkeypatch.setattr(server.scheduler, "budget", budget)
+    monkeypatch.setattr(server, "account_pool", pool)
+    concurrency = server.scheduler.concurrency
+
+    result = await asyncio.wait_for(server.registry.call("suno_generate_track", {"prompt": "test"}), 1)
+    assert result.status == "started"
+    # Charged to the pool account only; the default account could not afford it
+    assert budget.available("a") == 40
+    assert budget.available("default") == 5
+    assert server.scheduler.concurrency == concurrency
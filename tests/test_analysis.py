@@ -0,0 +1,78 @@
+"""Tests for memory-mapped WAV analysis against a plain NumPy reference."""
+
+import json
+import math
+import wave
+
+import pytest
+
+from suno_mcp.tools.shared.analysis import AudioAnalyzer, analyze_wav, sidecar_path
+
+np = pytest.importorskip("numpy")
+
+
+def write_wav(path, samples, bits, sample_rate=8000):
+    """Write integer samples (frames x channels) as little-endian PCM."""
+    if bits == 24:
+        data = samples.astype("<i4").view(np.uint8).reshape(*samples.shape, 4)[..., :3].tobytes()
+    else:
+        data = samples.astype(f"<i{bits // 8}").tobytes()
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(samples.shape[1])
+        f.setsampwidth(bits // 8)
+        f.setframerate(sample_rate)
+        f.writeframes(data)
+
+
+def reference(samples, bits, peaks):
+    """Peak, RMS and bucketed waveform computed over the whole array at once."""
+    values = samples.astype(np.float64) / float(1 << (bits - 1))
+    magnitude = np.abs(values).max(axis=1)
+    edges = np.linspace(0, len(values), min(peaks, len(values)) + 1).astype(np.int64)
+    waveform = [magnitude[a:b].max() for a, b in zip(edges[:-1], edges[1:], strict=True) if b > a]
+    return magnitude.max(), math.sqrt(np.mean(np.square(values))), waveform
+
+
+@pytest.mark.parametrize("bits", [16, 24])
+def test_chunked_analysis_matches_reference(tmp_path, bits):
+    rng = np.random.default_rng(bits)
+    full_scale = 1 << (bits - 1)
+    samples = rng.integers(-full_scale, full_scale, size=(5003, 2))
+    samples[1234, 1] = -full_scale  # Most negative sample must sign-extend correctly
+    path = tmp_path / f"tone{bits}.wav"
+    write_wav(path, samples, bits)
+
+    # Chunks that do not line up with the waveform buckets
+    result = analyze_wav(path, peaks=37, chunk_frames=1000)
+    peak, rms, waveform = reference(samples, bits, 37)
+
+    assert result["bits"] == bits
+    assert result["channels"] == 2
+    assert result["duration_s"] == round(5003 / 8000, 3)
+    assert result["peak"] == pytest.approx(peak, abs=1e-5)
+    assert result["peak_dbfs"] == pytest.approx(20 * math.log10(peak), abs=0.01)
+    assert result["rms_dbfs"] == pytest.approx(20 * math.log10(rms), abs=0.01)
+    assert result["waveform"] == pytest.approx(waveform, abs=1e-4)
+
+
+def test_silence_has_no_level(tmp_path):
+    path = tmp_path / "silence.wav"
+    write_wav(path, np.zeros((100, 1), dtype=np.int16), 16)
+    result = analyze_wav(path, peaks=10)
+    assert result["peak"] == 0.0
+    assert result["peak_dbfs"] is None
+    assert result["rms_dbfs"] is None
+    assert result["waveform"] == [0.0] * 10
+
+
+@pytest.mark.asyncio
+async def test_analyzer_writes_sidecar(tmp_path):
+    path = tmp_path / "clip.wav"
+    write_wav(path, np.full((800, 1), 1 << 14), 16)
+    analyzer = AudioAnalyzer(workers=1, peaks=4)
+    try:
+        analysis = await analyzer.analyze(path)
+    finally:
+        analyzer.shutdown()
+    assert analysis["peak"] == 0.5
+    assert json.loads(sidecar_path(path).read_text(encoding="utf-8")) == analysis
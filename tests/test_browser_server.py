@@ -0,0 +1,51 @@
+"""Tests for the shared browser lifecycle commands."""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from suno_mcp import browser_server, server
+from suno_mcp.tools.shared.exceptions import BrowserError
+
+
+def write_state(path, pid, port=9222):
+    path.write_text(json.dumps({"endpoint": f"http://127.0.0.1:{port}", "pid": pid, "port": port}))
+
+
+def test_stop_does_not_signal_an_unrelated_process(tmp_path):
+    state_file = tmp_path / "browser-server.json"
+    process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        write_state(state_file, process.pid)
+        assert browser_server.stop(str(state_file)) is False
+        assert process.poll() is None
+        assert not state_file.exists()
+    finally:
+        process.kill()
+        process.wait()
+
+
+def test_stop_clears_state_of_an_exited_browser(tmp_path):
+    state_file = tmp_path / "browser-server.json"
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    write_state(state_file, process.pid)
+
+    assert browser_server.stop(str(state_file)) is False
+    assert not state_file.exists()
+
+
+def test_start_reports_a_missing_chromium(tmp_path, monkeypatch):
+    monkeypatch.setattr(browser_server, "_chromium_executable", lambda: str(tmp_path / "no-chromium"))
+    with pytest.raises(BrowserError) as excinfo:
+        browser_server.start(9, user_data_dir=str(tmp_path), state_file=str(tmp_path / "browser-server.json"))
+    assert excinfo.value.code == "BROWSER_SERVER_START_ERROR"
+    assert "playwright install chromium" in str(excinfo.value)
+
+
+def test_server_startup_without_shared_browser_fails_cleanly(monkeypatch, caplog):
+    monkeypatch.setattr(browser_server, "read_state", lambda state_file=None: None)
+    assert server.startup(server.parse_args(["--browser-endpoint", "auto"])) is False
+    assert "No shared browser is running" in caplog.text
@@ -0,0 +1,71 @@
+"""Tests for the download manifest and the download streaming endpoint."""
+
+import json
+
+import httpx
+import pytest
+
+from suno_mcp import server
+from suno_mcp.tools.shared.downloads import DownloadStore
+from suno_mcp.tools.shared.utils import config
+
+
+def saved(tmp_path, name):
+    path = tmp_path / name
+    path.write_bytes(b"audio")
+    return {"path": path, "filename": name, "bytes": 5}
+
+
+def test_stores_for_one_directory_are_shared(tmp_path):
+    assert DownloadStore.for_directory(str(tmp_path)) is DownloadStore.for_directory(str(tmp_path / "."))
+
+
+def test_stale_stores_merge_instead_of_overwriting(tmp_path):
+    first = DownloadStore(str(tmp_path))
+    second = DownloadStore(str(tmp_path))
+
+    first.record("a", [saved(tmp_path, "a.mp3")])
+    second.record("b", [saved(tmp_path, "b.mp3")])
+
+    manifest = json.loads((tmp_path / DownloadStore.MANIFEST_NAME).read_text(encoding="utf-8"))
+    assert set(manifest) == {"a", "b"}
+    assert second.is_downloaded("a")
+
+
+@pytest.fixture
+def download_client(tmp_path, monkeypatch):
+    """The FastAPI app serving a download root with one recorded track."""
+    monkeypatch.setitem(config.config["paths"], "downloads", str(tmp_path))
+    path = tmp_path / "t1.mp3"
+    path.write_bytes(bytes(range(100)))
+    DownloadStore(str(tmp_path)).record("t1", [{"path": path, "filename": "t1.mp3", "bytes": 100}])
+    transport = httpx.ASGITransport(app=server.fastapi_app)
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_stream_download_serves_byte_ranges(download_client):
+    async with download_client as client:
+        response = await client.get("/api/v1/downloads/t1/t1.mp3", headers={"Range": "bytes=10-19"})
+    assert response.status_code == 206
+    assert response.headers["content-range"] == "bytes 10-19/100"
+    assert response.content == bytes(range(10, 20))
+
+
+@pytest.mark.asyncio
+async def test_stream_download_honours_if_none_match(download_client):
+    async with download_client as client:
+        etag = (await client.get("/api/v1/downloads/t1/t1.mp3")).headers["etag"]
+        response = await client.get("/api/v1/downloads/t1/t1.mp3", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+
+@pytest.mark.asyncio
+async def test_stream_download_rejects_directories_outside_the_root(download_client):
+    async with download_client as client:
+        response = await client.get("/api/v1/downloads/t1/t1.mp3", params={"directory": "../.."})
+        listing = await client.get("/api/v1/downloads", params={"directory": "/etc"})
+    assert response.status_code == 400
+    assert listing.status_code == 400
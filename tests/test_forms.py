@@ -0,0 +1,63 @@
+"""Tests for the batched create-form driver."""
+
+import pytest
+
+from suno_mcp.tools.basic.tools import BasicSunoTools
+from suno_mcp.tools.shared import utils
+from suno_mcp.tools.shared.forms import FORM_FILL_SCRIPT, fill_form
+from suno_mcp.tools.shared.utils import BrowserManager
+
+
+class FormPage:
+    """Stands in for a page; records the script arguments."""
+
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.calls = []
+
+    async def evaluate(self, script, arg=None):
+        self.calls.append((script, arg))
+        if self.error:
+            raise self.error
+        return self.result
+
+
+@pytest.fixture
+def tools(tmp_path, monkeypatch):
+    monkeypatch.setitem(utils.config.config["paths"], "library_index", str(tmp_path / "library.db"))
+    return BasicSunoTools(BrowserManager())
+
+
+@pytest.mark.asyncio
+async def test_fill_form_sends_fields_and_submit_in_one_call():
+    page = FormPage({"filled": {"prompt": "textarea"}, "submitted": "text=Create"})
+    fields = [{"name": "prompt", "selectors": ["textarea"], "value": "hi", "required": True}]
+    submit = {"texts": ["Create"], "selectors": ["button[type=submit]"]}
+
+    result = await fill_form(page, fields, submit)
+    assert result["submitted"] == "text=Create"
+    assert page.calls == [(FORM_FILL_SCRIPT, {"fields": fields, "submit": submit})]
+
+
+@pytest.mark.asyncio
+async def test_batched_form_includes_optional_fields(tools):
+    page = FormPage({"filled": {}, "submitted": "text=Create"})
+    assert await tools._submit_create_form_batched(page, "a prompt", "rock", "la la") is True
+
+    fields = page.calls[0][1]["fields"]
+    assert [f["name"] for f in fields] == ["prompt", "lyrics", "style"]
+    assert [f["required"] for f in fields] == [True, False, False]
+
+
+@pytest.mark.asyncio
+async def test_batched_form_reports_miss_for_fallback(tools):
+    page = FormPage({"filled": {"prompt": None}, "submitted": None})
+    assert await tools._submit_create_form_batched(page, "a prompt", "synthwave", None) is False
+    assert [f["name"] for f in page.calls[0][1]["fields"]] == ["prompt"]
+
+
+@pytest.mark.asyncio
+async def test_batched_form_error_counts_as_submitted(tools):
+    page = FormPage(error=RuntimeError("Execution context was destroyed"))
+    assert await tools._submit_create_form_batched(page, "a prompt", "synthwave", None) is True
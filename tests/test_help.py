@@ -0,0 +1,22 @@
+"""Tests for the help tool."""
+
+import pytest
+
+from suno_mcp import server
+
+
+@pytest.mark.asyncio
+async def test_help_counts_every_category():
+    text = await server.help("basic")
+    for category, (title, _) in server.HELP_CATEGORIES.items():
+        assert f"**{title} ({len(server.registry.specs(category))})**" in text
+
+
+@pytest.mark.asyncio
+async def test_detailed_help_lists_every_registered_tool():
+    text = await server.help("detailed")
+    categorized = [spec for category in server.HELP_CATEGORIES for spec in server.registry.specs(category)]
+    assert len(categorized) == len(server.registry)
+    for spec in categorized:
+        assert f"`{spec.name}(" in text
+    assert "`/api/v1/tools/{name}`" in text
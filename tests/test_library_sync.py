@@ -0,0 +1,127 @@
+"""Tests for the library sync scroll loop and the library index."""
+
+import asyncio
+
+import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from suno_mcp.tools.basic.tools import LIBRARY_SCAN_SCRIPT, BasicSunoTools
+from suno_mcp.tools.shared.library import LibraryIndex
+from suno_mcp.tools.shared.utils import config
+
+
+class FakeLibraryPage:
+    """A library page that renders ``page_size`` more tracks some time after each scroll."""
+
+    def __init__(self, total, page_size, load_delay):
+        self.total = total
+        self.page_size = page_size
+        self.load_delay = load_delay
+        self.rendered = page_size
+        self.scrolls = 0
+        self.url = "https://app.suno.ai/library/"
+
+    @property
+    def height(self):
+        return self.rendered * 100
+
+    def on(self, event, handler):
+        pass
+
+    def remove_listener(self, event, handler):
+        pass
+
+    async def goto(self, url, wait_until, timeout):
+        pass
+
+    async def wait_for_load_state(self, state, timeout=None):
+        pass
+
+    async def _load_more(self):
+        await asyncio.sleep(self.load_delay)
+        self.rendered = min(self.total, self.rendered + self.page_size)
+
+    async def evaluate(self, script):
+        if script == LIBRARY_SCAN_SCRIPT:
+            return {
+                f"track-{i}": {"url": f"https://app.suno.ai/song/track-{i}", "title": None}
+                for i in range(self.rendered)
+            }
+        self.scrolls += 1
+        asyncio.get_running_loop().create_task(self._load_more())
+        return self.height
+
+    async def wait_for_function(self, expression, arg, timeout):
+        deadline = asyncio.get_running_loop().time() + timeout / 1000
+        while self.height <= arg:
+            if asyncio.get_running_loop().time() > deadline:
+                raise PlaywrightTimeoutError("Timeout exceeded")
+            await asyncio.sleep(0.005)
+
+
+class FakeBrowserManager:
+    def __init__(self, page):
+        self.page = page
+
+    async def ensure_browser(self, headless=True):
+        return {"page": self.page}
+
+    def record_error(self, error):
+        raise error
+
+
+@pytest.fixture
+def library_settings(monkeypatch, tmp_path):
+    monkeypatch.setitem(config.config["paths"], "library_index", str(tmp_path / "library.db"))
+    monkeypatch.setitem(config.config["library"], "scroll_timeout", 0.2)
+    monkeypatch.setitem(config.config["library"], "idle_scrolls", 2)
+
+
+@pytest.mark.asyncio
+async def test_slow_pages_are_waited_for_and_sync_stops_after_idle_scrolls(library_settings):
+    page = FakeLibraryPage(total=12, page_size=4, load_delay=0.05)
+    tools = BasicSunoTools(FakeBrowserManager(page))
+
+    result = await tools.sync_library(full=True, max_scrolls=50)
+
+    assert result.synced == 12
+    # Two scrolls load the rest, then two in a row find nothing new
+    assert page.scrolls == 4
+
+
+@pytest.mark.asyncio
+async def test_scan_waits_for_slow_pages_and_stops_after_idle_scrolls(library_settings):
+    page = FakeLibraryPage(total=12, page_size=4, load_delay=0.05)
+    tools = BasicSunoTools(FakeBrowserManager(page))
+
+    found = await tools._scan_library(page, ["track-10", "track-99"], max_scrolls=50)
+
+    assert found == {"track-10": "https://app.suno.ai/song/track-10"}
+    assert page.scrolls == 4
+
+
+@pytest.mark.asyncio
+async def test_scan_stops_once_every_track_is_found(library_settings):
+    page = FakeLibraryPage(total=12, page_size=4, load_delay=0.05)
+    tools = BasicSunoTools(FakeBrowserManager(page))
+
+    found = await tools._scan_library(page, ["track-1", "track-6"], max_scrolls=50)
+
+    assert set(found) == {"track-1", "track-6"}
+    assert page.scrolls == 1
+
+
+def test_search_matches_wildcards_literally(tmp_path):
+    library = LibraryIndex(str(tmp_path / "library.db"))
+    library.upsert([
+        {"track_id": "a", "title": "100% synth"},
+        {"track_id": "b", "title": "1000 synths"},
+        {"track_id": "c", "title": "lo_fi beats"},
+        {"track_id": "d", "title": "lo-fi beats"},
+        {"track_id": "e", "title": "back\\slash"},
+    ])
+    assert [t["track_id"] for t in library.search("100%")] == ["a"]
+    assert [t["track_id"] for t in library.search("lo_fi")] == ["c"]
+    assert [t["track_id"] for t in library.search("k\\s")] == ["e"]
+    assert {t["track_id"] for t in library.search("beats")} == {"c", "d"}
+    library.close()
@@ -0,0 +1,109 @@
+"""Tests for retries and circuit breakers."""
+
+import asyncio
+
+import pytest
+
+from suno_mcp.tools.shared.exceptions import SunoError
+from suno_mcp.tools.shared.resilience import Resilience, is_transient
+from suno_mcp.tools.shared.utils import ConfigManager
+
+
+@pytest.fixture
+def resilience():
+    config = ConfigManager()
+    config.set("resilience.base_delay", 0.0)
+    config.set("resilience.failure_threshold", 1)
+    config.set("resilience.reset_timeout", 0.0)
+    return Resilience(config)
+
+
+@pytest.mark.parametrize("message", [
+    "Suno says: Too Many Requests",
+    "HTTP 429 from the feed",
+    "You are out of credits",
+    "Insufficient credits for this generation",
+])
+def test_throttling_and_credit_errors_are_not_transient(message):
+    assert not is_transient(SunoError(message, "GENERATE_ERROR"))
+
+
+def test_upstream_failures_are_transient():
+    assert is_transient(SunoError("Timeout 30000ms exceeded", "GENERATE_ERROR"))
+    assert not is_transient(SunoError("Slow down", "RATE_LIMITED"))
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_call_is_not_retried(resilience):
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        raise SunoError("Rate limit reached, try again later", "GENERATE_ERROR")
+
+    with pytest.raises(SunoError):
+        await resilience.call("generate", fn)
+    assert len(calls) == 1
+    assert resilience.breaker("generate").state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_frees_the_half_open_slot(resilience):
+    async def fail():
+        raise SunoError("net::ERR_CONNECTION_RESET", "GENERATE_ERROR")
+
+    resilience.config.set("resilience.attempts", 1)
+    with pytest.raises(SunoError):
+        await resilience.call("generate", fail)
+    assert resilience.breaker("generate").state == "open"
+
+    probe = asyncio.ensure_future(resilience.call("generate", lambda: asyncio.sleep(10)))
+    await asyncio.sleep(0)
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    # Without the reset every later call would be short-circuited forever
+    assert await resilience.call("generate", lambda: asyncio.sleep(0, "ok")) == "ok"
+    assert resilience.breaker("generate").state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_breakers_are_kept_per_account(resilience):
+    class Tools:
+        def __init__(self, account):
+            self.account = account
+
+        @resilience.wrap("download")
+        async def download(self, fail):
+            if fail:
+                raise SunoError("Timeout 30000ms exceeded", "DOWNLOAD_ERROR")
+            return self.account
+
+    resilience.config.set("resilience.attempts", 1)
+    resilience.config.set("resilience.reset_timeout", 60.0)
+    with pytest.raises(SunoError):
+        await Tools("alice").download(True)
+
+    assert resilience.breaker("download", "alice").state == "open"
+    assert await Tools("bob").download(False) == "bob"
+    with pytest.raises(SunoError) as excinfo:
+        await Tools("alice").download(False)
+    assert excinfo.value.code == "CIRCUIT_OPEN"
+    assert set(resilience.snapshot()) >= {"download@alice", "download@bob"}
+
+
+@pytest.mark.asyncio
+async def test_unretryable_transient_failure_is_raised_at_once(resilience):
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        raise SunoError("Timeout 30000ms exceeded", "GENERATE_ERROR", retryable=False)
+
+    resilience.config.set("resilience.failure_threshold", 5)
+    with pytest.raises(SunoError):
+        await resilience.call("generate", fn)
+    assert len(calls) == 1
+    # Still a sign of trouble upstream, so the breaker counts it
+    assert resilience.breaker("generate").failures == 1
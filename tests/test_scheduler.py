@@ -0,0 +1,138 @@
+"""Tests for the job scheduler's credit-aware dispatch."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from suno_mcp import server
+from suno_mcp.loadtest import FakeSunoTools
+from suno_mcp.registry import ToolRegistry
+from suno_mcp.tools.shared.exceptions import SunoError
+from suno_mcp.tools.shared.scheduler import CreditBudget, JobScheduler
+
+
+async def job(result="done"):
+    await asyncio.sleep(0)
+    return result
+
+
+@pytest.mark.asyncio
+async def test_priority_classes_are_served_in_order():
+    scheduler = JobScheduler(concurrency=1)
+    order = []
+
+    async def record(name):
+        order.append(name)
+
+    blocker = asyncio.ensure_future(scheduler.submit(lambda: asyncio.sleep(0.01), priority="normal"))
+    await asyncio.sleep(0)
+    await asyncio.gather(
+        scheduler.submit(lambda: record("batch"), priority="batch"),
+        scheduler.submit(lambda: record("interactive"), priority="interactive"),
+        scheduler.submit(lambda: record("normal"), priority="normal"),
+    )
+    await blocker
+    assert order == ["interactive", "normal", "batch"]
+
+
+@pytest.mark.asyncio
+async def test_deferred_job_starts_when_credits_are_set():
+    scheduler = JobScheduler(budget=CreditBudget({"default": 5}))
+    pending = asyncio.ensure_future(scheduler.submit(job, cost=10))
+    await asyncio.sleep(0.01)
+    assert not pending.done()
+    assert scheduler.status()["deferred"] == 1
+
+    scheduler.set_credits("default", 20)
+    assert await asyncio.wait_for(pending, 1) == "done"
+    assert scheduler.budget.available("default") == 10
+
+
+@pytest.mark.asyncio
+async def test_deferred_job_fails_after_max_deferral():
+    scheduler = JobScheduler(budget=CreditBudget({"default": 5}), max_deferral=0.05)
+    with pytest.raises(SunoError) as excinfo:
+        await asyncio.wait_for(scheduler.submit(job, cost=10, name="suno_generate_track"), 1)
+    assert excinfo.value.code == "INSUFFICIENT_CREDITS"
+    assert "suno_generate_track" in str(excinfo.value)
+    assert scheduler.status()["deferred"] == 0
+
+
+@pytest.mark.asyncio
+async def test_dispatched_job_is_not_expired():
+    scheduler = JobScheduler(budget=CreditBudget({"default": 5}), max_deferral=0.05)
+    pending = asyncio.ensure_future(scheduler.submit(lambda: asyncio.sleep(0.1, "slow"), cost=10))
+    await asyncio.sleep(0.01)
+    scheduler.set_credits("default", 10)
+    assert await asyncio.wait_for(pending, 1) == "slow"
+
+
+@pytest.mark.asyncio
+async def test_schedule_outside_a_tool_call_runs_as_anonymous():
+    scheduler = JobScheduler()
+
+    async def running():
+        return scheduler.status()["running"]
+
+    assert await ToolRegistry(scheduler).schedule(running) == [
+        {"name": "job", "client_id": "anonymous", "priority": "interactive"}
+    ]
+
+
+@pytest.fixture
+def app_client(monkeypatch):
+    """The FastAPI app with a fake Suno backend and an account short of credits."""
+    monkeypatch.setattr(server, "basic_tools", FakeSunoTools(latency_ms=1))
+    monkeypatch.setattr(server.scheduler, "budget", CreditBudget({"default": 5}))
+    monkeypatch.setattr(server.scheduler, "max_deferral", 5)
+    transport = httpx.ASGITransport(app=server.fastapi_app)
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_credit_top_up_endpoint_releases_deferred_generation(app_client):
+    async with app_client as client:
+        body = {"name": "suno_generate_track", "arguments": {"prompt": "test"}}
+        generation = asyncio.ensure_future(client.post("/api/v1/tools/suno_generate_track", json=body))
+        await asyncio.sleep(0.05)
+        assert not generation.done()
+        assert (await client.get("/api/v1/scheduler")).json()["deferred"] == 1
+
+        response = await client.post("/api/v1/scheduler/credits", json={"account": "default", "credits": 100})
+        assert response.status_code == 200
+        assert response.json()["remaining"] == 100
+
+        result = await asyncio.wait_for(generation, 2)
+        assert result.status_code == 200
+        assert result.json()["result"]["started"] is True
+
+
+@pytest.mark.asyncio
+async def test_set_credits_tool_rejects_negative_credits(app_client):
+    async with app_client as client:
+        response = await client.post(
+            "/api/v1/tools/suno_set_credits",
+            json={"name": "suno_set_credits", "arguments": {"credits": -1}},
+        )
+        assert response.status_code == 400
+        assert "must not be negative" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_http_calls_keep_the_declared_priority_unless_given(app_client, monkeypatch):
+    priorities = []
+
+    async def recording_submit(fn, **kwargs):
+        priorities.append(kwargs["priority"])
+        return {"queued": True}
+
+    monkeypatch.setattr(server.scheduler, "submit", recording_submit)
+    body = {"name": "suno_download_batch", "arguments": {"track_ids": ["t1"]}}
+    async with app_client as client:
+        assert (await client.post("/api/v1/tools/suno_download_batch", json=body)).status_code == 200
+        body["priority"] = "interactive"
+        assert (await client.post("/api/v1/tools/suno_download_batch", json=body)).status_code == 200
+        body["priority"] = "urgent"
+        assert (await client.post("/api/v1/tools/suno_download_batch", json=body)).status_code == 422
+    assert priorities == ["batch", "interactive"]
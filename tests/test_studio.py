@@ -0,0 +1,101 @@
+"""Tests for pipelined Studio stem generation."""
+
+import asyncio
+
+import pytest
+
+from suno_mcp.registry import ToolRegistry
+from suno_mcp.tools.shared.models import StemItem, StemRequest, StemSetResult
+from suno_mcp.tools.shared.scheduler import JobScheduler
+from suno_mcp.tools.shared.utils import BrowserManager
+from suno_mcp.tools.studio.tools import StudioTools
+
+
+@pytest.mark.asyncio
+async def test_stem_waits_do_not_hold_a_scheduler_slot(monkeypatch, tmp_path):
+    scheduler = JobScheduler(concurrency=1)
+    registry = ToolRegistry(scheduler)
+    studio = StudioTools(BrowserManager())
+    generated = asyncio.Event()
+
+    async def submit(stem):
+        return [f"gen-{stem.stem_type}"]
+
+    async def finish(index, stem, generation_ids, *args):
+        await generated.wait()
+        return StemItem(stem_type=stem.stem_type, prompt=stem.prompt, status="complete", generation_ids=generation_ids)
+
+    monkeypatch.setattr(studio, "_submit", submit)
+    monkeypatch.setattr(studio, "_finish_stem", finish)
+
+    @registry.tool(category="studio")
+    async def generate_stems(stems: list[StemRequest]) -> StemSetResult:
+        """Generate stems."""
+        return await studio.generate_multiple_stems(
+            stems, str(tmp_path), schedule=lambda submit_all: registry.schedule(submit_all, cost=20)
+        )
+
+    stems = [StemRequest(prompt="beat", stem_type="drums"), StemRequest(prompt="line", stem_type="bass")]
+    pending = asyncio.ensure_future(registry.call("generate_stems", {"stems": stems}, client_id="agent"))
+    await asyncio.sleep(0.01)
+
+    # Submissions are done; another job gets the only slot while stems generate
+    assert not pending.done()
+    assert await asyncio.wait_for(scheduler.submit(lambda: asyncio.sleep(0, "other")), 1) == "other"
+
+    generated.set()
+    result = await asyncio.wait_for(pending, 1)
+    assert [item.generation_ids for item in result.items] == [["gen-drums"], ["gen-bass"]]
+
+
+@pytest.mark.asyncio
+async def test_failed_submissions_keep_their_place(monkeypatch, tmp_path):
+    studio = StudioTools(BrowserManager())
+
+    async def submit(stem):
+        if stem.stem_type == "bass":
+            raise RuntimeError("Studio form not found")
+        return [f"gen-{stem.stem_type}"]
+
+    async def finish(index, stem, generation_ids, *args):
+        return StemItem(stem_type=stem.stem_type, prompt=stem.prompt, status="complete", generation_ids=generation_ids)
+
+    monkeypatch.setattr(studio, "_submit", submit)
+    monkeypatch.setattr(studio, "_finish_stem", finish)
+    monkeypatch.setattr(studio.browser_manager, "record_error", lambda error: None)
+
+    stems = [StemRequest(prompt=p, stem_type=t) for p, t in [("beat", "drums"), ("line", "bass"), ("pad", "other")]]
+    result = await studio.generate_multiple_stems(stems, str(tmp_path))
+    assert [(item.stem_type, item.status) for item in result.items] == [
+        ("drums", "complete"), ("bass", "failed"), ("other", "complete")
+    ]
+    assert result.status == "partial"
+
+
+@pytest.mark.asyncio
+async def test_stem_tasks_are_cancelled_when_scheduling_fails(monkeypatch, tmp_path):
+    studio = StudioTools(BrowserManager())
+    cancelled = []
+
+    async def submit(stem):
+        return [f"gen-{stem.stem_type}"]
+
+    async def finish(index, stem, *args):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(stem.stem_type)
+            raise
+
+    async def schedule(submit_all):
+        await submit_all()
+        await asyncio.sleep(0)  # Let the stems start waiting
+        raise RuntimeError("scheduler shut down")
+
+    monkeypatch.setattr(studio, "_submit", submit)
+    monkeypatch.setattr(studio, "_finish_stem", finish)
+
+    stems = [StemRequest(prompt="beat", stem_type="drums"), StemRequest(prompt="line", stem_type="bass")]
+    with pytest.raises(RuntimeError):
+        await asyncio.wait_for(studio.generate_multiple_stems(stems, str(tmp_path), schedule=schedule), 1)
+    assert cancelled == ["drums", "bass"]
@@ -0,0 +1,71 @@
+"""Tests for adaptive step timeouts."""
+
+import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from suno_mcp.tools.shared.metrics import Metrics
+from suno_mcp.tools.shared.timeouts import TimeoutController
+from suno_mcp.tools.shared.utils import ConfigManager
+
+
+@pytest.fixture
+def controller():
+    config = ConfigManager()
+    config.set("timeouts.adaptive.min_samples", 3)
+    return TimeoutController(config, Metrics())
+
+
+async def succeed(timeout):
+    return timeout
+
+
+async def time_out(timeout):
+    raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded")
+
+
+@pytest.mark.asyncio
+async def test_fast_successes_pull_the_timeout_to_the_floor(controller):
+    for _ in range(5):
+        await controller.run("selector", succeed)
+    assert controller.get("selector") == 500
+
+
+@pytest.mark.asyncio
+async def test_timeouts_back_off_instead_of_sticking_to_the_floor(controller):
+    for _ in range(5):
+        await controller.run("selector", succeed)
+
+    limits = []
+    for _ in range(4):
+        limits.append(controller.get("selector"))
+        with pytest.raises(PlaywrightTimeoutError):
+            await controller.run("selector", time_out)
+    assert limits == [500, 750, 1125, 1688]
+    assert controller.snapshot()["selector"]["timeouts"] == 4
+
+
+@pytest.mark.asyncio
+async def test_uncensored_timeouts_do_not_raise_the_limit(controller):
+    for _ in range(5):
+        await controller.run("selector", succeed)
+    for _ in range(3):
+        with pytest.raises(PlaywrightTimeoutError):
+            await controller.run("selector", time_out, censor=False)
+    assert controller.get("selector") == 500
+
+
+def test_apply_sets_page_defaults(controller):
+    class Page:
+        def set_default_timeout(self, timeout):
+            self.timeout = timeout
+
+        def set_default_navigation_timeout(self, timeout):
+            self.navigation_timeout = timeout
+
+    controller.observe("element", 4000)
+    for _ in range(3):
+        controller.observe("navigation", 8000)
+    page = Page()
+    controller.apply(page)
+    assert page.timeout == 10000  # Not enough samples yet
+    assert page.navigation_timeout == 12000
@@ -0,0 +1,88 @@
+"""Tests for the push-based track status tracker."""
+
+import asyncio
+
+import pytest
+
+from suno_mcp.tools.shared.tracking import TrackStatusTracker
+
+
+def test_update_records_fields_and_rejects_unknown_status():
+    tracker = TrackStatusTracker()
+    tracker.update("t1", "queued", title="Song", audio_url=None, source="feed")
+    track = tracker.get("t1")
+    assert track["status"] == "queued"
+    assert track["title"] == "Song"
+    assert "audio_url" not in track
+    assert tracker.known_ids() == {"t1"}
+
+    with pytest.raises(ValueError):
+        tracker.update("t1", "paused")
+
+
+def test_terminal_status_is_not_regressed():
+    tracker = TrackStatusTracker()
+    tracker.update("t1", "complete", source="feed")
+    tracker.update("t1", "streaming", source="feed")
+    tracker.update("t1", "streaming", source="dom")
+    assert tracker.get("t1")["status"] == "complete"
+
+
+def test_dom_scan_does_not_override_feed_terminal_status():
+    tracker = TrackStatusTracker()
+    tracker.update("t1", "complete", source="feed")
+    tracker.update("t1", "failed", source="dom")
+    assert tracker.get("t1")["status"] == "complete"
+
+
+def test_feed_corrects_dom_terminal_status():
+    tracker = TrackStatusTracker()
+    tracker.update("t1", "failed", source="dom")
+    tracker.update("t1", "queued", source="dom")
+    assert tracker.get("t1")["status"] == "failed"
+
+    tracker.update("t1", "streaming", source="feed")
+    assert tracker.get("t1")["status"] == "streaming"
+    assert tracker.get("t1")["source"] == "feed"
+
+
+@pytest.mark.asyncio
+async def test_wait_for_resolves_on_terminal_status():
+    tracker = TrackStatusTracker()
+    waiter = asyncio.ensure_future(tracker.wait_for("t1", timeout=1))
+    await asyncio.sleep(0)
+    tracker.update("t1", "streaming", source="feed")
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    tracker.update("t1", "complete", source="feed", audio_url="https://cdn.test/t1.mp3")
+    track = await waiter
+    assert track["status"] == "complete"
+    assert track["audio_url"] == "https://cdn.test/t1.mp3"
+    # Already terminal: returns at once
+    assert (await tracker.wait_for("t1", timeout=0))["status"] == "complete"
+
+
+@pytest.mark.asyncio
+async def test_wait_for_times_out_and_drops_waiter():
+    tracker = TrackStatusTracker()
+    with pytest.raises(asyncio.TimeoutError):
+        await tracker.wait_for("t1", timeout=0.01)
+    assert tracker._waiters == {}
+
+
+@pytest.mark.asyncio
+async def test_subscribers_and_parent_see_changes():
+    parent = TrackStatusTracker()
+    tracker = TrackStatusTracker(parent=parent)
+    queue = parent.subscribe()
+
+    tracker.update("t1", "queued", source="feed")
+    tracker.update("t1", "queued", source="feed")
+    tracker.update("t1", "complete", source="feed")
+    assert [queue.get_nowait()["status"] for _ in range(queue.qsize())] == ["queued", "complete"]
+    assert parent.get("t1")["status"] == "complete"
+
+    parent.unsubscribe(queue)
+    tracker.update("t2", "queued")
+    assert queue.empty()
@@ -0,0 +1,121 @@
+"""Tests for the webhook delivery queue."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from suno_mcp import server
+from suno_mcp.loadtest import FakeSunoTools
+from suno_mcp.tools.shared.exceptions import SunoError
+from suno_mcp.tools.shared.utils import ConfigManager
+from suno_mcp.tools.shared.webhooks import WebhookDispatcher, validate_callback_url
+
+
+@pytest.fixture
+def webhook_config(tmp_path):
+    config = ConfigManager()
+    config.set("webhooks.queue_path", str(tmp_path / "webhooks.db"))
+    config.set("webhooks.batch_window", 0.01)
+    config.set("webhooks.base_delay", 0.01)
+    config.set("webhooks.max_delay", 0.02)
+    return config
+
+
+async def wait_until(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.parametrize("url", ["http://x/\x00", "ftp://example.com/hook", "/relative", "http://"])
+def test_invalid_callback_urls_are_rejected(url):
+    with pytest.raises(SunoError) as excinfo:
+        validate_callback_url(url)
+    assert excinfo.value.code == "INVALID_CALLBACK_URL"
+
+
+@pytest.mark.asyncio
+async def test_enqueue_rejects_invalid_url(webhook_config):
+    dispatcher = WebhookDispatcher(webhook_config)
+    with pytest.raises(SunoError):
+        dispatcher.enqueue("http://x/\x00", "download.completed", {})
+    assert dispatcher.status()["endpoints"] == {}
+    await dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_unsendable_row_is_dead_lettered_and_worker_keeps_running(webhook_config):
+    received = []
+
+    def handler(request):
+        received.append(json.loads(request.content))
+        return httpx.Response(204)
+
+    dispatcher = WebhookDispatcher(webhook_config, transport=httpx.MockTransport(handler))
+    # A row persisted before URLs were validated at enqueue time
+    with dispatcher.conn:
+        dispatcher.conn.execute(
+            "INSERT INTO deliveries (url, event, created_at, next_attempt) VALUES (?, ?, 0, 0)",
+            ("http://x/\x00", json.dumps({"id": "bad", "type": "download.completed", "data": {}})),
+        )
+    dispatcher.enqueue("http://receiver.test/hook", "download.completed", {"track_id": "t1"})
+
+    await wait_until(lambda: received)
+    status = dispatcher.status()
+    assert status["running"]
+    assert status["endpoints"]["http://x/\x00"]["dead"] == 1
+    assert received[0]["events"][0]["data"] == {"track_id": "t1"}
+    await dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_attempts_are_counted_per_row(webhook_config):
+    webhook_config.set("webhooks.max_attempts", 3)
+    dispatcher = WebhookDispatcher(webhook_config, transport=httpx.MockTransport(lambda r: httpx.Response(503)))
+    with dispatcher.conn:
+        dispatcher.conn.execute(
+            "INSERT INTO deliveries (url, event, created_at, next_attempt, attempts) VALUES (?, ?, 0, 0, 2)",
+            ("http://receiver.test/hook", json.dumps({"id": "old", "type": "x", "data": {}})),
+        )
+        dispatcher.conn.execute(
+            "INSERT INTO deliveries (url, event, created_at, next_attempt) VALUES (?, ?, 0, 0)",
+            ("http://receiver.test/hook", json.dumps({"id": "new", "type": "x", "data": {}})),
+        )
+    dispatcher.start()
+
+    def attempts():
+        return {
+            json.loads(row["event"])["id"]: (row["status"], row["attempts"])
+            for row in dispatcher.conn.execute("SELECT * FROM deliveries")
+        }
+
+    await wait_until(lambda: attempts()["old"][0] == "dead")
+    # The fresh row shared the failed batch but keeps its own retry budget
+    assert attempts()["new"] == ("pending", 1)
+    await dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_generation_submit_queues_failure_event(monkeypatch):
+    events = []
+
+    class Recorder:
+        def enqueue(self, url, event, data):
+            events.append((url, event, data))
+
+    monkeypatch.setattr(server, "basic_tools", FakeSunoTools(latency_ms=1, error_rate=1.0))
+    monkeypatch.setattr(server, "webhooks", Recorder())
+    monkeypatch.setattr(server, "account_pool", None)
+
+    with pytest.raises(SunoError):
+        await server.registry.call(
+            "suno_generate_track", {"prompt": "test", "callback_url": "http://receiver.test/hook"}
+        )
+    assert events == [(
+        "http://receiver.test/hook",
+        "generation.failed",
+        {"prompt": "test", "style": "synthwave", "error": "Simulated backend failure", "code": "LOADTEST_FAILURE"},
+    )]